@@ -1,12 +1,16 @@
 import os
-import json
+from utils.startup import profiler
+profiler.start_from_env()
 import customtkinter as ctk
-from CTkMessagebox import CTkMessagebox
+from widgets.dialogs import CTkMessagebox
+from utils.metrics import metrics
+from utils.storage import SqliteStorage, storage_for
+from utils.watchdog import watchdog
 from widgets.matrix import Matrix
 from style import Style
 from string import ascii_letters
 
-DATA_FILE = "access_matrix.json"
+DATA_FILE = os.environ.get("MBKS_MATRIX", "access_matrix.json")  # JSON, каталог шардов (*.d) или *.db (utils/storage.py)
 MAX_SUBJECT_LEN = 256
 
 # Настройка внешнего вида Custom Tkinter
@@ -17,14 +21,14 @@ def load_matrix(path=DATA_FILE):
     if not os.path.exists(path):
         return {"objects": [], "subjects": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data.setdefault("objects", [])
-        data.setdefault("subjects", {})
-        for s, objs in list(data["subjects"].items()):
-            data["subjects"][s] = list(dict.fromkeys(objs))
-        data["objects"] = list(dict.fromkeys(data["objects"]))
-        return data
+        with metrics.timer("load_matrix"):
+            data = storage_for(path).load()
+            data.setdefault("objects", [])
+            data.setdefault("subjects", {})
+            for s, objs in list(data["subjects"].items()):
+                data["subjects"][s] = list(dict.fromkeys(objs))
+            data["objects"] = list(dict.fromkeys(data["objects"]))
+            return data
     except Exception as e:
         CTkMessagebox(
             title="Ошибка загрузки", 
@@ -36,8 +40,8 @@ def load_matrix(path=DATA_FILE):
 
 def save_matrix(data, path=DATA_FILE):
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with metrics.timer("save_matrix"):
+            storage_for(path).save(data)
         print("Матрица сохранена.")
     except Exception as e:
         CTkMessagebox(
@@ -46,6 +50,13 @@ def save_matrix(data, path=DATA_FILE):
             icon="cancel"
         )
 
+def store(command, *args, path=DATA_FILE):
+    """Повторяет команду в SQLite-хранилище: права меняются в базе сразу, без записи всей матрицы."""
+    storage = storage_for(path)
+    if isinstance(storage, SqliteStorage):
+        getattr(storage, command.__name__)(*args)
+
+
 def validate_object_token(tok):
     return len(tok) == 1 and tok.isalpha() and tok in ascii_letters
 
@@ -296,88 +307,110 @@ class AdminApp(ctk.CTk):
 
     def on_grant(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            objs = parse_objects(self.cmd_objects.get())
-            if not subs or not objs:
-                self.show_warning("Заполните поля субъектов и объектов")
-                return
-            grant(self.data, subs, objs)
-            self.matrix.redraw()
-            self.show_success(f"Права выданы: {', '.join(subs)} → {', '.join(objs)}")
+            with metrics.timer("on_grant"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                objs = parse_objects(self.cmd_objects.get())
+                if subs and objs:
+                    grant(self.data, subs, objs)
+                    store(grant, subs, objs)
+                    self.matrix.redraw()
         except Exception as e:
             self.show_error(f"Ошибка grant: {str(e)}")
+            return
+        if not subs or not objs:
+            self.show_warning("Заполните поля субъектов и объектов")
+            return
+        self.show_success(f"Права выданы: {', '.join(subs)} → {', '.join(objs)}")
 
     def on_create(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get()) if self.cmd_subjects.get().strip() else []
-            objs = parse_objects(self.cmd_objects.get()) if self.cmd_objects.get().strip() else []
-            
-            if not subs:
-                self.show_warning("Введите хотя бы одного субъекта")
-                return
-                
-            created_count = 0
-            existing_count = 0
-            
-            for subj in subs:
-                status = create(self.data, subj, objs)
-                if status == "created":
-                    created_count += 1
-                else:
-                    existing_count += 1
-            
-            self.matrix.redraw()
-            
-            message = []
-            if created_count > 0:
-                message.append(f"Создано: {created_count}")
-            if existing_count > 0:
-                message.append(f"Обновлено: {existing_count}")
-                
-            self.show_success("; ".join(message))
-            
+            with metrics.timer("on_create"):
+                subs = parse_subjects(self.cmd_subjects.get()) if self.cmd_subjects.get().strip() else []
+                objs = parse_objects(self.cmd_objects.get()) if self.cmd_objects.get().strip() else []
+
+                created_count = 0
+                existing_count = 0
+
+                for subj in subs:
+                    status = create(self.data, subj, objs)
+                    store(create, subj, objs)
+                    if status == "created":
+                        created_count += 1
+                    else:
+                        existing_count += 1
+
+                if subs:
+                    self.matrix.redraw()
         except Exception as e:
             self.show_error(f"Ошибка create: {str(e)}")
+            return
+        if not subs:
+            self.show_warning("Введите хотя бы одного субъекта")
+            return
+
+        message = []
+        if created_count > 0:
+            message.append(f"Создано: {created_count}")
+        if existing_count > 0:
+            message.append(f"Обновлено: {existing_count}")
+
+        self.show_success("; ".join(message))
 
     def on_remove(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            objs = parse_objects(self.cmd_objects.get())
-            if not subs or not objs:
-                self.show_warning("Заполните поля субъектов и объектов")
-                return
-            remove(self.data, subs, objs)
-            self.matrix.redraw()
-            self.show_success(f"Права удалены: {', '.join(subs)} → {', '.join(objs)}")
+            with metrics.timer("on_remove"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                objs = parse_objects(self.cmd_objects.get())
+                if subs and objs:
+                    remove(self.data, subs, objs)
+                    store(remove, subs, objs)
+                    self.matrix.redraw()
         except Exception as e:
             self.show_error(f"Ошибка remove: {str(e)}")
+            return
+        if not subs or not objs:
+            self.show_warning("Заполните поля субъектов и объектов")
+            return
+        self.show_success(f"Права удалены: {', '.join(subs)} → {', '.join(objs)}")
 
     def on_grant_all(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            if not subs:
-                self.show_warning("Введите субъектов")
-                return
-            grant_all(self.data, subs)
-            self.matrix.redraw()
-            self.show_success(f"Все права выданы: {', '.join(subs)}")
+            with metrics.timer("on_grant_all"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                if subs:
+                    grant_all(self.data, subs)
+                    store(grant_all, subs)
+                    self.matrix.redraw()
         except Exception as e:
             self.show_error(f"Ошибка grant_all: {str(e)}")
+            return
+        if not subs:
+            self.show_warning("Введите субъектов")
+            return
+        self.show_success(f"Все права выданы: {', '.join(subs)}")
 
     def on_remove_all(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            if not subs:
-                self.show_warning("Введите субъектов")
-                return
-            remove_all(self.data, subs)
-            self.matrix.redraw()
-            self.show_success(f"Все права удалены: {', '.join(subs)}")
+            with metrics.timer("on_remove_all"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                if subs:
+                    remove_all(self.data, subs)
+                    store(remove_all, subs)
+                    self.matrix.redraw()
         except Exception as e:
             self.show_error(f"Ошибка remove_all: {str(e)}")
-
+            return
+        if not subs:
+            self.show_warning("Введите субъектов")
+            return
+        self.show_success(f"Все права удалены: {', '.join(subs)}")
 
 if __name__ == "__main__":
-    app = AdminApp()
-    Style()
+    with profiler.phase("init"):
+        app = AdminApp()
+    with profiler.phase("style"):
+        Style()
+    profiler.first_window(app)
+    metrics.install(app)
+    watchdog.install(app)
     app.mainloop()
\ No newline at end of file
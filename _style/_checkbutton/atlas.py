@@ -0,0 +1,7 @@
+# Сгенерировано utils/atlas.py, не редактировать вручную.
+atlas = 'iVBORw0KGgoAAAANSUhEUgAAAD4AAAAUCAYAAADV9o4UAAADC0lEQVR42uWYS2gUSRjHf1XdMz3OTJxEjOIqPoIDiSgimwXHg3iRxYPiRVQCg5f1tadl12XJLQf1oHgQCQq7CANBvCoIPg6CQjC+WBYl2joiiyAazbx6pifTXeUhD2JMYowzQsYPCrqru398/+p/PeE7DTF6Ydt2IhwOd2itY0opPZOPpZRCCJEtFos98Xi8d+LzWjBbLzUljKDRoX1igJ6pTmGQ9Yf8nv4dg71jwm3bTsRisevNzc2R2bReJpNxBgYGto5PtBbM1ktNCRkwrktLRFBfCJSgyspRqK392wZ7JUAgEEjONkGAxsbGSCgUSo6vqwVTSiMpLRFRJY0qf75U3ApOsYjneqiSRloyIn0jOdIOIKWMfm2fMU0zOsGyVWciiM70T3u6wvJwCwdW/8ai0BKU9kGNMABz5D1dhfFCf+b+mzGVVgSFxbH1Z2hfkMAQBt32CcxhuXrsj9dblJVLctVB2hckyFey3Hp7g4AMTOzy9RVDaoi1sQ0civ8BQPezk/yXeYgp6kS40j4lv4SnvXH9QBGUQTrXHCNqNtD37japF2cJGaHJBvm5KXpx6AcOrf6dlmicsnIBcH2XjpW/sHHhZhyvwPHHnQypMmISmXJu9uEy25fu4khbF+d+ukjr/HXkvRxt89fxa/xPAM49O8W/mfsEpTXVtD73IiCDXHt9mXTBZnl4FWfbL/Bj00aOtHURCzTycLCP8y+6sWRouvXM3AtTmKQLTzl4dw/PC09YFl5Bz6YrbFn0MyW/yNFHf+H6RaSQ9SUcICgt0o7N/r7d9OceETaGF4n/PD/Ng8E7U1q8LqYzS1q8LKY5fG8v99/3cvPNVf5On57W4mOumbhLq8ZO71syLWnxqvQ/++7sRGuNr/1pLT7KMAGUUoWvzdDzvI8YtWCiKUzmUVOY+NoftvB0ouUIY9TqlUollc1mndkmmMvlHNd1U+PrasFUhp9SZeXIeQJpfVwMS2JY8pP6sTJPoMraUcpPfXIQ0dDQ0KG1/rINvhDZfD4/5UFEtZnVOoj4buMD0oaDl/vP9tEAAAAASUVORK5CYII='
+regions = {
+    ('checkbutton-indicator-deselected', 20, 20): (0, 0),
+    ('checkbutton-indicator-disabled', 20, 20): (21, 0),
+    ('checkbutton-indicator-selected', 20, 20): (42, 0),
+}
@@ -0,0 +1,16 @@
+# Сгенерировано utils/atlas.py, не редактировать вручную.
+atlas = 'iVBORw0KGgoAAAANSUhEUgAAAL8AAAAPCAYAAAC1IB5zAAAFqUlEQVR42u2av3LaShTGPylC/1aeCZLdJEWegiLgmTxEmtAh4SZPlMZIdKTJWxhS8BQpksZekRmzQhK2dKvVCIxgJXnundx4Z1zAzGF/5+y3e86etfTjx48cDce7d++kb9++Nbb/+PGjNBqNGttPp1Pphf+Fv6m9jJfxMv7S8b8WvyRJkGUZkiQ1tud/TUae58iyDHme/xXchzj+S/tT/MqhCQ8ZVX3/3PZ5nh90uur7YxybzaaYU9f12sFM07SYW1XV2oE3DKOYM45jYf83m03hg2EYtUWYJEkxb6fTqS04wzB2WJqIUJIkxHEMXdcbb6LtdgtFURoLX9d1xHFcya/sGyRJ8gSYO6Kq6slAVAGLOCJJEjRNewLMHUnTVCiQsiwjDEMEQQDGGBzHgeu6ME0TWZYJLVwURZjP50jTFIQQDAYDdDodofmzLINt23BdF4QQUEoRBAGiKIIsy0e5oyjCdDoFpRSEELiuC9u2hbm32y2+f/8OxhhUVcVgMIBpmsLcpmliNBrBcRwwxhAEAcIwPMp9yA9KKWazGYbDIRzHEeIv+8EYw3K5RK/XAyGk1gbKsgyO42A4HGI2m4FSepBfLgPHcQzf93ec5ULyfR9xHFcGQZIkpGmK+XyOKIoK8e4LqWrzZFkGXdfhed7OYnMheZ4HXddPBlGWZaxWK/i+j7u7OxiGgU+fPsEwjNrCX6/X6HQ66PV6UBRFWEDdbhee5+H8/BybzQZfv37FZrM5KaAsy3Z47+7u4Ps+VquVkPjyPIeiKOj1euh0Oliv10/W41Tsyrzn5+fwPA/dbldYvDz+QRDg58+fCIJAmL8c/8VigdVqhcViIcxfjr/runj79i1c163kf0JEKS0C/urVq0JIlFLhHcsDzk+y+XwOxpiQA47jFAF/fHwshOQ4jtD8lFJMJhOEYYiLiwtcXV3BcRzhk4PzM8ZwdnaGy8tLEEKEU63jOBiPx7BtG7e3t7i+vgalVHjx+G9cXV3h4uICYRhiMpnU+g1CCC4vL3F2drbjj6j4KKW4vr7G7e0tbNvGeDwWiqEkSQVvGIYghOx8PsVfPngYY9A0bUdPp+zzPC94bdsGY2zn8z6/vD85B/Z9H79+/SoyASFEKPiqqoIxhsVigd+/f2OxWBQpWGThObDneXjz5k2RCRhjR4PPMxdPc6ZpYjgcHnS6KvAPDw9YLpdYr9dQVbVWyuWZi6f5KIowm82EFr1qEYfDIUzTLEqIY5l3354Qgl6vB1VVsV6vsVwu8fDwIMTCRTybzRBFUVFCHMu8PGsEQQBKaXEIOI5TlH3Hsl+5cliv17AsC4PBAJZlFRnsVOVgGAZc1y3m5IcGL3v3s7/cxng/4LzGLAOXHVFVtVJIbYPXVnzlksGyLKRpiuVyKZyx2m6+tuKrqpnTNIVlWbVKt6abr83hVW4yEELQ7/fx+vVr9Pt9EEKK5sMpv+sc3nKbtHHIedM0MRgMQAhBkiTFZVHk0tU2bT5H2cF5CSG4v7/Hzc1N7ZKhTdnVpuwol243Nze4v7/f8effKLvalK08Y3G98As45xfxv07ZLre5MBzbAP1+H91uF/1+X7jb8BwXpjYXzv0NbFkWttttrZKhzYW77YWzXLptt9si49bp9jS9cLdtWJQrhzJveT1OVQ51GzbKsVbdeDwWTrVVAhJNtYdalZPJRLjOPbQBPn/+XMytaVqtDWwYBj58+LBTEtXdwF++fCk2TJIkQgLSNA2j0Win516HW1EUvH//fqfPX4c7SRJMp9OdPn+dTs2hvj5vVYtwVPGK+JHn+cG+Pm/V73+vnHokaPPKVyfwVY8kbV4p+SNTnueNOMqX9CZ1O39kq/PaKkkSTNNsxa1pWmPuPM8RRVFt7lPziXK0ta/iPfS90gSkbSDqCKjt/G0YnoO/iQ9/KvefNl7+se1l/LXjHwOrREezMdbyAAAAAElFTkSuQmCC'
+regions = {
+    ('scrollbar-arrow-down', 15, 15): (0, 0),
+    ('scrollbar-arrow-down-active', 15, 15): (16, 0),
+    ('scrollbar-arrow-down-pressed', 15, 15): (32, 0),
+    ('scrollbar-arrow-left', 15, 15): (48, 0),
+    ('scrollbar-arrow-left-active', 15, 15): (64, 0),
+    ('scrollbar-arrow-left-pressed', 15, 15): (80, 0),
+    ('scrollbar-arrow-right', 15, 15): (96, 0),
+    ('scrollbar-arrow-right-active', 15, 15): (112, 0),
+    ('scrollbar-arrow-right-pressed', 15, 15): (128, 0),
+    ('scrollbar-arrow-up', 15, 15): (144, 0),
+    ('scrollbar-arrow-up-active', 15, 15): (160, 0),
+    ('scrollbar-arrow-up-pressed', 15, 15): (176, 0),
+}
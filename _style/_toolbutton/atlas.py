@@ -0,0 +1,13 @@
+# Сгенерировано utils/atlas.py, не редактировать вручную.
+atlas = 'iVBORw0KGgoAAAANSUhEUgAAAOYAAAAeCAYAAAA4q2LPAAANxklEQVR42u1dbXBVx3l+3t1z9twP6UIZKwLLBJiO22AZWTgO8TRhpp1Ok7iu2yRMg7EzptgZu45wJorGjED4nlwLjAasMcWGpvxIjKcOpm6+Op5pSdN01DFNIcYG1dgutQM4FggkPvRxP87H7tsfXMkXIZAEl2vSnGdmR0dH57zP7mqf3Xffs2cPoYjWVauWx+LxJsuyGqSUDjOjHCAiGGO8wPf3Z/P5bZs2bXpx7DW7du1arpRqIqIGInJQRjCzZ4zZ7/v+tnvvvfci7mPHji2XUjYZYxqIqKzlZmaPiPZrrbfNnTv3Im58883liKumamUahJAOysSNYp0PediPgrcNmxvG4X5rOeJWU8rWDUKIsnMP+mI/CsE2bL71RfwGwHXdBIDYFd5eyGQyuXLmh1zXFaHvr505a1a6sbFR1tTUQEiJcjZQrTX6Tp3CwYMHw94TJ9rXb9jQDoBd1xULFixYW11dna6rq5OxWAxEhDILE/l8Hj09PeHw8HD7kiVL2omIXdcVK1asWKuUSicSCVmu8o5X/nw+H3qe1z5nzpx2ImK4rsDw0rWfuCmZfujTNfK2mTYcSeXUBgoh443eAM/v6wvf+WCoHU/Xt2OEO7d07a2z7PTXb4/JO2o1lChvmQua8MuThL97ww/f7PHb8fT889yTEEdqcJBbnnkmf7V5aGlpSQJAZ2dndjK8bMw/Sylv0VpPiUdKCa31WyTEXWPF2dzcHI/H4yuEELXGmHHvF0LAGHMyn89/75mSclu5XG7Z7Nmz05//whdkMpmENgYocyMlIkybNg0zZ82ydu/enW5dtepYx8aNO+bPn7+sqqoqffPNN0vbtnGtxOE4DqqqqqzDhw+nd+7ceQzAjgceeGCZbdvpZDIpmbnsHUIpEomExczpI0eOHAOwA2eWLPvEvER625dny7pqgq/LXuUgAub+joVFN822mn746/TbzYfOcw8sWVY/207vuDsmZ1cb+JqAclc7Ab87nfEHdcpa/gqn3xzhvgw6OzvjAwMDPxyoqiLXdb90NSNQZ3Nz/Ews9hMikp2dnX/a0tKSn6B9xAv5/O0AqqSU43k+Fx2PwScdx4kDKM0zxWKxLY7jfM3zPO9SbdsYA8dxHGZeCOBhFP8bIhaLrWy87TaZTCYRhiHYGDBzWZMxBkEQIJlMorGxUSrH+QYAWJa1sq6uTtq2DXMNeEv5LctCXV2dVEp9o9jTrUwmk7ISbhIzI5FISCnlee6EXPlXiz4m66oJ+QDQBjBc3qQNkA+AumrCg5+ukcIpcjv2yr++3ZEfrzKj3JrLnAyQC4CPJxlfv90Z5b4cBgcHk2D+DIDP+L6fvJr6HkylkkS0iJnv6O/vr5roes/zPCL6XwDQWvvGGGitQ2NMEIbhsDEGxhiEWg8ZY3Txb9Bae0UTb58+fbpQanPNmjUPWZb1kOd5rbW1tdNmzpw5bqqtrZ3meV6rZVkPrVmz5qHRETPmOA01NTWY6hB+JTDG4IYbboDjOPVFYTbE4/FrNlKOFUcsFoNlWfXF3q+hEryl/ERUDwBxx2pYOMuGf+2rHL4GGmcqJGOifghAQlHDolqGbyrAbYA7ahlVDuoHJ3dLCABKKS5DfevJ2spkMsOu696rtT5AwBYG6kD0h4b5a8aYd6QQPwJAJMQ90PpOED0L5p8QcMoYs4qEuL/UZW5tbf0kET0dhqHHzDN6e3tXT+BRxsMw9IQQTz/xxBNvtLe377eEEAkhZcUapxACQgin6F8nrqULOZ5LXcpd6QDDSGBLSpGIlXFOefk6B5TAaLmlpERMMpipItyO4FHuqaKtrW0OMz9m23a63MGVsbjxxhuP9PT0HCVgHpiHGHgXWltCygYGugUQg9a3sxBEwHtsjBZCzDPAB2dnzDg25v98t2VZ03zfPyeEeIyZJ5rFGwAFy7KmB0HwZwD2i0qOGqUCLf3528YNZlSSnUdU8lFzXwaxWEyPPbYsqw/A7/u+v6sYNZ0UxrM1ER555JGQgHeElHdDiB+TEPeQlGsIaM3lck1eIvEoEz1BQFMimbyLpPx3EuIrAP57xpkzwRhhSt/3fWb+lDFmNjPXjSSl1A1KqRtKzxWv+ZTv+z4AAQAWIkSoMDo7O+ODg4MXzCMLhcIMKrpPhUKhxnVdCcDYtt0UBMFO3/e/77rufWNHzqJgE5OwVTqfzT5zceSXwfwuEd0FrSGI/lgDvSAyqUTisyabdZjoV8xclRsYqNdChNK2JYBfZTKZ8SYG7DhOfyaTOTdm7vl5AOjo6Ng9phza9/3RHiwSZoSKoqWlJXn29OlXSMrG0kcIBBCAVPHXffxhrNgQkVBKTfc873nXdb+ayWT8kejrgDE/klIuuiBGQkTMnCp6KftK3SMpJVLV1Xtd1/3yWJGzMUeYWTDR3xiiASL6HABo5p+TEKeI6M9RKHyMlfqBAAQzhwDevUxQabw5YqbYaewee23ptC4SZoTKu/RE+kpmuETEZ86cGb11MJUiuoI5CTPTtKGhi+5jId4Nw1AAOM7M5yTzQmMMQ8r3GBDsefOFbdcBOEpENcYYwcxHp0ivJ5PlSJgRKu3GZpubm+9JpVJJIS6IicwA876iAhcBOFMMilQFQbAzCII+27ZXPPvss97o0JPJ5Jqbm7+USqWSNMYWEe0rinkRiM6MRlmYQULkxlvEYIw5LIUwBLwIIf5JG/MDCGGI6C8cYEbBtneCqC+Zz/9lNh5/gIA7jTGHJypzcaHBj5m5ayQQ1NbW1srMf5TP5784jlsdCTNC5VFsiBc0xg0bNuh8LscAEI/H+1avXn3Wdd2E7/svENEZy7LuGy8yeylbw8PDXAz+9K1evfrsZPJlWVYfmE8a5rkCmA6iLAGA78/MSWlLIQYY8Iaqq2+SQTCPgdOWZZ2cyG42mw1jsdgJpdT6IAhCACylvDMIgu9ms9kwGjEjXLcoFApy7PHw8HCNUuptz/O+/dRTT034uKStrW1OLpc7VSgUuMQWu64bC8Owdv369ccmygaAd5RtfzUIwwXGmCYAEJb1nCSSltbLQ8uaJsLwO9K2F4RB8EtcuNpnXGzfvj1wXffBIAjeI6JvA0AQBG1KqY7t27ebSJgRftPc3mMAHp/s9caYplgsdguAhwkYiQYlfN//eyJ6eyJbmUzGpNPpIwA+C2Yhw5DhOODzUSrKah23iGwhhE2AA+bD40VkufiQuBgcGrUNoH3NmjUHjDHc0dHxyph7wuKSP4qEGeG6ge/7ZFuWjatYuauUWuf7/othGP4DAAlmFI/P2rbdPskA0//4vq8F8Les1EYYI7UxD1uWFVdKPQfAZ+YNvu9/XxC9dwkbGoAtpZzX2tr665HzjuPw8PDwzwHAdd0ZnudRyT11RGSPiFlETSLC9QClVBbAHhDtSaVS2SuxkclkBpVSS40x/bZtT7eVmg6gXym1NJPJTGpVoNb634hIkJTfIqCRiBZYQiwH8BUw14P596SU3yIhSDP/6yVG7n8hojyA/UKIHiLqIaIe3/ePK6VOK6VO+75/fOS8EKJHCPE6EWW11j+NRswI1w0ymUyus7n5i4OpFE30NshEdlzXvc/3/e8BgG3bK6aynG/dunUH0+n0gyDKEPM0c/7RxmoYAyLKM5Cg87p5bN26dYfGs9HR0bG3tbX1T4QQnwMgJrnsVDPzTzdu3PhfkTAjXFcox3uYJeJcVjK3mxKefPLJXS0tLa9UVVU5Y0VFAIaz2WDTpk1Dl7PR0dHxCwC/uNIyRMKM8P91BL6q92eKb4tkP6r8R3PMCBGuQ0TCjBAhEmaECBEiYUaIEAkzQoQIZRNmJbf2GMEI528rN4hQSXYqcn7k3BEmL0xjjGfOPzytCKHRGsaYHAAYY7xKb4hVyl3pyi7l9k1l2isRUNAMrT/k9nQluQnacC6S2hSF6Xneof7+fox5N+6aQEqJvr4+eJ7XDQBhGB7K5/MV6RSICLlcDmEYdhdPHapUZ0REI3uSdgNAtmAOHej1oSqwB5qSwBsnAuS98+Ue9nDotVOi7Js8j8stgH0nCTmPuyOpTVGYvudtOXDggM5ms7BtG0KI0YZUriSEgGVZyGazOHDwoM4XCs8BgNZ6y/Hjx3UYhteEt5Q/CAIUuUa5c7mcrpQ4c7mc1lo/BwAmr7d8d2+f7hlixG1ACkBQeZMUQNwGeoYYz+87pXXuQ+5tr/v6/WGBRJFbUplTkfv9YcJ3Xve09s5zR5jCIPbqnj3dC2+7jXp7excrpcTI5stBECAMw6tOWmt4noeenh7sefVVffz48fZ4PL61q6uLX3755e7XXnuNstnsYqWUKG4XX9aktUY2m8XRo0f14OBg+1tvvbW1q6uLN2/e3N3f30/MvNi2bXEtP5GQy+V0oVBof+GFF7Z2dXUx9m7t7q9/n/b2FBbHlCOqFCE0jHxQnlQIGecKBv9x1MO6n53Q73ww3I7p/7gVRe5T9SfoP3uxOKYsUW0zAg3kwvKlcx7hZ+8T2ro8fajHa0fq5fPcEaY2NweAxx9//P5EIvGosu2FQohEWb9dYowXBkF3IZ/f2rFx40Vb5b/00kv3O47zKICFUspEOUXCzB4zd/u+v3Xp0qUXcR89evR+KeWjxpiyl9sY40kpu7XWW+fMmXPxJwK++eb9iKlHqxUvFFIkyvthH+0N+aIbeX8rNt96Se6U0guFKDe38QYD2Y18uBWbb9kRyWzq+D/GMsHTW3YB4wAAAABJRU5ErkJggg=='
+regions = {
+    ('active', 30, 30): (0, 0),
+    ('default', 30, 30): (31, 0),
+    ('disabled', 30, 30): (62, 0),
+    ('pressed', 30, 30): (93, 0),
+    ('selected', 30, 30): (124, 0),
+    ('btn-add-col', 18, 18): (155, 0),
+    ('btn-add-row', 18, 18): (174, 0),
+    ('btn-delete', 18, 18): (193, 0),
+    ('btn-save', 18, 18): (212, 0),
+}
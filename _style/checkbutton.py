@@ -1,16 +1,15 @@
 from tkinter import ttk
 
-from _style._checkbutton.images import images
-from utils.load import load
+from utils.load import load_icon
 
 class Checkbutton(ttk.Style):
 
     def __init__(self):
         super().__init__()
 
-        load(images['checkbutton-indicator-selected'], (20, 20), name='checkbutton_indicator_selected')
-        load(images['checkbutton-indicator-deselected'], (20, 20), name='checkbutton_indicator_deselected')
-        load(images['checkbutton-indicator-disabled'], (20, 20), name='checkbutton_indicator_disabled')
+        load_icon('_style._checkbutton', 'checkbutton-indicator-selected', (20, 20), name='checkbutton_indicator_selected')
+        load_icon('_style._checkbutton', 'checkbutton-indicator-deselected', (20, 20), name='checkbutton_indicator_deselected')
+        load_icon('_style._checkbutton', 'checkbutton-indicator-disabled', (20, 20), name='checkbutton_indicator_disabled')
 
         self.configure(
             'design1.TCheckbutton',
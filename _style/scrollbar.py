@@ -1,25 +1,24 @@
 from tkinter import ttk
 
-from _style._scrollbar.images import images
-from utils.load import load
+from utils.load import load_icon
 
 class Scrollbar(ttk.Style):
 
     def __init__(self):
         super().__init__()
 
-        load(images['scrollbar-arrow-left'], (15, 15), name='img_left')
-        load(images['scrollbar-arrow-left-active'], (15, 15), name='img_left_active')
-        load(images['scrollbar-arrow-left-pressed'], (15, 15), name='img_left_pressed')
-        load(images['scrollbar-arrow-right'], (15, 15), name='img_right')
-        load(images['scrollbar-arrow-right-active'], (15, 15), name='img_right_active')
-        load(images['scrollbar-arrow-right-pressed'], (15, 15), name='img_right_pressed')
-        load(images['scrollbar-arrow-up'], (15, 15), name='img_up')
-        load(images['scrollbar-arrow-up-active'], (15, 15), name='img_up_active')
-        load(images['scrollbar-arrow-up-pressed'], (15, 15), name='img_up_pressed')
-        load(images['scrollbar-arrow-down'], (15, 15), name='img_down')
-        load(images['scrollbar-arrow-down-active'], (15, 15), name='img_down_active')
-        load(images['scrollbar-arrow-down-pressed'], (15, 15), name='img_down_pressed')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-left', (15, 15), name='img_left')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-left-active', (15, 15), name='img_left_active')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-left-pressed', (15, 15), name='img_left_pressed')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-right', (15, 15), name='img_right')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-right-active', (15, 15), name='img_right_active')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-right-pressed', (15, 15), name='img_right_pressed')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-up', (15, 15), name='img_up')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-up-active', (15, 15), name='img_up_active')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-up-pressed', (15, 15), name='img_up_pressed')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-down', (15, 15), name='img_down')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-down-active', (15, 15), name='img_down_active')
+        load_icon('_style._scrollbar', 'scrollbar-arrow-down-pressed', (15, 15), name='img_down_pressed')
 
         self.configure(
                 'TScrollbar',
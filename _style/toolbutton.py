@@ -1,18 +1,17 @@
 from tkinter import ttk
 
-from utils.load import load
-from _style._toolbutton.images import images
+from utils.load import load_icon
 
 class Toolbutton(ttk.Style):
 
     def __init__(self):
         super().__init__()
 
-        load(images['default'], (30, 30), name='toolbutton_default')
-        load(images['active'], (30, 30), name='toolbutton_active')
-        load(images['selected'], (30, 30), name='toolbutton_selected')
-        load(images['disabled'], (30, 30), name='toolbutton_disabled')
-        load(images['pressed'], (30, 30), name='toolbutton_pressed')
+        load_icon('_style._toolbutton', 'default', (30, 30), name='toolbutton_default')
+        load_icon('_style._toolbutton', 'active', (30, 30), name='toolbutton_active')
+        load_icon('_style._toolbutton', 'selected', (30, 30), name='toolbutton_selected')
+        load_icon('_style._toolbutton', 'disabled', (30, 30), name='toolbutton_disabled')
+        load_icon('_style._toolbutton', 'pressed', (30, 30), name='toolbutton_pressed')
 
         self.configure('design1.Toolbutton', background='#404040')
         self.configure('design2.Toolbutton', background='#E9E8E8')
@@ -1,27 +1,33 @@
 #!/usr/bin/env python3
 # user.py — приложение пользователя для авторизации и фильтрации строк по матрице доступа
-import json
 import os
 import time
+from utils.startup import profiler
+profiler.start_from_env()
 import customtkinter as ctk
-from CTkMessagebox import CTkMessagebox
+from widgets.dialogs import CTkMessagebox
+from utils.metrics import metrics
+from utils.storage import storage_for, stamp
+from utils.watchdog import watchdog
 
 # Настройка внешнего вида Custom Tkinter
 ctk.set_appearance_mode("Dark")  # "System", "Dark", "Light"
 ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
 
-DATA_FILE = "access_matrix.json"
+DATA_FILE = os.environ.get("MBKS_MATRIX", "access_matrix.json")  # JSON, каталог шардов (*.d) или *.db (utils/storage.py)
 POLL_INTERVAL_MS = 1000  # опрашиваем файл каждые 1000 ms
 
-def load_matrix(path=DATA_FILE):
+def load_matrix(path=DATA_FILE, subject=None):
+    # Для известного субъекта шарды и SQLite читают только его строку.
     if not os.path.exists(path):
         return {"objects": [], "subjects": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data.setdefault("objects", [])
-        data.setdefault("subjects", {})
-        return data
+        with metrics.timer("load_matrix"):
+            storage = storage_for(path)
+            data = storage.load() if subject is None else storage.load_subject(subject)
+            data.setdefault("objects", [])
+            data.setdefault("subjects", {})
+            return data
     except Exception as e:
         CTkMessagebox(title="Ошибка загрузки", message=f"Не удалось загрузить матрицу:\n{e}", icon="cancel")
         return {"objects": [], "subjects": {}}
@@ -35,7 +41,7 @@ class ModernUserApp(ctk.CTk):
         
         self.data_file = DATA_FILE
         self.data = load_matrix(self.data_file)
-        self.last_mtime = os.path.getmtime(self.data_file) if os.path.exists(self.data_file) else None
+        self.last_mtime = stamp(self.data_file)
         self.current_user = None
         self.allowed_set = set()
         self.is_authorized = False
@@ -200,9 +206,22 @@ class ModernUserApp(ctk.CTk):
                          icon="warning")
             return
         
-        # Reload matrix to ensure fresh data
-        self.data = load_matrix(self.data_file)
-        if name not in self.data.get("subjects", {}):
+        with metrics.timer("on_login"):
+            # Reload matrix to ensure fresh data
+            self.data = load_matrix(self.data_file, name)
+            found = name in self.data.get("subjects", {})
+            if found:
+                self.current_user = name
+                self.is_authorized = True
+                self.allowed_set = set(self.data["subjects"].get(name, []))
+
+                # Update UI
+                rights_text = f"Текущие права доступа: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}"
+                self.rights_label.configure(text=rights_text)
+                self.status_label.configure(text="● Авторизован", text_color="#2ecc71")
+                self.on_filter()
+
+        if not found:
             CTkMessagebox(title="Ошибка авторизации", 
                          message=f"Пользователь '{name}' не найден в системе доступа.\n\n"
                                 "Возможные причины:\n"
@@ -212,22 +231,12 @@ class ModernUserApp(ctk.CTk):
                          icon="cancel")
             return
         
-        self.current_user = name
-        self.is_authorized = True
-        self.allowed_set = set(self.data["subjects"].get(name, []))
-        
-        # Update UI
-        rights_text = f"Текущие права доступа: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}"
-        self.rights_label.configure(text=rights_text)
-        self.status_label.configure(text="● Авторизован", text_color="#2ecc71")
-        
         CTkMessagebox(title="Успешная авторизация", 
                      message=f"Добро пожаловать, {name}!\n\n"
                             f"Ваши права доступа: {', '.join(sorted(self.allowed_set)) if self.allowed_set else 'отсутствуют'}",
                      icon="check")
-        
-        self.on_filter()
 
+    @metrics.timed()
     def on_filter(self):
         if not self.is_authorized:
             self.output_text.configure(state="normal")
@@ -256,8 +265,8 @@ class ModernUserApp(ctk.CTk):
         self.output_text.configure(state="disabled")
 
     def reload_matrix(self):
-        self.data = load_matrix(self.data_file)
-        self.last_mtime = os.path.getmtime(self.data_file) if os.path.exists(self.data_file) else None
+        self.data = load_matrix(self.data_file, self.current_user)
+        self.last_mtime = stamp(self.data_file)
         
         # Update file status
         self.file_status_label.configure(text=f"Файл матрицы: {self.get_file_status()}")
@@ -273,7 +282,14 @@ class ModernUserApp(ctk.CTk):
                      icon="info")
 
     def show_system_info(self):
+        # self.data может содержать только строку текущего субъекта (load_subject):
+        # число субъектов и объектов берётся из хранилища.
+        subjects, objects = len(self.data.get('subjects', {})), len(self.data.get('objects', []))
         if os.path.exists(self.data_file):
+            try:
+                subjects, objects = storage_for(self.data_file).counts()
+            except Exception:
+                pass
             st = os.stat(self.data_file)
             file_info = (f"Файл матрицы: {self.data_file}\n"
                         f"Размер: {st.st_size} байт ({st.st_size/1024:.1f} KB)\n"
@@ -284,8 +300,8 @@ class ModernUserApp(ctk.CTk):
         
         system_info = (f"Статус системы:\n"
                       f"• Пользователь: {self.current_user if self.is_authorized else 'Не авторизован'}\n"
-                      f"• Всего субъектов: {len(self.data.get('subjects', {}))}\n"
-                      f"• Всего объектов: {len(self.data.get('objects', []))}\n"
+                      f"• Всего субъектов: {subjects}\n"
+                      f"• Всего объектов: {objects}\n"
                       f"• Авторизован: {'Да' if self.is_authorized else 'Нет'}")
         
         full_message = f"{system_info}\n\n{file_info}"
@@ -295,34 +311,41 @@ class ModernUserApp(ctk.CTk):
                      icon="info")
 
     def poll_file_changes(self):
+        changed = False
         try:
-            if os.path.exists(self.data_file):
-                m = os.path.getmtime(self.data_file)
-                if self.last_mtime is None or m != self.last_mtime:
-                    # File changed -> reload
-                    self.data = load_matrix(self.data_file)
-                    self.last_mtime = m
-                    
-                    # Update file status
-                    self.file_status_label.configure(text=f"Файл матрицы: {self.get_file_status()}")
-                    
-                    if self.is_authorized:
-                        self.allowed_set = set(self.data["subjects"].get(self.current_user, []))
-                        rights_text = f"Текущие права доступа: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}"
-                        self.rights_label.configure(text=rights_text)
-                        self.on_filter()
-                        
-                        # Show notification about changes
-                        CTkMessagebox(title="Обновление данных", 
-                                     message="Матрица доступа была обновлена.\nВаши права перезагружены.", 
-                                     icon="info")
+            with metrics.timer("poll_file_changes"):
+                if os.path.exists(self.data_file):
+                    m = stamp(self.data_file)
+                    if self.last_mtime is None or m != self.last_mtime:
+                        # File changed -> reload
+                        self.data = load_matrix(self.data_file, self.current_user)
+                        self.last_mtime = m
+
+                        # Update file status
+                        self.file_status_label.configure(text=f"Файл матрицы: {self.get_file_status()}")
+
+                        if self.is_authorized:
+                            self.allowed_set = set(self.data["subjects"].get(self.current_user, []))
+                            rights_text = f"Текущие права доступа: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}"
+                            self.rights_label.configure(text=rights_text)
+                            self.on_filter()
+                            changed = True
         except Exception as e:
             # Non-fatal error
             print("Ошибка опроса файла:", e)
         finally:
             self.after(POLL_INTERVAL_MS, self.poll_file_changes)
 
+        if changed:
+            # Show notification about changes
+            CTkMessagebox(title="Обновление данных", 
+                         message="Матрица доступа была обновлена.\nВаши права перезагружены.", 
+                         icon="info")
 
 if __name__ == "__main__":
-    app = ModernUserApp()
+    with profiler.phase("init"):
+        app = ModernUserApp()
+    profiler.first_window(app)
+    metrics.install(app)
+    watchdog.install(app)
     app.mainloop()
\ No newline at end of file
@@ -1,51 +1,72 @@
 #!/usr/bin/env python3
 # admin.py — приложение администратора для управления матрицей доступа
-import json
 import os
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 from widgets.custom_label import EditableLabel
+from utils.history import MatrixHistory, diff, patch
+from utils.audit import AuditWriter
+from utils.audit_index import AuditIndex
+from widgets.log_view import LogView
+from utils.metrics import metrics
+from utils.storage import storage_for
+from utils.watchdog import watchdog
 from string import ascii_letters
 
-DATA_FILE = "access_matrix.json"
-LOG_FILE = "admin_log.txt"
+DATA_FILE = os.environ.get("MBKS_MATRIX", "access_matrix.json")  # JSON, каталог шардов (*.d) или *.db (utils/storage.py)
+LOG_FILE = "admin_log.txt"  # текстовый журнал: строка на действие
+AUDIT_FILE = "admin_audit.jsonl"  # структурированные записи с индексом (utils/audit_index.py)
+LOG_VIEW_LINES = 500
 MAX_SUBJECT_LEN = 256
+HISTORY_LIMIT = 500
 
 
-def write_audit(*args):
-    """Записывает строку в audit-лог."""
-    try:
-        t = time.strftime("[%Y-%m-%d %H:%M:%S]")
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(t + " " + " ".join(str(a) for a in args) + "\n")
-    except Exception:
-        pass  # не критично, если не удалось записать
+text_log = AuditWriter(LOG_FILE)
+audit = AuditWriter(AUDIT_FILE, index=True)
+
+
+def write_audit(action, subjects=(), objects=(), outcome="ok", message=""):
+    """Ставит запись в очереди журналов: строку в LOG_FILE и запись JSON в AUDIT_FILE."""
+    now = time.time()
+    t = time.strftime("[%Y-%m-%d %H:%M:%S]", time.localtime(now))
+    text_log.write(f"{t} {message or action}{'' if outcome == 'ok' else f' ({outcome})'}\n")
+    audit.write({
+        "ts": now,
+        "action": action,
+        "subjects": list(subjects),
+        "objects": list(objects),
+        "outcome": outcome,
+        "message": message,
+    })
 
 
 def load_matrix(path=DATA_FILE):
     if not os.path.exists(path):
         return {"objects": [], "subjects": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data.setdefault("objects", [])
-        data.setdefault("subjects", {})
-        for s, objs in list(data["subjects"].items()):
-            data["subjects"][s] = list(dict.fromkeys(objs))
-        data["objects"] = list(dict.fromkeys(data["objects"]))
-        return data
+        with metrics.timer("load_matrix"):
+            data = storage_for(path).load()
+            data.setdefault("objects", [])
+            data.setdefault("subjects", {})
+            for s, objs in list(data["subjects"].items()):
+                data["subjects"][s] = list(dict.fromkeys(objs))
+            data["objects"] = list(dict.fromkeys(data["objects"]))
+            return data
     except Exception as e:
         messagebox.showerror("Ошибка загрузки", f"Не удалось загрузить {path}:\n{e}")
         return {"objects": [], "subjects": {}}
 
 
-def save_matrix(data, path=DATA_FILE):
+def save_matrix(data, path=DATA_FILE, changes=None):
+    """changes — изменённые строки с прошлого сохранения (см. Storage.save). Возвращает True при успехе."""
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with metrics.timer("save_matrix"):
+            storage_for(path).save(data, changes)
+        return True
     except Exception as e:
         messagebox.showerror("Ошибка сохранения", f"Не удалось сохранить {path}:\n{e}")
+        return False
 
 
 def validate_object_token(tok):
@@ -127,15 +148,99 @@ def remove_all(data, subjects_list):
         data["subjects"][s] = []
 
 
+# Команды ниже присваивают строки целиком, а не меняют списки на месте:
+# так они работают и со словарём, и с версией из utils.history.
+def add_subject(data, subject):
+    data["subjects"][subject] = []
+
+
+def add_object(data, obj):
+    data["objects"].append(obj)
+
+
+def drop_object(data, obj):
+    data["objects"].remove(obj)
+    for s in list(data["subjects"]):
+        objs = data["subjects"][s]
+        if obj in objs:
+            data["subjects"][s] = [o for o in objs if o != obj]
+
+
+def rename(data, old, new):
+    data["subjects"][new] = data["subjects"].pop(old)
+
+
+def drop_subject(data, subject):
+    data["subjects"].pop(subject, None)
+
+
+def set_rights(data, changes):
+    """changes — {(субъект, объект): 0/1}, как значения флажков матрицы. Возвращает изменённые пары."""
+    changed = []
+    for (s, o), value in changes.items():
+        if s in data["subjects"]:
+            allowed = data["subjects"][s]
+            if value and o not in allowed:
+                data["subjects"][s] = allowed + [o]
+            elif not value and o in allowed:
+                data["subjects"][s] = [x for x in allowed if x != o]
+            else:
+                continue
+            changed.append((s, o))
+    return changed
+
+
 # --- GUI ---
+class MatrixRow:
+    """Строка матрицы: заголовок субъекта и ячейки с флажками, переиспользуемые между перерисовками."""
+
+    def __init__(self, master, row):
+        self.master = master
+        self.row = row
+        self.left = ttk.Frame(master)
+        self.left.grid(row=row, column=0, sticky="nsew", padx=1, pady=1)
+        self.btn = ttk.Button(self.left, text='🗙', width=2)
+        self.btn.pack(side=tk.LEFT)
+        self.label = EditableLabel(self.left)
+        self.label.pack(side=tk.LEFT)
+        self.cells = []
+        self.vars = []
+
+    def bind(self, subject, objects, allowed, on_delete):
+        self.btn.config(command=on_delete)
+        if self.label.get() != subject:
+            self.label.set(subject)
+        while len(self.cells) > len(objects):
+            self.cells.pop().destroy()
+            self.vars.pop()
+        for j in range(len(self.cells), len(objects)):
+            var = tk.IntVar(master=self.master)
+            cb = ttk.Checkbutton(self.master, variable=var)
+            cb.grid(row=self.row, column=j + 1, sticky="nsew", padx=1, pady=1)
+            self.cells.append(cb)
+            self.vars.append(var)
+        allowed = set(allowed)
+        for obj, var in zip(objects, self.vars):
+            value = 1 if obj in allowed else 0
+            if var.get() != value:
+                var.set(value)
+
+    def destroy(self):
+        for cb in self.cells:
+            cb.destroy()
+        self.left.destroy()
+        self.cells = []
+        self.vars = []
+
+
 class AdminApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Администратор — управление матрицей доступа")
         self.geometry("1100x650")
         self.minsize(900, 500)
-        self.data_file = DATA_FILE
-        self.data = load_matrix(self.data_file)
+        self.history = MatrixHistory({}, limit=HISTORY_LIMIT)
+        self.load(DATA_FILE)
 
         ttk.Style().theme_use("clam")
 
@@ -145,6 +250,14 @@ class AdminApp(tk.Tk):
 
         self.build_layout()
         self.check_vars = {}
+        self.corner_label = None
+        self.col_labels = []
+        self.matrix_rows = []
+        self.matrix_columns = 0
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind_all("<Control-z>", lambda e: self.on_undo())
+        self.bind_all("<Control-y>", lambda e: self.on_redo())
         self.build_matrix_ui()
 
     # --- GUI construction ---
@@ -246,62 +359,102 @@ class AdminApp(tk.Tk):
         ttk.Button(file_frame, text="Загрузить из файла...", command=self.on_load_from).pack(fill=tk.X, pady=2)
         ttk.Button(file_frame, text="Экспорт...", command=self.on_export).pack(fill=tk.X, pady=2)
 
+        history_frame = ttk.Labelframe(rf, text="История")
+        history_frame.pack(fill=tk.X, pady=5)
+        ttk.Button(history_frame, text="Отменить (Ctrl+Z)", command=self.on_undo).pack(fill=tk.X, pady=2)
+        ttk.Button(history_frame, text="Повторить (Ctrl+Y)", command=self.on_redo).pack(fill=tk.X, pady=2)
+
         info_frame = ttk.Labelframe(rf, text="Информация")
         info_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.info_text = tk.Text(info_frame, height=8, wrap=tk.WORD, state=tk.DISABLED)
+        self.info_text = LogView(
+            info_frame, capacity=LOG_VIEW_LINES, load_older=self.load_older_log, height=8, wrap=tk.WORD
+        )
         self.info_text.pack(fill=tk.BOTH, expand=True)
 
     # --- Matrix UI ---
     def build_matrix_ui(self):
-        for c in self.matrix_frame.winfo_children():
-            c.destroy()
-        self.check_vars = {}
-
+        # Виджеты не пересоздаются: существующие строки и ячейки переиспользуются,
+        # создаётся или удаляется только разница в числе строк/столбцов.
         objs = [o for o in self.data["objects"] if self.filter_object.get() in o]
         subs = [s for s in self.data["subjects"].keys() if self.filter_subject.get() in s]
 
-        ttk.Label(self.matrix_frame, text="Субъект\\Объект", borderwidth=1, relief="ridge").grid(row=0, column=0)
-        for j, obj in enumerate(objs, 1):
-            ttk.Label(self.matrix_frame, text=obj, borderwidth=1, relief="ridge", anchor="center").grid(
-                row=0, column=j, sticky="nsew"
-            )
-
-        for i, subj in enumerate(subs, 1):
-            left = ttk.Frame(self.matrix_frame)
-            left.grid(row=i, column=0, sticky="nsew", padx=1, pady=1)
-            btn = ttk.Button(left, text='🗙', width=2, command=lambda s=subj: self.delete_subject(s))
-            btn.pack(side=tk.LEFT)
-            EditableLabel(left, text=subj).pack(side=tk.LEFT)
-            for j, obj in enumerate(objs, 1):
-                var = tk.IntVar(value=1 if obj in self.data["subjects"].get(subj, []) else 0)
-                cb = ttk.Checkbutton(self.matrix_frame, variable=var)
-                cb.grid(row=i, column=j, sticky="nsew", padx=1, pady=1)
+        if self.corner_label is None:
+            self.corner_label = ttk.Label(self.matrix_frame, text="Субъект\\Объект", borderwidth=1, relief="ridge")
+            self.corner_label.grid(row=0, column=0)
+
+        while len(self.col_labels) > len(objs):
+            self.col_labels.pop().destroy()
+        for j in range(len(self.col_labels), len(objs)):
+            lbl = ttk.Label(self.matrix_frame, borderwidth=1, relief="ridge", anchor="center")
+            lbl.grid(row=0, column=j + 1, sticky="nsew")
+            self.col_labels.append(lbl)
+        for lbl, obj in zip(self.col_labels, objs):
+            lbl.config(text=obj)
+
+        while len(self.matrix_rows) > len(subs):
+            self.matrix_rows.pop().destroy()
+        for i in range(len(self.matrix_rows), len(subs)):
+            self.matrix_rows.append(MatrixRow(self.matrix_frame, i + 1))
+
+        self.check_vars = {}
+        for row, subj in zip(self.matrix_rows, subs):
+            row.bind(subj, objs, self.data["subjects"].get(subj, []), lambda s=subj: self.delete_subject(s))
+            for obj, var in zip(objs, row.vars):
                 self.check_vars[(subj, obj)] = var
 
+        for c in range(len(objs) + 1, self.matrix_columns + 1):
+            self.matrix_frame.grid_columnconfigure(c, weight=0)
         for c in range(len(objs) + 1):
             self.matrix_frame.grid_columnconfigure(c, weight=1)
+        self.matrix_columns = len(objs)
 
     # --- Utility ---
-    def log(self, *args):
-        t = time.strftime("%Y-%m-%d %H:%M:%S")
-        line = f"[{t}] " + " ".join(str(a) for a in args)
-        self.info_text.config(state=tk.NORMAL)
-        self.info_text.insert("end", line + "\n")
-        self.info_text.see("end")
-        self.info_text.config(state=tk.DISABLED)
-        write_audit(*args)
+    def log(self, message, action="info", subjects=(), objects=(), outcome="ok"):
+        now = time.time()
+        t = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        self.info_text.append(f"[{t}] {message}", now)
+        write_audit(action, subjects, objects, outcome, message)
+
+    def load_older_log(self, before, count):
+        """Подгружает из audit-лога записи, более ранние чем before (вызывается вне потока Tk)."""
+        audit.flush(timeout=1)
+        index = AuditIndex(AUDIT_FILE)  # соединение SQLite — в потоке, который его использует
+        try:
+            return [
+                (r["ts"], f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(r['ts']))}] {r['message']}")
+                for r in index.query(until=before, limit=count, newest=True)
+            ]
+        finally:
+            index.close()
+
+    def execute(self, command, *args):
+        """Выполняет команду как новую версию в истории и переносит изменения в self.data."""
+        result, d = self.history.apply(command, *args)
+        patch(self.data, d, self.history.head)
+        return result
+
+    def load(self, path):
+        """Загружает матрицу из path; дальше save() пишет в этот же файл."""
+        self.data = load_matrix(path)
+        self.history.reset(self.data)
+        self.data_file = path
+        self.saved = self.history.head  # версия, записанная в data_file
+
+    def save(self):
+        """Сохраняет в data_file только строки, изменённые с прошлого сохранения."""
+        head = self.history.head
+        if save_matrix(self.data, self.data_file, diff(self.saved, head).subjects):
+            self.saved = head
 
     def apply_matrix_changes(self):
-        for (s, o), var in self.check_vars.items():
-            if s in self.data["subjects"]:
-                allowed = set(self.data["subjects"][s])
-                if var.get():
-                    allowed.add(o)
-                else:
-                    allowed.discard(o)
-                self.data["subjects"][s] = list(allowed)
-        save_matrix(self.data)
-        self.log("Матрица обновлена и сохранена.")
+        # Запись в хранилище учитывается отдельно, в save_matrix (её ошибка показывается диалогом).
+        with metrics.timer("apply_matrix_changes"):
+            changed = self.execute(set_rights, {key: var.get() for key, var in self.check_vars.items()})
+        self.save()
+        self.log(
+            "Матрица обновлена и сохранена.", "apply",
+            sorted({s for s, _ in changed}), sorted({o for _, o in changed})
+        )
 
     # --- Controls ---
     def on_add_subject(self):
@@ -315,9 +468,9 @@ class AdminApp(tk.Tk):
         if name in self.data["subjects"]:
             messagebox.showinfo("Инфо", "Такой субъект уже существует.")
             return
-        self.data["subjects"][name] = []
+        self.execute(add_subject, name)
         self.build_matrix_ui()
-        self.log(f"Добавлен субъект {name}")
+        self.log(f"Добавлен субъект {name}", "add_subject", [name])
 
     def on_add_object(self):
         obj = self.add_object_entry.get().strip()
@@ -327,9 +480,9 @@ class AdminApp(tk.Tk):
         if obj in self.data["objects"]:
             messagebox.showinfo("Инфо", "Такой объект уже существует.")
             return
-        self.data["objects"].append(obj)
+        self.execute(add_object, obj)
         self.build_matrix_ui()
-        self.log(f"Добавлен объект {obj}")
+        self.log(f"Добавлен объект {obj}", "add_object", objects=[obj])
 
     def on_delete_object(self):
         obj = self.add_object_entry.get().strip()
@@ -341,81 +494,108 @@ class AdminApp(tk.Tk):
             return
         if not messagebox.askyesno("Подтверждение", f"Удалить объект '{obj}' и все связанные права?"):
             return
-        self.data["objects"].remove(obj)
-        for s in self.data["subjects"]:
-            if obj in self.data["subjects"][s]:
-                self.data["subjects"][s].remove(obj)
+        self.execute(drop_object, obj)
         self.build_matrix_ui()
-        self.log(f"Удалён объект {obj}")
+        self.log(f"Удалён объект {obj}", "delete_object", objects=[obj])
 
     def on_grant(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            objs = parse_objects(self.cmd_objects.get())
-            grant(self.data, subs, objs)
-            self.build_matrix_ui()
-            self.log(f"grant {subs} -> {objs}")
+            with metrics.timer("on_grant"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                objs = parse_objects(self.cmd_objects.get())
+                self.execute(grant, subs, objs)
+                self.build_matrix_ui()
+                self.log(f"grant {subs} -> {objs}", "grant", subs, objs)
         except Exception as e:
+            write_audit("grant", outcome="error", message=str(e))
             messagebox.showerror("Ошибка grant", str(e))
 
     def on_create(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get()) if self.cmd_subjects.get().strip() else []
-            objs = parse_objects(self.cmd_objects.get()) if self.cmd_objects.get().strip() else []
-            for subj in subs:
-                status = create(self.data, subj, objs)
-                self.log(f"create {subj} -> {objs} ({status})")
-            self.build_matrix_ui()
+            with metrics.timer("on_create"):
+                subs = parse_subjects(self.cmd_subjects.get()) if self.cmd_subjects.get().strip() else []
+                objs = parse_objects(self.cmd_objects.get()) if self.cmd_objects.get().strip() else []
+                for subj in subs:
+                    status = self.execute(create, subj, objs)
+                    self.log(f"create {subj} -> {objs} ({status})", "create", [subj], objs)
+                self.build_matrix_ui()
         except Exception as e:
+            write_audit("create", outcome="error", message=str(e))
             messagebox.showerror("Ошибка create", str(e))
 
     def on_remove(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            objs = parse_objects(self.cmd_objects.get())
-            remove(self.data, subs, objs)
-            self.build_matrix_ui()
-            self.log(f"remove {subs} -/-> {objs}")
+            with metrics.timer("on_remove"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                objs = parse_objects(self.cmd_objects.get())
+                self.execute(remove, subs, objs)
+                self.build_matrix_ui()
+                self.log(f"remove {subs} -/-> {objs}", "remove", subs, objs)
         except Exception as e:
+            write_audit("remove", outcome="error", message=str(e))
             messagebox.showerror("Ошибка remove", str(e))
 
     def on_grant_all(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            grant_all(self.data, subs)
-            self.build_matrix_ui()
-            self.log(f"grant_all {subs}")
+            with metrics.timer("on_grant_all"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                self.execute(grant_all, subs)
+                self.build_matrix_ui()
+                self.log(f"grant_all {subs}", "grant_all", subs)
         except Exception as e:
+            write_audit("grant_all", outcome="error", message=str(e))
             messagebox.showerror("Ошибка grant_all", str(e))
 
     def on_remove_all(self):
         try:
-            subs = parse_subjects(self.cmd_subjects.get())
-            remove_all(self.data, subs)
-            self.build_matrix_ui()
-            self.log(f"remove_all {subs}")
+            with metrics.timer("on_remove_all"):
+                subs = parse_subjects(self.cmd_subjects.get())
+                self.execute(remove_all, subs)
+                self.build_matrix_ui()
+                self.log(f"remove_all {subs}", "remove_all", subs)
         except Exception as e:
+            write_audit("remove_all", outcome="error", message=str(e))
             messagebox.showerror("Ошибка remove_all", str(e))
 
+    def on_undo(self):
+        d = self.history.undo()
+        if d is None:
+            return
+        patch(self.data, d, self.history.head)
+        self.build_matrix_ui()
+        self.log("Отмена последнего изменения", "undo", list(d.subjects), d.objects_added + d.objects_removed)
+
+    def on_redo(self):
+        d = self.history.redo()
+        if d is None:
+            return
+        patch(self.data, d, self.history.head)
+        self.build_matrix_ui()
+        self.log("Повтор отменённого изменения", "redo", list(d.subjects), d.objects_added + d.objects_removed)
+
+    def on_close(self):
+        text_log.close()
+        audit.close()
+        self.destroy()
+
     def on_save(self):
-        save_matrix(self.data)
-        self.log("Матрица сохранена в файл.")
+        self.save()
+        self.log("Матрица сохранена в файл.", "save")
 
     def on_load_from(self):
         path = filedialog.askopenfilename(title="Загрузить матрицу", filetypes=[("JSON", "*.json")])
         if not path:
             return
-        self.data = load_matrix(path)
-        self.data_file = path
+        self.load(path)
         self.build_matrix_ui()
-        self.log(f"Загружена матрица из {path}")
+        self.log(f"Загружена матрица из {path}", "load")
 
     def on_export(self):
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
         if not path:
             return
         save_matrix(self.data, path)
-        self.log(f"Экспортирована матрица в {path}")
+        self.log(f"Экспортирована матрица в {path}", "export")
 
     def rename_subject(self, subj):
         new = simpledialog.askstring("Переименование", f"Новое имя для '{subj}':", parent=self)
@@ -424,18 +604,20 @@ class AdminApp(tk.Tk):
         if new in self.data["subjects"]:
             messagebox.showerror("Ошибка", "Такое имя уже существует.")
             return
-        self.data["subjects"][new] = self.data["subjects"].pop(subj)
+        self.execute(rename, subj, new)
         self.build_matrix_ui()
-        self.log(f"Переименован {subj} -> {new}")
+        self.log(f"Переименован {subj} -> {new}", "rename", [subj, new])
 
     def delete_subject(self, subj):
         if not messagebox.askyesno("Подтверждение", f"Удалить субъекта '{subj}'?"):
             return
-        self.data["subjects"].pop(subj, None)
+        self.execute(drop_subject, subj)
         self.build_matrix_ui()
-        self.log(f"Удалён субъект {subj}")
+        self.log(f"Удалён субъект {subj}", "delete_subject", [subj])
 
 
 if __name__ == "__main__":
     app = AdminApp()
+    metrics.install(app)
+    watchdog.install(app)
     app.mainloop()
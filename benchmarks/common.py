@@ -0,0 +1,176 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from string import ascii_letters
+
+# Общая часть бенчмарков: генераторы данных, замеры, сравнение с базовой линией.
+# Каждый случай (Case) — функция, которая по параметрам готовит аргументы (setup
+# не входит в замер) и возвращает вызываемый объект для одного повторения.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 0.2  # замедление медианы больше чем на 20% считается регрессией
+
+
+def make_objects(count):
+    """Объекты: латинские буквы, как в приложении; сверх 52 — синтетические имена."""
+    letters = list(ascii_letters)
+    return letters[:count] + [f"o{i}" for i in range(count - len(letters))]
+
+
+def make_matrix(subjects, objects, density=0.5, seed=0):
+    """Матрица в формате access_matrix.json: у каждого субъекта доля density объектов."""
+    rnd = random.Random(seed)
+    objs = make_objects(objects)
+    return {
+        "objects": objs,
+        "subjects": {f"user{i}": [o for o in objs if rnd.random() < density] for i in range(subjects)},
+    }
+
+
+def make_text(length, alphabet=ascii_letters + " ,.0123456789", seed=0):
+    rnd = random.Random(seed)
+    return "".join(rnd.choice(alphabet) for _ in range(length))
+
+
+def make_subject_list(count, seed=0):
+    """Строка имён субъектов через запятые и пробелы — вход parse_subjects."""
+    rnd = random.Random(seed)
+    return "".join(f"user{i}{rnd.choice([', ', ' ', ',', '  '])}" for i in range(count))
+
+
+class Case:
+
+    def __init__(self, name, setup, params, quick=None):
+        self.name = name
+        self.setup = setup
+        self.params = params
+        self.quick = quick if quick is not None else params[:1]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    k = (len(values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def measure(setup, param, repeat=7, min_time=0.2):
+    """Время одного вызова (число вызовов на повторение подбирается под min_time) и пик памяти.
+
+    Пик памяти снимается отдельным прогоном под tracemalloc, чтобы не искажать время.
+    """
+    run = setup(param)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            run = setup(param)
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    run = setup(param)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": median,
+        "p90": percentile(samples, 0.9),
+        "p99": percentile(samples, 0.99),
+        "ops_per_sec": 1 / median if median else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """[(ключ, было, стало, отношение)] для случаев, где медиана выросла больше чем на threshold."""
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        if ratio > 1 + threshold:
+            regressions.append((key, old["median"], result["median"], ratio))
+    return regressions
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(cases, argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки матрицы доступа.")
+    parser.add_argument("-k", dest="pattern", default="", help="только случаи, в имени которых есть подстрока")
+    parser.add_argument("--quick", action="store_true", help="только малые размеры")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--json", help="записать результаты в файл")
+    parser.add_argument("--baseline", default=BASELINE, help="файл базовой линии для сравнения")
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как базовую линию")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = dict()
+    for case in cases:
+        if args.pattern not in case.name:
+            continue
+        for param in (case.quick if args.quick else case.params):
+            key = f"{case.name}[{param}]"
+            result = measure(case.setup, param, repeat=args.repeat)
+            results[key] = result
+            print(f"{key:<48} {_format_time(result['median']):>10}  p90 {_format_time(result['p90']):>10}"
+                  f"  p99 {_format_time(result['p99']):>10}  {result['ops_per_sec']:>12.1f} op/s"
+                  f"  peak {result['peak_bytes'] / 1024:>10.1f} KiB", flush=True)
+
+    report = {"python": sys.version.split()[0], "platform": platform.platform(), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f"РЕГРЕССИЯ {key}: {_format_time(old)} -> {_format_time(new)} (x{ratio:.2f})")
+        status = 1 if regressions else 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
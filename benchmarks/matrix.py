@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Бенчмарки модели матрицы, сохранения и фильтрации.
+# Запуск из корня репозитория: python -m benchmarks.matrix [--quick] [-k grant] [--json out.json]
+# Команды grant/remove/grant_all/remove_all идемпотентны, поэтому повторные вызовы
+# в одном замере работают с той же матрицей без пересоздания.
+import atexit
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.common import Case, main, make_matrix, make_objects, make_subject_list, make_text
+
+import admin
+import user
+
+SIZES = [(100, 52), (1000, 52), (10000, 52), (10000, 500), (100000, 52)]
+QUICK = [(100, 52), (1000, 52)]
+TEXTS = [100, 10000, 1000000]
+DENSITY = 0.5
+SELECTED = 0.1  # доля субъектов, к которым применяется команда
+
+TMP = tempfile.mkdtemp(prefix="mbks-bench-")
+atexit.register(shutil.rmtree, TMP, True)
+
+
+@functools.lru_cache(maxsize=None)
+def _matrix_file(size):
+    subjects, objects = size
+    path = os.path.join(TMP, f"matrix_{subjects}x{objects}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_matrix(subjects, objects, DENSITY), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def setup_load(module):
+    def setup(size):
+        path = _matrix_file(size)
+        return lambda: module.load_matrix(path)
+    return setup
+
+
+def setup_save(size):
+    data = make_matrix(*size, DENSITY)
+    path = os.path.join(TMP, "saved.json")
+    return lambda: admin.save_matrix(data, path)
+
+
+def setup_command(command, with_objects):
+    def setup(size):
+        data = make_matrix(*size, DENSITY)
+        subjects = list(data["subjects"])[:max(1, int(len(data["subjects"]) * SELECTED))]
+        objects = make_objects(size[1])[::2]
+        if with_objects:
+            return lambda: command(data, subjects, objects)
+        return lambda: command(data, subjects)
+    return setup
+
+
+def setup_create(size):
+    data = make_matrix(*size, DENSITY)
+    objects = make_objects(size[1])[::3]
+
+    def run():
+        admin.create(data, "new", objects)
+        del data["subjects"]["new"]  # следующий вызов снова создаёт субъекта
+    return run
+
+
+def setup_parse_subjects(count):
+    text = make_subject_list(count)
+    return lambda: admin.parse_subjects(text)
+
+
+def setup_parse_objects(length):
+    text = make_text(length, alphabet="".join(make_objects(52)))
+    return lambda: admin.parse_objects(text)
+
+
+def setup_filter(length):
+    text = make_text(length)
+    allowed = set(make_matrix(1, 52, DENSITY)["subjects"]["user0"])
+    return lambda: user.filter_text(text, allowed)
+
+
+CASES = [
+    Case("admin.load_matrix", setup_load(admin), SIZES, QUICK),
+    Case("user.load_matrix", setup_load(user), SIZES, QUICK),
+    Case("save_matrix", setup_save, SIZES, QUICK),
+    Case("create", setup_create, SIZES, QUICK),
+    Case("grant", setup_command(admin.grant, True), SIZES, QUICK),
+    Case("remove", setup_command(admin.remove, True), SIZES, QUICK),
+    Case("grant_all", setup_command(admin.grant_all, False), SIZES, QUICK),
+    Case("remove_all", setup_command(admin.remove_all, False), SIZES, QUICK),
+    Case("parse_subjects", setup_parse_subjects, [100, 10000, 100000], [100]),
+    Case("parse_objects", setup_parse_objects, TEXTS, TEXTS[:1]),
+    Case("on_filter", setup_filter, TEXTS, TEXTS[:2]),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main(CASES))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# Бенчмарк отрисовки виджета widgets.matrix.Matrix под виртуальным X-сервером (Xvfb).
+# Запуск из корня репозитория: python -m benchmarks.matrix_widget [--quick] [--json out.json]
+# Если DISPLAY не задан (или указан --xvfb), запускается собственный Xvfb.
+# Кроме времени, для каждой операции считаются элементы холста, Tk-виджеты,
+# команды Tcl и переменные Tcl, созданные операцией.
+# Базовая линия benchmarks/baseline_widget.json в репозитории не хранится: её нужно записать
+# (--save-baseline) на машине с Xvfb или дисплеем. Пока её нет, сравнение не выполняется
+# и регрессии не обнаруживаются — об этом печатается предупреждение.
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import BASELINE, THRESHOLD, compare, make_matrix, percentile
+
+SIZES = [(10, 10), (50, 26), (100, 52), (300, 52)]
+QUICK = [(10, 10), (50, 26)]
+GEOMETRY = (1280, 800)
+RESIZED = (900, 600)
+SCROLL_STEPS = 10
+WIDGET_BASELINE = BASELINE.replace("baseline.json", "baseline_widget.json")
+
+
+def start_xvfb(screen="1920x1080x24", timeout=10):
+    """Запускает Xvfb на свободном дисплее и выставляет DISPLAY; возвращает процесс."""
+    binary = shutil.which("Xvfb")
+    if binary is None:
+        raise RuntimeError("Xvfb не найден: установите xvfb или задайте DISPLAY.")
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        proc = subprocess.Popen(
+            [binary, f":{number}", "-screen", "0", screen, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        proc.kill()
+    raise RuntimeError("Не удалось запустить Xvfb.")
+
+
+class _Confirm:
+    """Подмена окна подтверждения: delete_selected удаляет без показа диалога."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get(self):
+        return "Удалить"
+
+
+class Bench:
+
+    def __init__(self, root, size):
+        from widgets.matrix import Matrix
+
+        self.root = root
+        self.size = size
+        root.geometry("%dx%d" % GEOMETRY)
+        self.matrix = Matrix(root, make_matrix(*size, density=0.5))
+        self.matrix.pack(fill="both", expand=True)
+        root.update()
+
+    def destroy(self):
+        self.matrix.destroy()
+        self.root.update()
+
+    def counters(self):
+        tk = self.root.tk
+        return {
+            "canvas_items": len(self.matrix.canvas.find_all()),
+            "widgets": len(self.matrix.canvas.winfo_children()),
+            "tcl_commands": len(tk.splitlist(tk.call("info", "commands"))),
+            "tcl_vars": len(tk.splitlist(tk.call("info", "globals"))),
+        }
+
+    def timed(self, action):
+        before = self.counters()
+        start = time.perf_counter()
+        action()
+        self.root.update()
+        elapsed = time.perf_counter() - start
+        after = self.counters()
+        delta = {f"{k}_delta": after[k] - before[k] for k in after}
+        return elapsed, dict(after, **delta)
+
+    # Операции. Каждая возвращает функцию, выполняемую под замером.
+
+    def op_redraw(self):
+        return self.matrix.redraw
+
+    def op_resize(self):
+        sizes = iter([RESIZED, GEOMETRY] * 1000)
+        return lambda: self.root.geometry("%dx%d" % next(sizes))
+
+    def op_scroll(self):
+        def scroll():
+            for i in range(SCROLL_STEPS + 1):
+                self.matrix.canvas.yview_moveto(i / SCROLL_STEPS)
+                self.matrix.canvas.xview_moveto(i / SCROLL_STEPS)
+                self.root.update_idletasks()
+        return scroll
+
+    def op_toggle(self):
+        var = next(iter(self.matrix.check_vars.values()))
+        return lambda: var.set(1 - var.get())
+
+    def op_rename(self):
+        def rename():
+            old = next(iter(self.matrix.data["subjects"]))
+            self.matrix.rename_subject(old, old + "_")
+        return rename
+
+    def op_delete_selected(self):
+        def delete():
+            self.matrix.select("row_0")
+            self.matrix.delete_selected()
+        return delete
+
+
+OPERATIONS = ["redraw", "resize", "scroll", "toggle", "rename", "delete_selected"]
+
+
+def run(sizes, operations, repeat):
+    import tkinter as tk
+    import widgets.matrix
+    from style import Style
+
+    widgets.matrix.CTkMessagebox = _Confirm
+    root = tk.Tk()
+    Style()
+    results = dict()
+    try:
+        for size in sizes:
+            key = f"{size[0]}x{size[1]}"
+            start = time.perf_counter()
+            bench = Bench(root, size)
+            initial = time.perf_counter() - start
+            results[f"initial[{key}]"] = dict(_stats([initial]), **bench.counters())
+            bench.destroy()
+            for name in operations:
+                samples = []
+                counters = None
+                for _ in range(repeat):
+                    # Каждое повторение — на свежем виджете: операции меняют данные.
+                    bench = Bench(root, size)
+                    elapsed, counters = bench.timed(getattr(bench, "op_" + name)())
+                    samples.append(elapsed)
+                    bench.destroy()
+                results[f"{name}[{key}]"] = dict(_stats(samples), **counters)
+                print(f"{name + '[' + key + ']':<28} {results[f'{name}[{key}]']['median'] * 1000:>10.2f} ms"
+                      f"  items {counters['canvas_items']:>7}  widgets {counters['widgets']:>6}"
+                      f"  tcl cmds +{counters['tcl_commands_delta']}", flush=True)
+    finally:
+        root.destroy()
+    return results
+
+
+def _stats(samples):
+    return {
+        "repeat": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p90": percentile(samples, 0.9),
+        "max": max(samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк отрисовки виджета Matrix.")
+    parser.add_argument("--quick", action="store_true", help="только малые размеры")
+    parser.add_argument("--size", action="append", help="размер субъекты x объекты, например 200x52")
+    parser.add_argument("-k", dest="operations", action="append", choices=OPERATIONS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--xvfb", action="store_true", help="запустить Xvfb, даже если DISPLAY задан")
+    parser.add_argument("--json", help="записать результаты в файл")
+    parser.add_argument("--baseline", default=WIDGET_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = [tuple(int(x) for x in s.lower().split("x")) for s in args.size] if args.size else None
+    sizes = sizes or (QUICK if args.quick else SIZES)
+
+    xvfb = start_xvfb() if args.xvfb or not os.environ.get("DISPLAY") else None
+    try:
+        results = run(sizes, args.operations or OPERATIONS, args.repeat)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    report = {"python": sys.version.split()[0], "platform": platform.platform(), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f"РЕГРЕССИЯ {key}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms (x{ratio:.2f})")
+        status = 1 if regressions else 0
+    elif not args.save_baseline:
+        print(f"Базовая линия {args.baseline} не найдена: сравнение не выполнялось "
+              f"(записать: --save-baseline).", file=sys.stderr)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from data.registry import LabelRegistry, FileRegistry
+
+labels = LabelRegistry()
+files = FileRegistry()
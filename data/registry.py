@@ -0,0 +1,273 @@
+from array import array
+import xml.etree.ElementTree as ET
+import os.path
+
+# Реестры меток и файлов разметки. Метки и файлы получают устойчивые целые id
+# (порядок добавления), повторное добавление находит существующую запись по хеш-индексу.
+# Атрибуты файлов хранятся по столбцам в массивах array, а не в отдельных объектах.
+NONE = -1
+
+
+class Label:
+    """Метка реестра; source_id — id метки в файле разметки, из которого она пришла первой."""
+
+    __slots__ = ('id', 'name', 'color', 'source_id')
+
+    def __init__(self, id, name, color, source_id=None):
+        self.id = id
+        self.name = name
+        self.color = color
+        self.source_id = source_id
+
+    @property
+    def xml_id(self):
+        return str(self.id) if self.source_id is None else self.source_id
+
+    def toXML(self, id=None):
+        return ET.Element('label', {
+            'id': self.xml_id if id is None else str(id),
+            'name': self.name or '',
+            'color': self.color or ''
+        })
+
+
+class LabelRegistry:
+
+    def __init__(self):
+        self._labels = list()
+        self._by_key = dict()
+        self._by_name = dict()
+        self._by_color = dict()
+
+    def append(self, name, color, source_id=None):
+        key = (name, color)
+        label = self._by_key.get(key)
+        if label is not None:
+            if label.source_id is None:
+                label.source_id = source_id
+            return label
+        label = Label(len(self._labels), name, color, source_id)
+        self._labels.append(label)
+        self._by_key[key] = label
+        self._by_name.setdefault(name, []).append(label)
+        self._by_color.setdefault(color, []).append(label)
+        return label
+
+    def get(self, id):
+        return self._labels[id]
+
+    def find(self, name, color):
+        return self._by_key.get((name, color))
+
+    def by_name(self, name):
+        return list(self._by_name.get(name, ()))
+
+    def by_color(self, color):
+        return list(self._by_color.get(color, ()))
+
+    def clear(self):
+        self._labels.clear()
+        self._by_key.clear()
+        self._by_name.clear()
+        self._by_color.clear()
+
+    def __iter__(self):
+        return iter(self._labels)
+
+    def __len__(self):
+        return len(self._labels)
+
+
+def _int(value):
+    """Целое для столбца array или None, если значение не число (оно хранится текстом)."""
+    if value is None or value == '':
+        return NONE
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _bool(value):
+    if value is None or value == '':
+        return NONE
+    value = str(value).lower()
+    if value in ('true', '1'):
+        return 1
+    if value in ('false', '0'):
+        return 0
+    return None
+
+
+class File:
+    """Представление записи реестра файлов; данные лежат в столбцах FileRegistry."""
+
+    __slots__ = ('registry', 'id')
+
+    def __init__(self, registry, id):
+        self.registry = registry
+        self.id = id
+
+    def __eq__(self, other):
+        return isinstance(other, File) and other.registry is self.registry and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"File({self.id}, {self.path!r})"
+
+    @property
+    def path(self):
+        return self.registry.paths[self.id]
+
+    @property
+    def width(self):
+        return self.registry._value('width', self.registry.widths, self.id)
+
+    @property
+    def height(self):
+        return self.registry._value('height', self.registry.heights, self.id)
+
+    @property
+    def colored(self):
+        value = self.registry._value('colored', self.registry.colored, self.id)
+        return value if value is None or isinstance(value, str) else bool(value)
+
+    @property
+    def sequence(self):
+        return self.registry.sequences[self.id]
+
+    @property
+    def geometry(self):
+        """FileGeometry объектов файла или None, если объекты не регистрировались."""
+        return self.registry.geometries[self.id]
+
+    @property
+    def labels(self):
+        """{id метки в исходном файле: Label} для меток объектов или None."""
+        return self.registry.label_maps[self.id]
+
+    def toXML(self, path, label_ids=None):
+        """Элемент файла с объектами; label_ids — {Label: id при записи}, по умолчанию Label.xml_id."""
+        tag = 'pointCloud' if self.registry.dim == '3D' else 'image'
+        attrs = {'path': os.path.relpath(self.path, path) if path else self.path}
+        for name in ('width', 'height', 'colored', 'sequence'):
+            value = getattr(self, name)
+            if isinstance(value, bool):
+                attrs[name] = 'true' if value else 'false'
+            elif value is not None:
+                attrs[name] = str(value)
+        element = ET.Element(tag, attrs)
+        geometry = self.geometry
+        if geometry is None:
+            return element
+        labels = self.labels or {}
+        for i, source in enumerate(geometry.labels):
+            label = labels.get(source)
+            if label is None:
+                id = source
+            elif label_ids is not None:
+                id = label_ids[label]
+            else:
+                id = label.xml_id
+            attrs = {} if id is None else {'label': str(id)}
+            attrs['points'] = geometry.text(i)
+            ET.SubElement(element, 'object', attrs)
+        return element
+
+
+class FileRegistry:
+
+    def __init__(self, dim='2D'):
+        self.dim = dim
+        self.paths = list()
+        self.widths = array('i')
+        self.heights = array('i')
+        self.colored = array('b')
+        self.sequences = list()  # текст: имя последовательности не обязательно число
+        # Геометрия и карта меток — только для экспорта; потоковое чтение их не хранит (None).
+        self.geometries = list()
+        self.label_maps = list()
+        self._text = dict()  # (столбец, id) -> значение, которое не является числом
+        self._by_path = dict()
+        self._views = list()
+
+    def _value(self, name, column, id):
+        value = column[id]
+        if value == NONE:
+            return self._text.get((name, id))
+        return value
+
+    def _set(self, name, column, id, value, convert):
+        number = convert(value)
+        self._text.pop((name, id), None)
+        if number is None:
+            self._text[(name, id)] = value
+            number = NONE
+        if id == len(column):
+            column.append(number)
+        else:
+            column[id] = number
+
+    def append(self, path, sequence=None, width=None, height=None, colored=None,
+               geometry=None, labels=None):
+        """Добавляет файл или обновляет атрибуты уже зарегистрированного пути.
+
+        geometry — FileGeometry объектов файла, labels — {id метки в файле: Label}.
+        """
+        id = self._by_path.get(path)
+        if id is None:
+            id = len(self.paths)
+            self._by_path[path] = id
+            self.paths.append(path)
+            self._set('width', self.widths, id, width, _int)
+            self._set('height', self.heights, id, height, _int)
+            self._set('colored', self.colored, id, colored, _bool)
+            self.sequences.append(sequence or None)
+            self.geometries.append(geometry)
+            self.label_maps.append(labels)
+            self._views.append(File(self, id))
+        else:
+            if width is not None:
+                self._set('width', self.widths, id, width, _int)
+            if height is not None:
+                self._set('height', self.heights, id, height, _int)
+            if colored is not None:
+                self._set('colored', self.colored, id, colored, _bool)
+            if sequence is not None:
+                self.sequences[id] = sequence or None
+            if geometry is not None:
+                self.geometries[id] = geometry
+            if labels is not None:
+                self.label_maps[id] = labels
+        return self._views[id]
+
+    def get(self, id):
+        return self._views[id]
+
+    def find(self, path):
+        id = self._by_path.get(path)
+        return None if id is None else self._views[id]
+
+    def clear(self):
+        # Столбцы очищаются на месте: у существующих представлений File тот же реестр.
+        self.paths.clear()
+        del self.widths[:]
+        del self.heights[:]
+        del self.colored[:]
+        self.sequences.clear()
+        self.geometries.clear()
+        self.label_maps.clear()
+        self._text.clear()
+        self._by_path.clear()
+        self._views.clear()
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self._by_path
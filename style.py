@@ -1,32 +1,75 @@
+import importlib
 from tkinter import ttk
 
-from _style.scrollbar import Scrollbar
-from _style.toolbutton import Toolbutton
-from _style.separator import Separator
-from _style.frame import Frame, LabelFrame
-from _style.button import Button
-from _style.label import Label
-from _style.paned_window import PanedWindow
-from _style.combobox import Combobox
-from _style.progressbar import Progressbar
-from _style.checkbutton import Checkbutton
+# Стили регистрируются лениво: модуль _style и его картинки загружаются
+# при создании первого виджета с соответствующим стилем.
+REGISTRY = {
+    'TScrollbar': ('_style.scrollbar', 'Scrollbar'),
+    'Toolbutton': ('_style.toolbutton', 'Toolbutton'),
+    'TSeparator': ('_style.separator', 'Separator'),
+    'TFrame': ('_style.frame', 'Frame'),
+    'TLabelframe': ('_style.frame', 'LabelFrame'),
+    'TButton': ('_style.button', 'Button'),
+    'TLabel': ('_style.label', 'Label'),
+    'TPanedwindow': ('_style.paned_window', 'PanedWindow'),
+    'TCombobox': ('_style.combobox', 'Combobox'),
+    'Combobox.TButton': ('_style.combobox', 'Combobox'),
+    'Combobox.TEntry': ('_style.combobox', 'Combobox'),
+    'TProgressbar': ('_style.progressbar', 'Progressbar'),
+    'TCheckbutton': ('_style.checkbutton', 'Checkbutton'),
+}
+
+# Стиль регистрирует сам виджет: конструкторы виджетов со своим style= (widgets/)
+# вызывают ensure_widget(self) или ensure(имя стиля). Виджеты, созданные до Style(),
+# регистрируются обходом дерева при его создании.
+_active = None  # ленивый Style приложения
+
+
+def ensure(style):
+    """Регистрирует style в ленивом Style приложения; до его создания ничего не делает."""
+    if _active is not None:
+        _active.ensure(style)
+
+
+def ensure_widget(widget):
+    """Регистрирует стиль виджета ttk: -style или стиль класса по умолчанию."""
+    if _active is not None:
+        _active.ensure(widget.cget('style') or widget.winfo_class())
 
 
 class Style(ttk.Style):
 
-    def __init__(self):
+    def __init__(self, lazy=True):
         super().__init__()
 
         self.theme_use('clam')
+        self.registered = set()
+
+        if not lazy:
+            for name in REGISTRY:
+                self.ensure(name)
+            return
+
+        global _active
+        _active = self
+        # Виджеты, созданные до Style(), регистрируем сразу.
+        self.ensure_tree(self.master)
+
+    def ensure(self, style):
+        """Регистрирует стиль style и все стили, от которых он наследуется (design1.TButton -> TButton)."""
+        if not style:
+            return
+        parts = str(style).split('.')
+        for i in range(len(parts)):
+            entry = REGISTRY.get('.'.join(parts[i:]))
+            if entry is None or entry in self.registered:
+                continue
+            self.registered.add(entry)
+            module, name = entry
+            getattr(importlib.import_module(module), name)()
 
-        Scrollbar()
-        Toolbutton()
-        Separator()
-        Frame()
-        LabelFrame()
-        Button()
-        Label()
-        PanedWindow()
-        Combobox()
-        Progressbar()
-        Checkbutton()
+    def ensure_tree(self, widget):
+        for child in widget.winfo_children():
+            if isinstance(child, ttk.Widget):
+                self.ensure(child.cget('style') or child.winfo_class())
+            self.ensure_tree(child)
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def registries():
+    """Пустые data.labels и data.files на время теста."""
+    from data import labels, files
+    labels.clear()
+    files.clear()
+    files.dim = '2D'
+    yield labels, files
+    labels.clear()
+    files.clear()
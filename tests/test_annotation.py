@@ -0,0 +1,97 @@
+from utils.parse.annotation import Annotation, AnnotationReader
+
+MARKUP = """<annotations dims="2D">
+<labels>
+  <label id="7" name="car" color="#ff0000"/>
+  <label id="3" name="person" color="#00ff00"/>
+</labels>
+<images>
+  <image path="a.png" width="640" height="480" colored="true" sequence="seq_a">
+    <object label="7" points="0,0 10,0 10,5"/>
+    <object label="3" points="1.5 2.25 3 4"/>
+  </image>
+  <image path="b.png" width="640" height="480" sequence="12">
+    <object label="3" points="5,5 6,6"/>
+  </image>
+  <image path="c.png"/>
+</images>
+</annotations>
+"""
+
+
+def snapshot(markup_labels, markup_files):
+    labels = {id: (label.name, label.color) for id, label in markup_labels.items()}
+    files = []
+    for file, geometry in markup_files.items():
+        objects = [(label, points.tolist()) for label, points in geometry]
+        files.append((file.path, file.width, file.height, file.colored, file.sequence, objects))
+    return labels, files
+
+
+def test_write_read_roundtrip(tmp_path, registries):
+    source = tmp_path / "markup.xml"
+    source.write_text(MARKUP, encoding="utf-8")
+    before = snapshot(*Annotation.fromXML(str(source)))
+
+    out = tmp_path / "out.xml"
+    Annotation.writeXML(str(tmp_path), str(out))
+    for registry in registries:
+        registry.clear()
+    after = snapshot(*Annotation.fromXML(str(out)))
+
+    assert after == before
+    assert set(before[0]) == {"7", "3"}
+
+
+def test_write_parsed_geometry(tmp_path, registries):
+    """Объекты, координаты которых уже разобраны, пишутся теми же числами."""
+    source = tmp_path / "markup.xml"
+    source.write_text(MARKUP, encoding="utf-8")
+    _, markup_files = Annotation.fromXML(str(source))
+    for geometry in markup_files.values():
+        geometry.bboxes()
+    root = Annotation.toXML(str(tmp_path))
+    points = [o.get("points") for o in root.iter("object")]
+    assert points == ["0 0 10 0 10 5", "1.5 2.25 3 4", "5 5 6 6"]
+
+
+def test_gzip_roundtrip(tmp_path, registries):
+    source = tmp_path / "markup.xml"
+    source.write_text(MARKUP, encoding="utf-8")
+    before = snapshot(*Annotation.fromXML(str(source)))
+    out = tmp_path / "out.xml.gz"
+    Annotation.writeXML(str(tmp_path), str(out))
+
+    import gzip
+    plain = tmp_path / "plain.xml"
+    plain.write_bytes(gzip.decompress(out.read_bytes()))
+    for registry in registries:
+        registry.clear()
+    assert snapshot(*Annotation.fromXML(str(plain))) == before
+
+
+def test_label_id_collision(tmp_path, registries):
+    """Разные метки с одинаковым исходным id получают при записи разные id."""
+    labels, _ = registries
+    labels.append("car", "#f00", "1")
+    labels.append("bus", "#00f", "1")
+    root = Annotation.toXML(str(tmp_path))
+    ids = [label.get("id") for label in root.iter("label")]
+    assert len(set(ids)) == 2
+
+
+def test_streaming_keeps_no_geometry(tmp_path, registries):
+    """Потоковое чтение не держит геометрию файлов в реестре; fromXML (для экспорта) держит."""
+    source = tmp_path / "markup.xml"
+    source.write_text(MARKUP, encoding="utf-8")
+    _, files = registries
+    counts = [len(geometry) for _, geometry in AnnotationReader(str(source))]
+    assert counts == [2, 1, 0]
+    assert len(files) == 3
+    assert files.geometries == [None, None, None]
+    assert files.label_maps == [None, None, None]
+
+    files.clear()
+    Annotation.fromXML(str(source))
+    assert all(geometry is not None for geometry in files.geometries)
+
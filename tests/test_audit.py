@@ -0,0 +1,79 @@
+import gzip
+import os
+import re
+import time
+
+from utils.audit import AuditWriter
+
+
+def segments(path):
+    """Ротированные сегменты (имена, как в AuditWriter._rotate)."""
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.\d{8}-\d{6}(\.\d+)?(\.gz)?")
+    return sorted(name for name in os.listdir(os.path.dirname(path)) if pattern.fullmatch(name))
+
+
+def read_all(path):
+    lines = []
+    directory = os.path.dirname(path)
+    for name in segments(path) + [os.path.basename(path)]:
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(os.path.join(directory, name), "rb") as f:
+            lines.extend(f.read().decode("utf-8").splitlines())
+    return lines
+
+
+def test_rotation_by_size(tmp_path):
+    path = str(tmp_path / "log.txt")
+    writer = AuditWriter(path, max_bytes=200, backup_count=None, fsync=False, batch_size=7)
+    lines = [f"строка {i:03}\n" for i in range(100)]
+    for line in lines:
+        writer.write(line)
+    assert writer.flush(5)
+    writer.close()
+
+    rotated = segments(path)
+    assert rotated and all(name.endswith(".gz") for name in rotated)
+    # Ротация и внутри пачки: ни один сегмент не больше max_bytes.
+    for name in rotated:
+        with gzip.open(tmp_path / name, "rb") as f:
+            assert len(f.read()) <= 200
+    assert os.path.getsize(path) <= 200
+    assert sorted(read_all(path)) == [line.rstrip("\n") for line in lines]
+
+
+def test_prune_keeps_backup_count(tmp_path):
+    path = str(tmp_path / "log.txt")
+    (tmp_path / "log.txt.notes").write_text("чужой файл")
+    writer = AuditWriter(path, max_bytes=50, backup_count=2, fsync=False, compress=False)
+    for i in range(60):
+        writer.write(f"строка {i:03}\n")
+    writer.close()
+
+    assert len(segments(path)) == 2
+    assert (tmp_path / "log.txt.notes").exists()
+
+
+def test_flush_without_writer(tmp_path):
+    writer = AuditWriter(str(tmp_path / "log.txt"))
+    assert writer.flush(0)
+    writer.close()
+    writer.write("после закрытия\n")
+    assert writer.flush(0)
+    assert not (tmp_path / "log.txt").exists()
+
+
+def test_failed_batch_is_retried(tmp_path):
+    path = str(tmp_path / "missing" / "log.txt")
+    writer = AuditWriter(path, fsync=False, flush_interval=0.05)
+    writer.write("первая\n")
+    writer.write("вторая\n")
+    deadline = time.monotonic() + 5
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert isinstance(writer.error, OSError)
+
+    (tmp_path / "missing").mkdir()
+    assert writer.flush(5)
+    writer.close()
+    assert writer.error is None and writer.dropped == 0
+    assert read_all(path) == ["первая", "вторая"]
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+
+from utils.audit import AuditWriter
+from utils.audit_index import AuditIndex
+
+
+def record(i):
+    return {
+        "ts": 1000.0 + i,
+        "action": "grant" if i % 2 else "remove",
+        "subjects": [f"user{i % 3}"],
+        "objects": ["a"],
+        "outcome": "ok",
+        "message": f"запись {i}",
+    }
+
+
+def segments(path):
+    """Ротированные сегменты (имена, как в AuditWriter._rotate)."""
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.\d{8}-\d{6}(\.\d+)?(\.gz)?")
+    return sorted(name for name in os.listdir(os.path.dirname(path)) if pattern.fullmatch(name))
+
+
+def test_index_query(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditWriter(path, max_bytes=600, backup_count=None, fsync=False, index=True)
+    records = [record(i) for i in range(40)]
+    for r in records:
+        writer.write(r)
+    writer.close()
+
+    # Индексируемые сегменты не сжимаются.
+    assert segments(path) and not any(name.endswith(".gz") for name in segments(path))
+    index = AuditIndex(path)
+    try:
+        assert list(index.query()) == records
+        assert list(index.query(subject="user1")) == [r for r in records if r["subjects"] == ["user1"]]
+        assert list(index.query(action="grant", since=1010, until=1020)) == [
+            r for r in records if r["action"] == "grant" and 1010 <= r["ts"] < 1020
+        ]
+        assert list(index.query(limit=3, newest=True)) == records[-3:]
+        assert list(index.query(object="z")) == []
+    finally:
+        index.close()
+
+
+def test_index_drops_pruned_segments(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditWriter(path, max_bytes=300, backup_count=1, fsync=False, index=True)
+    records = [record(i) for i in range(30)]
+    for r in records:
+        writer.write(r)
+    writer.close()
+
+    kept = []
+    for name in segments(path) + [os.path.basename(path)]:
+        with open(tmp_path / name, encoding="utf-8") as f:
+            kept.extend(json.loads(line) for line in f)
+    kept.sort(key=lambda r: r["ts"])
+    assert kept and len(kept) < len(records)
+    index = AuditIndex(path)
+    try:
+        assert list(index.query()) == kept
+    finally:
+        index.close()
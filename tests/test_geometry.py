@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.parse.geometry import FileGeometry
+
+
+def test_parse_and_bboxes():
+    geometry = FileGeometry([(1, "0,0 10,0 10,5"), (2, "1.5 2.25; 3 4"), (3, ""), (1, None)])
+    assert len(geometry) == 4
+    assert geometry.counts().tolist() == [3, 2, 0, 0]
+    assert geometry.points(1).tolist() == [[1.5, 2.25], [3, 4]]
+    assert [label for label, _ in geometry] == [1, 2, 3, 1]
+    assert not geometry.errors
+
+    boxes = geometry.bboxes()
+    assert boxes[:2].tolist() == [[0, 0, 10, 5], [1.5, 2.25, 3, 4]]
+    assert np.isnan(boxes[2:]).all()
+    assert geometry.areas().tolist() == [25, 0, 0, 0]
+    assert geometry.volumes()[:2].tolist() == [50, 1.5 * 1.75]
+
+
+def test_errors_keep_raw_text():
+    geometry = FileGeometry([(1, "0 0 1 1"), (2, "1 2 x"), (3, "1 2 3")])
+    assert geometry.counts().tolist() == [2, 0, 0]
+    assert sorted(geometry.errors) == [1, 2]
+    assert geometry.errors[1][1] == "1 2 x"
+    assert geometry.text(1) == "1 2 x"
+    assert geometry.text(2) == "1 2 3"
+    assert geometry.text(0) == "0 0 1 1"
+
+
+def test_text_before_and_after_parse():
+    geometry = FileGeometry([(1, "0.5,1 2,3.25")])
+    assert geometry.text(0) == "0.5,1 2,3.25"
+    geometry.coords
+    assert geometry.text(0) == "0.5 1 2 3.25"
+
+
+def test_3d():
+    geometry = FileGeometry([(1, "0 0 0 1 2 3"), (2, "1 1")], dims='3D')
+    assert geometry.coords.shape == (2, 3)
+    assert 1 in geometry.errors
+    assert geometry.volumes()[0] == 6
+    with pytest.raises(ValueError):
+        geometry.areas()
+
+
+def test_normalized_roundtrip():
+    geometry = FileGeometry([(1, "0 0 640 480"), (2, "320 240")])
+    normalized = geometry.normalized(640, 480)
+    assert normalized.points(0).tolist() == [[0, 0], [1, 1]]
+    assert normalized.points(1).tolist() == [[0.5, 0.5]]
+    assert np.allclose(normalized.denormalized(640, 480).coords, geometry.coords)
+    assert normalized.labels == geometry.labels
+    with pytest.raises(ValueError):
+        geometry.normalized(640)
+    with pytest.raises(ValueError):
+        geometry.scaled(1, 2, 3)
+
+
+def test_text_keeps_precision():
+    # Пиксельные координаты больших снимков: float32 округлил бы 123456.789 до 123456.79.
+    text = "123456.789 98765.4321 0.1 16777217"
+    geometry = FileGeometry([(1, text)])
+    geometry.coords
+    assert geometry.text(0) == text
+    assert geometry.bboxes().dtype == np.float64
+
@@ -0,0 +1,94 @@
+import pytest
+
+from admin import add_object, create, drop_subject, grant, remove, rename, set_rights
+from utils.history import MatrixHistory, patch
+
+DATA = {"objects": ["a", "b", "c"], "subjects": {"alice": ["a"], "bob": ["b", "c"]}}
+
+
+def test_undo_redo():
+    history = MatrixHistory(DATA)
+    history.apply(grant, ["alice"], ["b"])
+    history.apply(create, "carol", ["d"])
+    history.apply(drop_subject, "bob")
+    after = history.head.to_data()
+    assert after["objects"] == ["a", "b", "c", "d"]
+    assert list(after["subjects"]) == ["alice", "carol"]
+    assert sorted(after["subjects"]["alice"]) == ["a", "b"]  # grant не сохраняет порядок
+
+    d = history.undo()
+    assert d.subjects == {"bob": (None, ["b", "c"])}
+    # Возвращённый субъект стоит на прежнем месте.
+    assert list(history.head.to_data()["subjects"]) == ["alice", "bob", "carol"]
+    history.undo()
+    history.undo()
+    assert history.head.to_data() == DATA
+    assert not history.can_undo()
+    assert history.undo() is None
+
+    history.redo()
+    history.redo()
+    history.redo()
+    assert history.head.to_data() == after
+    assert not history.can_redo()
+    assert history.redo() is None
+
+
+def test_apply_truncates_redo_and_skips_noop():
+    history = MatrixHistory(DATA)
+    history.apply(remove, ["bob"], ["c"])
+    history.undo()
+    assert history.can_redo()
+
+    # Команда без изменений не добавляет версию и не сбрасывает повтор.
+    result, d = history.apply(set_rights, {("alice", "a"): 1})
+    assert result == [] and not d
+    assert history.can_redo()
+
+    history.apply(rename, "alice", "alex")
+    assert not history.can_redo()
+    assert history.head.rights("alex") == ["a"]
+    assert history.head.rights("alice") is None
+
+
+def test_limit():
+    history = MatrixHistory(DATA, limit=3)
+    for o in "xyzw":
+        history.apply(add_object, o)
+    assert len(history.versions) == 3
+    history.undo()
+    history.undo()
+    assert not history.can_undo()
+    assert history.head.objects == ("a", "b", "c", "x", "y")
+
+
+def test_patch_follows_history():
+    data = {"objects": list(DATA["objects"]), "subjects": {s: list(o) for s, o in DATA["subjects"].items()}}
+    history = MatrixHistory(data)
+    steps = [(grant, ["bob"], ["a"]), (drop_subject, "alice"), (create, "dave", ["c"])]
+    for command, *args in steps:
+        _, d = history.apply(command, *args)
+        patch(data, d, history.head)
+        assert data == history.head.to_data()
+    while history.can_undo():
+        patch(data, history.undo(), history.head)
+        assert data == history.head.to_data()
+    assert data == DATA
+
+
+def test_what_if_keeps_history():
+    history = MatrixHistory(DATA)
+    history.apply(add_object, "d")
+    head = history.head
+    d = history.what_if([(create, "dave", ["e"]), (remove, ["bob"], ["b"]), (drop_subject, "alice")])
+    assert d.objects_added == ["e"]
+    assert d.subjects == {"dave": (None, ["e"]), "bob": (["b", "c"], ["c"]), "alice": (["a"], None)}
+    assert history.head is head
+    assert len(history) == 2
+    assert history.can_undo() and not history.can_redo()
+    assert history.head.to_data() == {"objects": ["a", "b", "c", "d"], "subjects": DATA["subjects"]}
+
+    assert not history.what_if([(set_rights, {("alice", "a"): 1})])
+    with pytest.raises(ValueError):
+        history.what_if([(grant, ["nobody"], ["a"])])
+    assert history.head is head and len(history) == 2
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from utils.parse import model as model_module
+from utils.parse.model import ModelRegistry
+
+MODEL = """<model modelName="{name}" dims="2D" description="">
+<init>
+  <architecture value="{architecture}"/>
+  <labels><label id="1" name="car" color="#ff0000"/></labels>
+</init>
+<train>
+  <savedEpochs>
+    <epoch number="1" epochPath="e1.pt" default="False"/>
+    <epoch number="2" epochPath="e2.pt" default="True"/>
+  </savedEpochs>
+</train>
+</model>
+"""
+
+
+def write_model(path, name, architecture="unet", mtime=None):
+    path.write_text(MODEL.format(name=name, architecture=architecture), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def models(tmp_path):
+    write_model(tmp_path / "a.xml", "A", mtime=1000)
+    write_model(tmp_path / "b.xml", "B", mtime=1000)
+    return tmp_path
+
+
+def test_scan_skips_broken_entries(models):
+    (models / "broken.xml").write_text("<model", encoding="utf-8")
+    os.symlink(models / "missing.xml", models / "dangling.xml")
+    entries = ModelRegistry(models).scan()
+    assert [(e.name, e.architecture, e.default_epoch) for e in entries] == [("A", "unet", "2"), ("B", "unet", "2")]
+
+
+def test_scan_reuses_index(models, monkeypatch):
+    ModelRegistry(models).scan()
+    assert (models / ModelRegistry.INDEX_FILE).exists()
+
+    read = []
+    original = model_module.read_entry
+    monkeypatch.setattr(model_module, "read_entry", lambda path: read.append(path.name) or original(path))
+    write_model(models / "b.xml", "B2", mtime=2000)
+    entries = ModelRegistry(models).scan()
+    assert read == ["b.xml"]  # неизменённый a.xml взят из индекса
+    assert [e.name for e in entries] == ["A", "B2"]
+
+    os.remove(models / "a.xml")
+    assert [e.name for e in ModelRegistry(models).scan()] == ["B2"]
+    assert read == ["b.xml"]
+
+
+def test_lru_eviction_and_invalidation(models, monkeypatch):
+    write_model(models / "c.xml", "C", mtime=1000)
+    parsed = []
+    original = model_module.MarkupModel
+    monkeypatch.setattr(model_module, "MarkupModel", lambda path: parsed.append(os.path.basename(path)) or original(path))
+    registry = ModelRegistry(models, maxsize=2)
+
+    a = registry.get(models / "a.xml")
+    registry.get(models / "b.xml")
+    assert registry.get(models / "a.xml") is a
+    registry.get(models / "c.xml")  # вытесняет b, использованную раньше всех
+    registry.get(models / "a.xml")
+    registry.get(models / "b.xml")
+    assert parsed == ["a.xml", "b.xml", "c.xml", "b.xml"]
+
+    write_model(models / "a.xml", "A2", architecture="yolo", mtime=3000)
+    changed = registry.get(models / "a.xml")
+    assert changed is not a and changed.modelName == "A2" and changed.init.architecture == "yolo"
+    assert registry.get(models / "a.xml") is changed
+    assert parsed == ["a.xml", "b.xml", "c.xml", "b.xml", "a.xml"]
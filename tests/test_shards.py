@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from admin import add_object, create, drop_object, drop_subject, grant, remove, rename
+from utils import shards
+from utils.history import MatrixHistory, diff
+from utils.shards import ShardedMatrix, shard_of
+
+DATA = {
+    "objects": ["a", "b", "c"],
+    "subjects": {f"user{i}": ["a", "c"] if i % 2 else ["b"] for i in range(40)},
+}
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Имена файлов, записанных ShardedMatrix."""
+    names = []
+    original = shards._write
+
+    def write(path, payload):
+        names.append(path.rsplit("/", 1)[-1])
+        original(path, payload)
+
+    monkeypatch.setattr(shards, "_write", write)
+    return names
+
+
+def test_changes_write_only_their_shards(tmp_path, writes):
+    matrix = ShardedMatrix(str(tmp_path / "m.d"))
+    matrix.save(DATA)
+    writes.clear()
+
+    history = MatrixHistory(DATA)
+    saved = history.head
+    history.apply(grant, ["user1", "user2"], ["d"])
+    history.apply(create, "newbie", ["a"])
+    history.apply(drop_subject, "user3")
+    changes = diff(saved, history.head).subjects
+    expected = sorted({shard_of(s, shards.SHARDS) for s in changes})
+
+    # Новый экземпляр: шарды, не затронутые изменениями, не читаются.
+    fresh = ShardedMatrix(str(tmp_path / "m.d"))
+    assert fresh.save(history.head.to_data(), changes=changes) == expected
+    assert sorted(fresh._shards) == expected
+    assert writes == [f"shard-{i:03d}.json" for i in expected] + [shards.MANIFEST]
+    assert ShardedMatrix(str(tmp_path / "m.d")).load() == history.head.to_data()
+    assert fresh.read_manifest()["subjects"] == len(history.head.to_data()["subjects"])
+
+
+def test_changes_match_full_save(tmp_path):
+    """Случайные правки, сохранённые по changes, дают те же данные и порядок, что полное сохранение."""
+    rnd = random.Random(0)
+    history = MatrixHistory(DATA)
+    by_changes = ShardedMatrix(str(tmp_path / "changes.d"))
+    by_changes.save(DATA)
+    saved = history.head
+    for step in range(60):
+        data = history.head.to_data()
+        subjects = list(data["subjects"])
+        op = rnd.randrange(6)
+        if op == 0:
+            history.apply(create, f"new{step}", [rnd.choice("abc")])
+        elif op == 1 and subjects:
+            history.apply(drop_subject, rnd.choice(subjects))
+        elif op == 2 and subjects:
+            history.apply(rename, rnd.choice(subjects), f"renamed{step}")
+        elif op == 3 and subjects:
+            history.apply(grant, rnd.sample(subjects, min(3, len(subjects))), [rnd.choice("abcd")])
+        elif op == 4 and subjects:
+            history.apply(remove, [rnd.choice(subjects)], ["a"])
+        elif op == 5:
+            if "d" in data["objects"]:
+                history.apply(drop_object, "d")
+            else:
+                history.apply(add_object, "d")
+        if rnd.random() < 0.3 and history.can_undo():
+            history.undo()
+        if step % 5 == 4:
+            by_changes.save(history.head.to_data(), changes=diff(saved, history.head).subjects)
+            saved = history.head
+    by_changes.save(history.head.to_data(), changes=diff(saved, history.head).subjects)
+
+    full = ShardedMatrix(str(tmp_path / "full.d"))
+    full.save(history.head.to_data())
+    loaded = ShardedMatrix(str(tmp_path / "changes.d")).load()
+    assert loaded == history.head.to_data()
+    assert list(loaded["subjects"]) == list(full.load()["subjects"])
+
+
+def test_changes_without_manifest_save_everything(tmp_path):
+    matrix = ShardedMatrix(str(tmp_path / "m.d"))
+    changes = {s: (None, objs) for s, objs in DATA["subjects"].items()}
+    matrix.save(DATA, changes=changes)
+    assert ShardedMatrix(str(tmp_path / "m.d")).load() == DATA
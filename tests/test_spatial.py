@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.parse.geometry import FileGeometry
+
+
+def random_geometry(rng, n, ndim=2, empty=0.1):
+    objects = []
+    for _ in range(n):
+        if rng.random() < empty:
+            objects.append((0, ""))
+            continue
+        center = rng.uniform(0, 1000, ndim)
+        # Немного больших объектов: они не заносятся в сетку.
+        size = rng.uniform(0, 400 if rng.random() < 0.05 else 20, ndim)
+        points = rng.uniform(center - size, center + size, (rng.integers(1, 6), ndim))
+        objects.append((0, " ".join(f"{v:.3f}" for v in points.ravel())))
+    return FileGeometry(objects, dims='3D' if ndim == 3 else '2D')
+
+
+def brute_nearest(boxes, point):
+    n = boxes.shape[1] // 2
+    d = np.maximum(boxes[:, :n] - point, 0) + np.maximum(point - boxes[:, n:], 0)
+    dist = np.sqrt((d ** 2).sum(axis=1))
+    dist[np.isnan(dist)] = math.inf
+    i = int(dist.argmin())  # при равенстве — меньший индекс
+    return i, float(dist[i])
+
+
+@pytest.mark.parametrize("ndim", [2, 3])
+def test_nearest_matches_brute_force(ndim):
+    rng = np.random.default_rng(ndim)
+    geometry = random_geometry(rng, 500, ndim)
+    index = geometry.spatial_index()
+    assert index.cells  # больше BRUTE_FORCE объектов: запросы идут через сетку
+    boxes = geometry.bboxes().astype(np.float64)
+    for point in rng.uniform(-300, 1300, (60, ndim)):
+        i, dist = index.nearest(point)
+        j, expected = brute_nearest(boxes, point)
+        assert dist == pytest.approx(expected)
+        assert i == j
+
+
+def test_nearest_small_and_empty():
+    assert FileGeometry([]).spatial_index().nearest([0, 0]) == (None, math.inf)
+    assert FileGeometry([(1, "")]).spatial_index().nearest([0, 0]) == (None, math.inf)
+    geometry = FileGeometry([(1, "0 0 1 1"), (2, "5 5 6 6")])
+    assert geometry.spatial_index().nearest([4, 4]) == (1, pytest.approx(math.sqrt(2)))
+
+
+def test_intersecting_matches_brute_force():
+    rng = np.random.default_rng(0)
+    geometry = random_geometry(rng, 500)
+    index = geometry.spatial_index()
+    boxes = geometry.bboxes()
+    for lo in rng.uniform(-100, 1000, (100, 2)):
+        hi = lo + rng.uniform(0, 200, 2)
+        expected = [
+            i for i, b in enumerate(boxes)
+            if not np.isnan(b).any() and (b[:2] <= hi).all() and (b[2:] >= lo).all()
+        ]
+        assert index.intersecting(lo, hi).tolist() == expected
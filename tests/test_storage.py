@@ -0,0 +1,128 @@
+import json
+import os
+
+import pytest
+
+from utils import shards
+from utils.history import MatrixSnapshot, diff
+from utils.storage import JsonStorage, ShardedStorage, SqliteStorage, kind_of, storage_for
+
+# Права перечислены в порядке объектов: так их возвращает и SQLite.
+DATA = {
+    "objects": ["a", "b", "c", "d"],
+    "subjects": {"alice": ["a", "c"], "bob": [], "carol": ["b", "c", "d"]},
+}
+PATHS = {"json": "matrix.json", "sharded": "matrix.d", "sqlite": "matrix.db"}
+
+
+def edited(data):
+    """Копия data после нескольких правок: права, новый и удалённый субъект, новый объект."""
+    out = json.loads(json.dumps(data))
+    out["objects"].append("e")
+    out["subjects"]["alice"] = ["a", "b", "c"]
+    del out["subjects"]["bob"]
+    out["subjects"]["dave"] = ["e"]
+    return out
+
+
+@pytest.fixture(params=sorted(PATHS))
+def storage(request, tmp_path):
+    storage = storage_for(str(tmp_path / PATHS[request.param]))
+    assert storage.kind == request.param
+    yield storage
+    storage.close()
+
+
+def test_kind_of(tmp_path):
+    assert kind_of("access_matrix.json") == "json"
+    assert kind_of("access_matrix.d") == "sharded"
+    assert kind_of("access_matrix.d/") == "sharded"
+    assert kind_of("access_matrix.sqlite3") == "sqlite"
+    assert kind_of(str(tmp_path)) == "sharded"
+    with pytest.raises(ValueError):
+        storage_for(str(tmp_path / "x.json"), kind="xml")
+
+
+def test_save_load(storage):
+    storage.save(DATA)
+    assert storage.load() == DATA
+    assert storage.load_subject("carol")["subjects"]["carol"] == DATA["subjects"]["carol"]
+    assert storage.load_subject("nobody")["objects"] == DATA["objects"]
+    assert storage.counts() == (3, 4)
+
+
+def test_save_changes(storage):
+    storage.save(DATA)
+    after = edited(DATA)
+    changes = diff(MatrixSnapshot.from_data(DATA), MatrixSnapshot.from_data(after)).subjects
+    assert changes == {"alice": (["a", "c"], ["a", "b", "c"]), "bob": ([], None), "dave": (None, ["e"])}
+    storage.save(after, changes)
+    assert storage.load() == after
+    assert storage.counts() == (3, 5)
+
+
+def test_sqlite_changes_seen_by_other_connection(tmp_path):
+    path = str(tmp_path / "matrix.db")
+    writer, reader = SqliteStorage(path), SqliteStorage(path)
+    try:
+        writer.save(DATA)
+        assert reader.load() == DATA
+        stamp = reader.stamp()
+        changes = {"bob": ([], ["d"])}
+        writer.save({"objects": DATA["objects"], "subjects": dict(DATA["subjects"], bob=["d"])}, changes)
+        assert reader.stamp() != stamp
+        assert reader.load_subject("bob")["subjects"] == {"bob": ["d"]}
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_sqlite_rejects_unknown_objects(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "matrix.db"))
+    try:
+        storage.save(DATA)
+        with pytest.raises(ValueError, match="x"):
+            storage.save({"objects": DATA["objects"], "subjects": {"alice": ["x"]}}, {"alice": (["a", "c"], ["x"])})
+        assert storage.load() == DATA  # транзакция откатилась целиком
+    finally:
+        storage.close()
+
+
+def test_sqlite_commands(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "matrix.db"))
+    try:
+        storage.save(DATA)
+        storage.create("erin", ["e"])
+        storage.grant(["bob"], ["a", "f"])
+        storage.remove(["carol"], ["c"])
+        storage.remove_all(["alice"])
+        storage.grant_all(["erin"])
+        assert storage.load() == {
+            "objects": ["a", "b", "c", "d", "e", "f"],
+            "subjects": {
+                "alice": [], "bob": ["a", "f"], "carol": ["b", "d"], "erin": ["a", "b", "c", "d", "e", "f"],
+            },
+        }
+        with pytest.raises(ValueError):
+            storage.grant(["nobody"], ["a"])
+    finally:
+        storage.close()
+
+
+def test_sharded_writes_only_changed_shards(tmp_path):
+    storage = ShardedStorage(str(tmp_path / "matrix.d"))
+    storage.save(DATA)
+    after = json.loads(json.dumps(DATA))
+    after["subjects"]["alice"] = ["a"]
+    assert storage.matrix.save(after) == [shards.shard_of("alice", shards.SHARDS)]
+
+    # Другой экземпляр (как клиент пользователя) видит изменение.
+    assert ShardedStorage(str(tmp_path / "matrix.d")).load() == after
+
+
+def test_json_storage_is_plain_file(tmp_path):
+    path = str(tmp_path / "matrix.json")
+    JsonStorage(path).save(DATA)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == DATA
+    assert os.path.getmtime(path) == JsonStorage(path).stamp()
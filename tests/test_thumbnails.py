@@ -0,0 +1,92 @@
+import io
+import os
+import threading
+
+import pytest
+
+from utils import thumbnails
+from utils.thumbnails import ThumbnailCache
+
+PIL = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, "THUMB_DIR", str(tmp_path / "cache"))
+    cache = ThumbnailCache(size=(32, 32), workers=2, prefetch=0)
+    yield cache
+    cache.close()
+
+
+def image(path, size=(100, 50), color=(255, 0, 0)):
+    PIL.new("RGB", size, color).save(path)
+    return str(path)
+
+
+class Results:
+    """Собирает вызовы callback/error и ждёт первого."""
+
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def callback(self, file, png):
+        self.calls.append(("callback", file, png))
+        self.event.set()
+
+    def error(self, file, exc):
+        self.calls.append(("error", file, exc))
+
+    def wait(self):
+        assert self.event.wait(5)
+        return self.calls
+
+
+def test_get_renders_in_background(cache, tmp_path):
+    path = image(tmp_path / "a.png")
+    results = Results()
+    assert cache.get(path, callback=results.callback) is None
+    [(kind, file, png)] = results.wait()
+    assert kind == "callback" and file == path
+    with PIL.open(io.BytesIO(png)) as thumb:
+        assert thumb.size == (32, 16)
+    assert cache.get(path) == png
+    assert os.path.exists(thumbnails.disk_path(cache.key(path)))
+
+    # Изменённый файл — новый ключ.
+    image(tmp_path / "a.png", color=(0, 0, 255))
+    os.utime(path, ns=(1, 1))
+    assert cache.cached(path) is None
+
+
+def test_missing_file_is_reported(cache, tmp_path):
+    results = Results()
+    path = str(tmp_path / "missing.png")
+    assert cache.get(path, callback=results.callback, error=results.error) is None
+    calls = results.wait()
+    assert [kind for kind, _, _ in calls] == ["error", "callback"]
+    assert isinstance(calls[0][2], FileNotFoundError)
+    assert calls[1][2] is None
+    assert cache.get(path) is None  # без callback — просто None
+
+
+def test_render_failure_is_reported(cache, tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    results = Results()
+    assert cache.get(str(path), callback=results.callback, error=results.error) is None
+    calls = results.wait()
+    assert [kind for kind, _, _ in calls] == ["error", "callback"]
+    assert calls[1][2] is None
+
+
+def test_memory_limit(cache, tmp_path):
+    paths = [image(tmp_path / f"{i}.png", color=(i * 40, 0, 0)) for i in range(4)]
+    pngs = [cache.result(p, timeout=5) for p in paths]
+    cache.clear()
+    cache.max_bytes = len(pngs[0]) * 2 + len(pngs[0]) // 2
+    for p in paths:
+        cache.result(p, timeout=5)
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.cached(paths[0]) is None
+    assert cache.cached(paths[-1]) is not None
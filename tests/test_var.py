@@ -0,0 +1,77 @@
+import pytest
+
+from utils.var import DictDelta, Observable, ObservableDict, ObservableVar, VarDelta
+
+
+def test_observable_is_abstract():
+    with pytest.raises(TypeError):
+        Observable()
+
+
+def test_var_notifies_every_subscriber():
+    var = ObservableVar(1)
+    a, b = [], []
+    var.subscribe(a.append)
+    fn = var.subscribe(b.append)
+    var.value = 2
+    var.unsubscribe(fn)
+    var.value = 3
+    assert a == [VarDelta(1, 2), VarDelta(2, 3)]
+    assert b == [VarDelta(1, 2)]
+    var.unsubscribe(fn)  # повторная отписка не ошибка
+
+
+def test_var_batch_coalesces():
+    var = ObservableVar(0)
+    seen = []
+    var.subscribe(seen.append)
+    with var.batch():
+        for i in range(1, 100):
+            var.value = i
+        with var.batch():
+            var.value = 100
+        assert seen == []  # вложенный batch не уведомляет
+    assert seen == [VarDelta(0, 100)]
+
+    with var.batch():
+        var.value = 5
+        var.value = 100
+    assert seen == [VarDelta(0, 100)]  # итог не изменился — уведомления нет
+
+
+def test_dict_batch_delta():
+    d = ObservableDict({"a": 1, "b": 2, "c": 3})
+    seen = []
+    d.subscribe(seen.append)
+    with d.batch():
+        d["a"] = 10
+        d["x"] = 1
+        del d["b"]
+        d["c"] = 30
+        d["c"] = 3  # вернули исходное значение
+        d["y"] = 1
+        del d["y"]  # добавили и удалили
+    assert seen == [DictDelta({"x": 1}, {"a": 10}, {"b": 2})]
+    assert dict(d) == {"a": 10, "c": 3, "x": 1}
+
+    d.update(a=1, z=0)
+    d.clear()
+    assert seen[1] == DictDelta({"z": 0}, {"a": 1}, {})
+    assert seen[2] == DictDelta({}, {}, {"a": 1, "c": 3, "x": 1, "z": 0})
+    assert len(seen) == 3
+
+
+def test_scheduler_defers_until_flush():
+    queued = []
+    d = ObservableDict(scheduler=queued.append)
+    seen = []
+    d.subscribe(seen.append)
+    d["a"] = 1
+    d["b"] = 2
+    with d.batch():
+        d["a"] = 3
+    assert seen == [] and len(queued) == 1  # одно отложенное уведомление на все изменения
+    queued.pop()()
+    assert seen == [DictDelta({"a": 3, "b": 2}, {}, {})]
+    d.flush()  # пустое изменение не отправляется
+    assert len(seen) == 1
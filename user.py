@@ -1,27 +1,35 @@
 #!/usr/bin/env python3
 # user.py — приложение пользователя для авторизации и фильтрации строк по матрице доступа
-import json
 import os
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from utils.metrics import metrics
+from utils.storage import storage_for, stamp
+from utils.watchdog import watchdog
 
-DATA_FILE = "access_matrix.json"
+DATA_FILE = os.environ.get("MBKS_MATRIX", "access_matrix.json")  # JSON, каталог шардов (*.d) или *.db (utils/storage.py)
 POLL_INTERVAL_MS = 1000  # опрашиваем файл каждые 1000 ms
 
-def load_matrix(path=DATA_FILE):
+def load_matrix(path=DATA_FILE, subject=None):
+    # Для известного субъекта шарды и SQLite читают только его строку.
     if not os.path.exists(path):
         return {"objects": [], "subjects": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data.setdefault("objects", [])
-        data.setdefault("subjects", {})
-        return data
+        with metrics.timer("load_matrix"):
+            storage = storage_for(path)
+            data = storage.load() if subject is None else storage.load_subject(subject)
+            data.setdefault("objects", [])
+            data.setdefault("subjects", {})
+            return data
     except Exception as e:
         messagebox.showerror("Ошибка загрузки", f"Не удалось загрузить матрицу:\n{e}")
         return {"objects": [], "subjects": {}}
 
+def filter_text(text, allowed):
+    # Filter: keep only символы, которые есть в allowed (точное совпадение символа)
+    return ''.join(sorted({ch for ch in text if ch in allowed}))
+
 class UserApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -30,7 +38,7 @@ class UserApp(tk.Tk):
         self.minsize(500, 300)
         self.data_file = DATA_FILE
         self.data = load_matrix(self.data_file)
-        self.last_mtime = os.path.getmtime(self.data_file) if os.path.exists(self.data_file) else None
+        self.last_mtime = stamp(self.data_file)
         self.current_user = None
         self.allowed_set = set()
 
@@ -80,32 +88,33 @@ class UserApp(tk.Tk):
         if not name:
             messagebox.showwarning("Валидация", "Введите имя пользователя.")
             return
-        # Reload matrix to ensure fresh
-        self.data = load_matrix(self.data_file)
-        if name not in self.data.get("subjects", {}):
+        with metrics.timer("on_login"):
+            # Reload matrix to ensure fresh
+            self.data = load_matrix(self.data_file, name)
+            found = name in self.data.get("subjects", {})
+            if found:
+                self.current_user = name
+                self.allowed_set = set(self.data["subjects"].get(name, []))
+                self.rights_label.config(text=f"Текущие права: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}")
+                self.on_filter()
+        if not found:
             messagebox.showerror("Ошибка авторизации", f"Пользователь '{name}' не найден в матрице доступа.")
             return
-        self.current_user = name
-        self.allowed_set = set(self.data["subjects"].get(name, []))
-        self.rights_label.config(text=f"Текущие права: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}")
-        self.on_filter()
         messagebox.showinfo("Успех", f"Авторизация прошла успешно: {name}")
 
+    @metrics.timed()
     def on_filter(self):
         if not self.current_user:
             self.output_text.delete("1.0", "end")
             self.output_text.insert("end", "(сначала авторизуйтесь)")
             return
-        s = self.input_text.get()
-        # Filter: keep only символы, которые есть в allowed_set (точное совпадение символа)
-        res_chars = sorted({ch for ch in s if ch in self.allowed_set})
-        result = ''.join(res_chars)
+        result = filter_text(self.input_text.get(), self.allowed_set)
         self.output_text.delete("1.0", "end")
         self.output_text.insert("end", result)
 
     def reload_matrix(self):
-        self.data = load_matrix(self.data_file)
-        self.last_mtime = os.path.getmtime(self.data_file) if os.path.exists(self.data_file) else None
+        self.data = load_matrix(self.data_file, self.current_user)
+        self.last_mtime = stamp(self.data_file)
         if self.current_user:
             self.allowed_set = set(self.data["subjects"].get(self.current_user, []))
             self.rights_label.config(text=f"Текущие права: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}")
@@ -114,16 +123,17 @@ class UserApp(tk.Tk):
 
     def poll_file_changes(self):
         try:
-            if os.path.exists(self.data_file):
-                m = os.path.getmtime(self.data_file)
-                if self.last_mtime is None or m != self.last_mtime:
-                    # file changed -> reload
-                    self.data = load_matrix(self.data_file)
-                    self.last_mtime = m
-                    if self.current_user:
-                        self.allowed_set = set(self.data["subjects"].get(self.current_user, []))
-                        self.rights_label.config(text=f"Текущие права: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}")
-                        self.on_filter()
+            with metrics.timer("poll_file_changes"):
+                if os.path.exists(self.data_file):
+                    m = stamp(self.data_file)
+                    if self.last_mtime is None or m != self.last_mtime:
+                        # file changed -> reload
+                        self.data = load_matrix(self.data_file, self.current_user)
+                        self.last_mtime = m
+                        if self.current_user:
+                            self.allowed_set = set(self.data["subjects"].get(self.current_user, []))
+                            self.rights_label.config(text=f"Текущие права: {''.join(sorted(self.allowed_set)) if self.allowed_set else '(нет прав)'}")
+                            self.on_filter()
             # schedule next check
         except Exception as e:
             # Non-fatal; show in small popup
@@ -142,4 +152,6 @@ class UserApp(tk.Tk):
 
 if __name__ == "__main__":
     app = UserApp()
+    metrics.install(app)
+    watchdog.install(app)
     app.mainloop()
@@ -0,0 +1,80 @@
+import base64
+import importlib
+import io
+import os
+
+# Сборка атласов иконок: все иконки семейства _style/<семейство>/images.py
+# уменьшаются до размеров, используемых в приложении, и упаковываются
+# в одну картинку _style/<семейство>/atlas.py. Требует PIL только при сборке.
+#
+#     python -m utils.atlas
+ATLAS_WIDTH = 256
+PADDING = 1
+
+# семейство -> [(имена или '*', размер)]
+FAMILIES = {
+    '_style._scrollbar': [('*', (15, 15))],
+    '_style._toolbutton': [
+        (('default', 'active', 'selected', 'disabled', 'pressed'), (30, 30)),
+        (('btn-add-col', 'btn-add-row', 'btn-delete', 'btn-save'), (18, 18)),
+    ],
+    '_style._checkbutton': [('*', (20, 20))],
+}
+
+HEADER = "# Сгенерировано utils/atlas.py, не редактировать вручную.\n"
+
+
+def icons(family):
+    images = importlib.import_module(family + '.images').images
+    for names, size in FAMILIES[family]:
+        for name in (images if names == '*' else names):
+            yield name, size, images[name]
+
+
+def pack(sizes, width=ATLAS_WIDTH):
+    """Раскладка полками: [(w, h)] -> [(x, y)], ширина и высота атласа."""
+    positions = []
+    x = y = shelf = 0
+    for w, h in sizes:
+        if x and x + w > width:
+            x, y, shelf = 0, y + shelf + PADDING, 0
+        positions.append((x, y))
+        x += w + PADDING
+        shelf = max(shelf, h)
+    used = max((px + w for (px, _), (w, _) in zip(positions, sizes)), default=0)
+    return positions, used, y + shelf
+
+
+def build(family):
+    from PIL import Image
+
+    entries = list(icons(family))
+    # Высокие иконки первыми: полки получаются плотнее.
+    entries.sort(key=lambda e: (-e[1][1], e[0]))
+    positions, width, height = pack([size for _, size, _ in entries])
+
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    regions = {}
+    for (name, size, data), pos in zip(entries, positions):
+        img = Image.open(io.BytesIO(base64.b64decode(data))).resize(size).convert('RGBA')
+        atlas.paste(img, pos)
+        regions[(name,) + size] = pos
+
+    buf = io.BytesIO()
+    atlas.save(buf, format='PNG', optimize=True)
+    encoded = base64.b64encode(buf.getvalue()).decode('ascii')
+
+    path = os.path.join(*family.split('.'), 'atlas.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        f.write(f"atlas = '{encoded}'\n")
+        f.write("regions = {\n")
+        for key, pos in regions.items():
+            f.write(f"    {key!r}: {pos!r},\n")
+        f.write("}\n")
+    return path
+
+
+if __name__ == '__main__':
+    for family in FAMILIES:
+        print(build(family))
@@ -0,0 +1,247 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+
+# Фоновая запись audit-лога: строки копятся в ограниченной очереди, поток-писатель
+# сбрасывает их пачками с одним fsync на пачку и ротирует файл по размеру/времени.
+QUEUE_SIZE = 10000
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.5  # секунды
+MAX_BYTES = 10 * 1024 * 1024
+ROTATE_INTERVAL = None  # секунды; None — только по размеру
+BACKUP_COUNT = 10
+
+_STOP = object()
+
+
+def encode(item):
+    """Запись-словарь сохраняется строкой JSON, обычная строка — как есть."""
+    if isinstance(item, dict):
+        return (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+    return item.encode("utf-8")
+
+
+class AuditWriter:
+
+    def __init__(self, path, max_bytes=MAX_BYTES, rotate_interval=ROTATE_INTERVAL,
+                 backup_count=BACKUP_COUNT, compress=True, queue_size=QUEUE_SIZE,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, fsync=True, index=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        # Сегменты с индексом не сжимаются: запрос читает запись по смещению, а в gzip
+        # для этого пришлось бы распаковывать сегмент с начала.
+        self.compress = compress and not index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.index = index
+        self._index = None
+        self.queue = queue.Queue(queue_size)
+        self._file = None
+        self._opened_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._retry = []  # строки пачки, которую не удалось записать
+        self._done = 0  # сколько строк текущей пачки уже записано
+        self.error = None  # последняя ошибка записи
+        self.dropped = 0  # строки, отброшенные из-за долгих ошибок записи
+
+    def start(self):
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def write(self, item):
+        """Ставит строку или запись-словарь в очередь. При переполнении ждёт писателя, записи не теряются."""
+        if self._closed:
+            return
+        if self._thread is None:
+            self.start()
+        self.queue.put(item)
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._closed and self._thread.is_alive()
+
+    def flush(self, timeout=None):
+        """Ждёт, пока все поставленные в очередь строки не будут записаны.
+
+        Если поток-писатель не запущен или уже остановлен, ждать некого: сразу возвращает True.
+        """
+        if not self.running:
+            return True
+        event = threading.Event()
+        self.queue.put(event)
+        return event.wait(timeout)
+
+    def close(self, timeout=5):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join(timeout)
+
+    # --- Поток-писатель ---
+    def _run(self):
+        stop = False
+        events = []
+        while not stop:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+                if not self._retry:
+                    continue
+            lines = self._retry
+            self._retry = []
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    lines.append(item)
+                if stop or len(lines) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if lines and not self._write_lines(lines):
+                if not stop:
+                    continue  # события flush ждут, пока пачка не будет записана
+                self.dropped += len(self._retry)
+            for event in events:
+                event.set()
+            events = []
+        for event in events:
+            event.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _write_lines(self, lines):
+        """Пишет пачку; при ошибке оставляет её для повтора (не больше размера очереди) и возвращает False."""
+        self._done = 0
+        try:
+            self._write_batch(lines)
+        except Exception as e:
+            del lines[:self._done]  # уже записанные до ошибки (до ротации) не повторяются
+            if self.error is None:
+                print(f"Не удалось записать audit-лог {self.path}: {e}", file=sys.stderr)
+            self.error = e
+            if self._file is not None:
+                self._file.close()
+                self._file = None  # при повторе файл открывается заново
+            excess = len(lines) - max(self.queue.maxsize, self.batch_size)
+            if excess > 0:
+                del lines[:excess]
+                self.dropped += excess
+            self._retry = lines
+            return False
+        self.error = None
+        return True
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        if self.index and self._index is None:
+            # Соединение SQLite создаётся в потоке-писателе и используется только в нём.
+            from utils.audit_index import AuditIndex
+            self._index = AuditIndex(self.path)
+        if self._opened_at is None:
+            self._opened_at = os.path.getmtime(self.path) if os.path.getsize(self.path) else time.time()
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        if self.rotate_interval and time.time() - self._opened_at >= self.rotate_interval:
+            return True
+        return False
+
+    def _write_batch(self, items):
+        if self._file is None:
+            self._open()
+        if self._file.tell() and self._should_rotate():
+            self._rotate()
+        offset = self._file.tell()
+        chunks = []
+        entries = []
+        for item in items:
+            data = encode(item)
+            # Ротация внутри пачки: файл не превышает max_bytes (кроме одной записи больше max_bytes).
+            if self.max_bytes and offset and offset + len(data) > self.max_bytes:
+                self._write_chunk(chunks, entries)
+                self._rotate()
+                offset = self._file.tell()
+                chunks = []
+                entries = []
+            if isinstance(item, dict):
+                entries.append((offset, item))
+            chunks.append(data)
+            offset += len(data)
+        self._write_chunk(chunks, entries)
+
+    def _write_chunk(self, chunks, entries):
+        if not chunks:
+            return
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._done += len(chunks)
+        if self._index is not None and entries:
+            self._index.add(entries)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        target = f"{self.path}.{stamp}"
+        n = 1
+        while os.path.exists(target) or os.path.exists(target + ".gz"):
+            target = f"{self.path}.{stamp}.{n}"
+            n += 1
+        os.replace(self.path, target)
+        if self.compress:
+            with open(target, "rb") as src, gzip.open(target + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(target)
+            target += ".gz"
+        if self._index is not None:
+            self._index.rotated(target)
+        self._prune()
+        self._opened_at = time.time()
+        self._open()
+
+    def _prune(self):
+        if not self.backup_count:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        # Только сегменты, названные _rotate: <файл>.ГГГГММДД-ЧЧММСС[.n][.gz].
+        pattern = re.compile(re.escape(os.path.basename(self.path)) + r"\.\d{8}-\d{6}(\.\d+)?(\.gz)?")
+        segments = sorted(
+            (os.path.join(directory, name) for name in os.listdir(directory) if pattern.fullmatch(name)),
+            key=os.path.getmtime
+        )
+        for old in segments[:-self.backup_count]:
+            os.remove(old)
+            if self._index is not None:
+                self._index.dropped(old)
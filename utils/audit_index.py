@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import time
+
+# Индекс audit-лога: записи лежат в лог-файле строками JSON, а рядом
+# в SQLite хранятся смещения и время записей и ключи (субъект, объект, действие).
+# Запрос выбирает смещения по индексу и читает из лога только найденные строки.
+# Индексируемые сегменты при ротации не сжимаются (AuditWriter с index=True), поэтому
+# чтение записи — один seek; сжатые .gz-сегменты читаются, но распаковкой с начала.
+LIVE = ""  # сегмент текущего (неротированного) файла
+BUCKET = "%Y-%m-%d"
+
+
+def index_path(log_path):
+    return log_path + ".idx"
+
+
+def keys(record):
+    if record.get("action"):
+        yield "a:" + record["action"]
+    for s in record.get("subjects", ()):
+        yield "s:" + s
+    for o in record.get("objects", ()):
+        yield "o:" + o
+
+
+class AuditIndex:
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.conn = sqlite3.connect(index_path(log_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                ts REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                key TEXT NOT NULL,
+                record INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+            CREATE INDEX IF NOT EXISTS records_segment ON records (segment);
+            CREATE INDEX IF NOT EXISTS postings_key ON postings (key, record);
+        """)
+
+    def add(self, entries):
+        """entries — [(смещение, запись)] в текущем файле; одна транзакция на пачку."""
+        with self.conn:
+            for offset, record in entries:
+                cur = self.conn.execute(
+                    "INSERT INTO records (segment, offset, ts) VALUES (?, ?, ?)",
+                    (LIVE, offset, record["ts"])
+                )
+                self.conn.executemany(
+                    "INSERT INTO postings (key, record) VALUES (?, ?)",
+                    [(k, cur.lastrowid) for k in keys(record)]
+                )
+
+    def rotated(self, segment):
+        """Текущий файл переименован в segment."""
+        with self.conn:
+            self.conn.execute("UPDATE records SET segment = ? WHERE segment = ?", (os.path.basename(segment), LIVE))
+
+    def dropped(self, segment):
+        with self.conn:
+            name = os.path.basename(segment)
+            self.conn.execute(
+                "DELETE FROM postings WHERE record IN (SELECT id FROM records WHERE segment = ?)", (name,)
+            )
+            self.conn.execute("DELETE FROM records WHERE segment = ?", (name,))
+
+    def lookup(self, subject=None, object=None, action=None, since=None, until=None, limit=None, newest=False):
+        """Возвращает [(сегмент, смещение)] подходящих записей в порядке времени.
+
+        newest=True вместе с limit выбирает последние limit записей (порядок остаётся хронологическим).
+        """
+        conds = []
+        params = []
+        for prefix, value in (("s:", subject), ("o:", object), ("a:", action)):
+            if value is not None:
+                conds.append("id IN (SELECT record FROM postings WHERE key = ?)")
+                params.append(prefix + value)
+        if since is not None:
+            conds.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conds.append("ts < ?")
+            params.append(until)
+        where = " WHERE " + " AND ".join(conds) if conds else ""
+        order = "DESC" if newest else "ASC"
+        sql = f"SELECT segment, offset FROM records{where} ORDER BY ts {order}, id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        if newest:
+            rows.reverse()
+        return rows
+
+    def query(self, **kw):
+        """Читает из лога только записи, найденные по индексу."""
+        directory = os.path.dirname(os.path.abspath(self.log_path))
+        handles = {}
+        try:
+            for segment, offset in self.lookup(**kw):
+                f = handles.get(segment)
+                if f is None:
+                    if segment == LIVE:
+                        f = open(self.log_path, "rb")
+                    elif segment.endswith(".gz"):
+                        f = gzip.open(os.path.join(directory, segment), "rb")
+                    else:
+                        f = open(os.path.join(directory, segment), "rb")
+                    handles[segment] = f
+                f.seek(offset)
+                yield json.loads(f.readline())
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def close(self):
+        self.conn.close()
+
+
+def parse_date(text):
+    return time.mktime(time.strptime(text, BUCKET))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Поиск по audit-логу администратора")
+    parser.add_argument("log", nargs="?", default="admin_audit.jsonl")
+    parser.add_argument("--subject")
+    parser.add_argument("--object")
+    parser.add_argument("--action")
+    parser.add_argument("--since", type=parse_date, help="ГГГГ-ММ-ДД")
+    parser.add_argument("--until", type=parse_date, help="ГГГГ-ММ-ДД (не включая)")
+    args = parser.parse_args(argv)
+
+    index = AuditIndex(args.log)
+    try:
+        for record in index.query(
+            subject=args.subject, object=args.object, action=args.action, since=args.since, until=args.until
+        ):
+            print(json.dumps(record, ensure_ascii=False))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
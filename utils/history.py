@@ -0,0 +1,369 @@
+from collections.abc import MutableMapping
+
+# Персистентное хеш-дерево (32-ричный trie по хешу ключа). Каждое изменение
+# копирует только путь от корня до листа, остальные узлы разделяются между версиями.
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+HASH_MASK = (1 << 64) - 1
+
+
+class _Leaf:
+    __slots__ = ('hash', 'items')
+
+    def __init__(self, h, items):
+        self.hash = h
+        self.items = items
+
+
+class _Node:
+    __slots__ = ('children',)
+
+    def __init__(self, children):
+        self.children = children
+
+
+def _hash(key):
+    return hash(key) & HASH_MASK
+
+
+def _assoc(node, shift, h, key, value):
+    if node is None:
+        return _Leaf(h, ((key, value),)), True
+    if isinstance(node, _Leaf):
+        if node.hash == h:
+            items = [(k, v) for k, v in node.items if k != key]
+            added = len(items) == len(node.items)
+            items.append((key, value))
+            return _Leaf(h, tuple(items)), added
+        children = [None] * WIDTH
+        children[(node.hash >> shift) & MASK] = node
+        return _assoc(_Node(tuple(children)), shift, h, key, value)
+    idx = (h >> shift) & MASK
+    child, added = _assoc(node.children[idx], shift + BITS, h, key, value)
+    children = list(node.children)
+    children[idx] = child
+    return _Node(tuple(children)), added
+
+
+def _dissoc(node, shift, h, key):
+    if node is None:
+        return None, False
+    if isinstance(node, _Leaf):
+        if node.hash != h:
+            return node, False
+        items = tuple((k, v) for k, v in node.items if k != key)
+        if len(items) == len(node.items):
+            return node, False
+        return (_Leaf(h, items) if items else None), True
+    idx = (h >> shift) & MASK
+    child, removed = _dissoc(node.children[idx], shift + BITS, h, key)
+    if not removed:
+        return node, False
+    children = list(node.children)
+    children[idx] = child
+    if not any(children):
+        return None, True
+    return _Node(tuple(children)), True
+
+
+def _items(node):
+    if node is None:
+        return
+    if isinstance(node, _Leaf):
+        yield from node.items
+        return
+    for child in node.children:
+        if child is not None:
+            yield from _items(child)
+
+
+def _diff(a, b, out):
+    if a is b:
+        return
+    if isinstance(a, _Node) and isinstance(b, _Node):
+        for ca, cb in zip(a.children, b.children):
+            _diff(ca, cb, out)
+        return
+    old = dict(_items(a))
+    new = dict(_items(b))
+    for k, v in old.items():
+        if new.get(k, _MISSING) != v:
+            out[k] = (v, new.get(k))
+    for k, v in new.items():
+        if k not in old:
+            out[k] = (None, v)
+
+
+_MISSING = object()
+
+
+class PersistentMap:
+    """Неизменяемый словарь со структурным разделением между версиями."""
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root=None, size=0):
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def from_items(cls, items):
+        m = cls()
+        for k, v in items:
+            m = m.set(k, v)
+        return m
+
+    def set(self, key, value):
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        return PersistentMap(root, self._size + added)
+
+    def delete(self, key):
+        root, removed = _dissoc(self._root, 0, _hash(key), key)
+        if not removed:
+            return self
+        return PersistentMap(root, self._size - 1)
+
+    def get(self, key, default=None):
+        h = _hash(key)
+        node = self._root
+        shift = 0
+        while isinstance(node, _Node):
+            node = node.children[(h >> shift) & MASK]
+            shift += BITS
+        if node is not None and node.hash == h:
+            for k, v in node.items:
+                if k == key:
+                    return v
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self._size
+
+    def items(self):
+        return _items(self._root)
+
+    def diff(self, other):
+        """Возвращает {ключ: (старое, новое)}, обходя только различающиеся поддеревья."""
+        out = {}
+        _diff(self._root, other._root, out)
+        return out
+
+
+class MatrixSnapshot:
+    """Неизменяемая версия матрицы доступа.
+
+    Строки субъектов хранятся как (порядковый номер, кортеж объектов):
+    номер сохраняет порядок субъектов как в исходном словаре.
+    """
+
+    __slots__ = ('objects', 'subjects', 'next_seq')
+
+    def __init__(self, objects=(), subjects=PersistentMap(), next_seq=0):
+        self.objects = tuple(objects)
+        self.subjects = subjects
+        self.next_seq = next_seq
+
+    @classmethod
+    def from_data(cls, data):
+        subjects = PersistentMap.from_items(
+            (s, (i, tuple(objs))) for i, (s, objs) in enumerate(data.get("subjects", {}).items())
+        )
+        return cls(data.get("objects", []), subjects, len(subjects))
+
+    def rights(self, subject):
+        row = self.subjects.get(subject)
+        return None if row is None else list(row[1])
+
+    def to_data(self):
+        rows = sorted(self.subjects.items(), key=lambda item: item[1][0])
+        return {
+            "objects": list(self.objects),
+            "subjects": {s: list(objs) for s, (_, objs) in rows},
+        }
+
+    def edit(self):
+        """Возвращает изменяемое представление в формате data для команд admin.py."""
+        return {"objects": list(self.objects), "subjects": SubjectsOverlay(self)}
+
+    @staticmethod
+    def commit(data):
+        overlay = data["subjects"]
+        base = overlay.snapshot
+        subjects = base.subjects
+        for s, row in overlay.changes.items():
+            subjects = subjects.delete(s) if row is None else subjects.set(s, row)
+        return MatrixSnapshot(data["objects"], subjects, overlay.next_seq)
+
+
+class SubjectsOverlay(MutableMapping):
+    """Копирование при записи поверх снимка: запоминает только изменённые строки.
+
+    Значения возвращаются копиями, поэтому изменения нужно присваивать,
+    а не вносить в полученный список на месте (как и делают команды admin.py).
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.changes = {}
+        self.next_seq = snapshot.next_seq
+
+    def _row(self, key):
+        if key in self.changes:
+            return self.changes[key]
+        return self.snapshot.subjects.get(key)
+
+    def __getitem__(self, key):
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return list(row[1])
+
+    def __setitem__(self, key, value):
+        row = self._row(key)
+        if row is None:
+            row = (self.next_seq, ())
+            self.next_seq += 1
+        self.changes[key] = (row[0], tuple(value))
+
+    def __delitem__(self, key):
+        if self._row(key) is None:
+            raise KeyError(key)
+        self.changes[key] = None
+
+    def __contains__(self, key):
+        return self._row(key) is not None
+
+    def __iter__(self):
+        rows = [(s, row) for s, row in self.snapshot.subjects.items() if s not in self.changes]
+        rows.extend((s, row) for s, row in self.changes.items() if row is not None)
+        rows.sort(key=lambda item: item[1][0])
+        return iter([s for s, _ in rows])
+
+    def __len__(self):
+        n = len(self.snapshot.subjects)
+        for s, row in self.changes.items():
+            n += (row is not None) - (s in self.snapshot.subjects)
+        return n
+
+
+class MatrixDiff:
+
+    def __init__(self, objects_before, objects_after, subjects):
+        self.objects_before = list(objects_before)
+        self.objects_after = list(objects_after)
+        before, after = set(objects_before), set(objects_after)
+        self.objects_added = [o for o in objects_after if o not in before]
+        self.objects_removed = [o for o in objects_before if o not in after]
+        # {субъект: (права до или None, права после или None)}
+        self.subjects = subjects
+
+    def __bool__(self):
+        return bool(self.subjects) or self.objects_before != self.objects_after
+
+
+def diff(a, b):
+    """Разница между двумя снимками за O(изменённых строк)."""
+    changed = {
+        s: (None if old is None else list(old[1]), None if new is None else list(new[1]))
+        for s, (old, new) in a.subjects.diff(b.subjects).items()
+        if old is None or new is None or old[1] != new[1]
+    }
+    return MatrixDiff(a.objects, b.objects, changed)
+
+
+class MatrixHistory:
+    """История версий матрицы с отменой/повтором и оценкой команд «что если»."""
+
+    def __init__(self, data, limit=None):
+        self.limit = limit
+        self.reset(data)
+
+    def reset(self, data):
+        self.versions = [MatrixSnapshot.from_data(data)]
+        self.cursor = 0
+
+    @property
+    def head(self):
+        return self.versions[self.cursor]
+
+    def __len__(self):
+        return len(self.versions)
+
+    def what_if(self, commands):
+        """Применяет пакет [(команда, аргументы...), ...] к текущей версии и возвращает diff с ней.
+
+        Матрица не копируется (команды пишут в SubjectsOverlay), версия в историю не добавляется.
+        Исключение команды прерывает пакет и выходит наружу; история при этом не меняется.
+        """
+        data = self.head.edit()
+        for command, *args in commands:
+            command(data, *args)
+        return diff(self.head, MatrixSnapshot.commit(data))
+
+    def apply(self, command, *args):
+        """Выполняет команду над новой версией и делает её текущей. Возвращает (результат, diff).
+
+        Если команда ничего не изменила, версия не добавляется (и не сбрасывает повтор).
+        """
+        data = self.head.edit()
+        result = command(data, *args)
+        snapshot = MatrixSnapshot.commit(data)
+        d = diff(self.head, snapshot)
+        if not d:
+            return result, d
+        return result, self.push(snapshot)
+
+    def push(self, snapshot):
+        prev = self.head
+        del self.versions[self.cursor + 1:]
+        self.versions.append(snapshot)
+        if self.limit is not None and len(self.versions) > self.limit:
+            del self.versions[:len(self.versions) - self.limit]
+        self.cursor = len(self.versions) - 1
+        return diff(prev, snapshot)
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < len(self.versions) - 1
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        self.cursor -= 1
+        return diff(self.versions[self.cursor + 1], self.head)
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        self.cursor += 1
+        return diff(self.versions[self.cursor - 1], self.head)
+
+
+def patch(data, d, snapshot):
+    """Переносит diff в изменяемый словарь data; snapshot — версия, к которой приходим."""
+    data["objects"][:] = d.objects_after
+    subjects = data["subjects"]
+    for s, (_, new) in d.subjects.items():
+        if new is None:
+            subjects.pop(s, None)
+        elif s in subjects:
+            subjects[s] = new
+    added = sorted(
+        (snapshot.subjects.get(s)[0], s) for s, (old, new) in d.subjects.items() if old is None and new is not None
+    )
+    if not added:
+        return
+    last = next(reversed(subjects), None)
+    if last is not None and snapshot.subjects.get(last)[0] > added[0][0]:
+        # Восстановлен субъект из середины: порядок берём из снимка.
+        subjects.clear()
+        subjects.update(snapshot.to_data()["subjects"])
+        return
+    for _, s in added:
+        subjects[s] = d.subjects[s][1]
@@ -1,14 +1,148 @@
 import base64
+import hashlib
+import importlib
 import io
-from PIL import Image, ImageTk
-
-photos = list()
-
-def load(base64data, size, **kw):
-    msg = base64data
-    msg = base64.b64decode(msg)
-    buf = io.BytesIO(msg)
-    img = Image.open(buf).resize(size)
-    photo = ImageTk.PhotoImage(img, **kw)
-    photos.append(photo)
-    return photo
\ No newline at end of file
+import os
+import struct
+import tkinter as tk
+
+# Раскодированные и масштабированные иконки кэшируются на диске в PNG
+# (ключ — хеш исходных данных, размер и режим) и загружаются в Tk напрямую, без PIL.
+CACHE_DIR = os.environ.get(
+    "MBKS_ICON_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "mbks", "icons")
+)
+
+
+class ImageRegistry:
+    """Все созданные PhotoImage приложения: ключ -> изображение.
+
+    Держит ссылки, чтобы Tk не удалил картинки, и позволяет освобождать их явно.
+    Атласы (см. utils/atlas.py) раскодируются один раз и освобождаются,
+    когда из них вырезаны все иконки.
+    """
+
+    def __init__(self):
+        self.images = dict()
+        self._atlases = dict()  # семейство -> (PhotoImage атласа, вырезанные области)
+
+    def get(self, key):
+        return self.images.get(key)
+
+    def add(self, key, photo):
+        self.images[key] = photo
+        return photo
+
+    def release(self, key):
+        self.images.pop(key, None)
+
+    def clear(self):
+        self.images.clear()
+        self._atlases.clear()
+
+    def carve(self, family, module, region_key, **kw):
+        """Копирует область атласа в отдельный PhotoImage."""
+        entry = self._atlases.get(family)
+        if entry is None:
+            entry = (tk.PhotoImage(data=module.atlas, format='png'), set())
+            self._atlases[family] = entry
+        atlas, carved = entry
+        x, y = module.regions[region_key]
+        _, w, h = region_key
+        photo = tk.PhotoImage(width=w, height=h, **kw)
+        photo.tk.call(photo.name, 'copy', atlas.name, '-from', x, y, x + w, y + h)
+        carved.add(region_key)
+        if len(carved) == len(module.regions):
+            del self._atlases[family]
+        return photo
+
+
+registry = ImageRegistry()
+
+
+def png_size(raw):
+    """Размер PNG из заголовка IHDR или None, если это не PNG."""
+    if raw[:8] != b'\x89PNG\r\n\x1a\n' or raw[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', raw[16:24])
+
+
+def cache_path(digest, size, mode):
+    return os.path.join(CACHE_DIR, f"{digest}_{size[0]}x{size[1]}_{mode or 'orig'}.png")
+
+
+def _resize(raw, size, mode):
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(raw))
+    if mode is not None:
+        img = img.convert(mode)
+    buf = io.BytesIO()
+    img.resize(size).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def _store(path, png):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # без кэша просто раскодируем заново при следующем запуске
+
+
+def load(base64data, size, mode=None, **kw):
+    size = tuple(size)
+    digest = hashlib.sha1(base64data.encode('ascii')).hexdigest()
+    key = (digest, size, mode, tuple(sorted(kw.items())))
+    photo = registry.get(key)
+    if photo is not None:
+        return photo
+
+    path = cache_path(digest, size, mode)
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                photo = _photo(f.read(), **kw)
+            return registry.add(key, photo)
+        except (OSError, tk.TclError):
+            # Повреждённый или недописанный файл кэша: удаляем и рисуем иконку заново.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    raw = base64.b64decode(base64data)
+    if mode is None and png_size(raw) == size:
+        png = raw
+    else:
+        png = _resize(raw, size, mode)
+        _store(path, png)
+    return registry.add(key, _photo(png, **kw))
+
+
+def _photo(png, **kw):
+    return tk.PhotoImage(data=base64.b64encode(png).decode('ascii'), format='png', **kw)
+
+
+def load_icon(family, name, size, **kw):
+    """Иконка name из семейства family (пакет вида '_style._scrollbar').
+
+    Берётся из атласа family.atlas, если он собран для этого размера,
+    иначе раскодируется из family.images через load().
+    """
+    size = tuple(size)
+    key = (family, name, size, tuple(sorted(kw.items())))
+    photo = registry.get(key)
+    if photo is not None:
+        return photo
+    try:
+        module = importlib.import_module(family + '.atlas')
+    except ImportError:
+        module = None
+    region_key = (name,) + size
+    if module is None or region_key not in module.regions:
+        images = importlib.import_module(family + '.images').images
+        return load(images[name], size, **kw)
+    return registry.add(key, registry.carve(family, module, region_key, **kw))
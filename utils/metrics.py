@@ -0,0 +1,185 @@
+import atexit
+import bisect
+import functools
+import os
+import signal
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+
+# Счётчики и гистограммы времени команд приложений, экспорт в текстовом формате Prometheus.
+# Замер — два perf_counter и bisect, так что таймеры включены всегда; наружу данные
+# уходят только по запросу:
+#
+#     MBKS_METRICS=metrics.prom python admin.py          # записать при выходе и по SIGUSR2
+#     MBKS_METRICS_URL=http://host:9091/metrics/job/mbks  # отправить туда же (Pushgateway)
+#
+# Ctrl+Shift+P (или SIGUSR1) включает и выключает cProfile; профиль пишется в mbks-<pid>-<n>.prof.
+ENV_VAR = "MBKS_METRICS"
+URL_VAR = "MBKS_METRICS_URL"
+PREFIX = "mbks_command"
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+
+    __slots__ = ("counts", "sum", "count", "errors", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # последний — +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+
+class Metrics:
+
+    def __init__(self, app=None):
+        self.app = app or os.path.splitext(os.path.basename(sys.argv[0] or "mbks"))[0] or "mbks"
+        self.histograms = dict()
+        self.profile = None
+        self._profiles = 0
+
+    def observe(self, name, seconds, error=False):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+        if error:
+            histogram.errors += 1
+
+    @contextmanager
+    def timer(self, name):
+        """Замер блока; исключение, вышедшее из блока, считается ошибкой команды.
+
+        Обработчики, которые сами ловят исключения и показывают диалог, оборачивают в timer
+        только работу: ошибка проходит через блок и учитывается, а ожидание диалога — нет.
+        """
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error)
+
+    def timed(self, name=None):
+        """Декоратор: время каждого вызова функции или метода попадает в гистограмму name."""
+        def decorator(fn):
+            key = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                error = True
+                try:
+                    result = fn(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    self.observe(key, time.perf_counter() - start, error)
+            return wrapper
+        return decorator
+
+    # --- Профилирование по запросу ---
+    def toggle_profile(self, directory="."):
+        """Включает cProfile в текущем (главном) потоке или выключает и пишет файл; возвращает путь."""
+        if self.profile is None:
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+            return None
+        self.profile.disable()
+        self._profiles += 1
+        path = os.path.join(directory, f"mbks-{os.getpid()}-{self._profiles}.prof")
+        self.profile.dump_stats(path)
+        self.profile = None
+        return path
+
+    # --- Экспорт ---
+    def export_text(self):
+        app = _escape(self.app)
+        lines = [
+            f"# HELP {PREFIX}_seconds Время выполнения команд приложения.",
+            f"# TYPE {PREFIX}_seconds histogram",
+        ]
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            labels = f'app="{app}",command="{_escape(name)}"'
+            total = 0
+            for bound, count in zip(BUCKETS, h.counts):
+                total += count
+                lines.append(f'{PREFIX}_seconds_bucket{{{labels},le="{bound}"}} {total}')
+            lines.append(f'{PREFIX}_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"{PREFIX}_seconds_sum{{{labels}}} {h.sum:.6f}")
+            lines.append(f"{PREFIX}_seconds_count{{{labels}}} {h.count}")
+        lines.append(f"# HELP {PREFIX}_errors_total Команды, завершившиеся исключением.")
+        lines.append(f"# TYPE {PREFIX}_errors_total counter")
+        for name in sorted(self.histograms):
+            lines.append(f'{PREFIX}_errors_total{{app="{app}",command="{_escape(name)}"}} '
+                         f'{self.histograms[name].errors}')
+        lines.append(f"# HELP {PREFIX}_max_seconds Самый долгий вызов команды.")
+        lines.append(f"# TYPE {PREFIX}_max_seconds gauge")
+        for name in sorted(self.histograms):
+            lines.append(f'{PREFIX}_max_seconds{{app="{app}",command="{_escape(name)}"}} '
+                         f'{self.histograms[name].max:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.export_text())
+        os.replace(tmp, path)
+
+    def push(self, url, timeout=5):
+        request = urllib.request.Request(
+            url, data=self.export_text().encode("utf-8"), method="PUT",
+            headers={"Content-Type": "text/plain; version=0.0.4"}
+        )
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+
+    def export(self):
+        """Записывает файл и/или отправляет метрики по настройкам окружения."""
+        path = os.environ.get(ENV_VAR)
+        url = os.environ.get(URL_VAR)
+        if path:
+            self.write(path)
+        if url:
+            try:
+                self.push(url)
+            except OSError as e:
+                print("Не удалось отправить метрики:", e)
+
+    def install(self, app):
+        """Горячие клавиши и сигналы для приложения Tk, экспорт при выходе."""
+        app.bind_all("<Control-Shift-P>", lambda e: self._report_profile(self.toggle_profile()))
+        app.bind_all("<Control-Shift-M>", lambda e: self.export())
+        if hasattr(signal, "SIGUSR1"):
+            # Обработчики сигналов выполняются в главном потоке, там же, где команды Tk.
+            signal.signal(signal.SIGUSR1, lambda *a: self._report_profile(self.toggle_profile()))
+            signal.signal(signal.SIGUSR2, lambda *a: self.export())
+        if os.environ.get(ENV_VAR) or os.environ.get(URL_VAR):
+            atexit.register(self.export)
+
+    def _report_profile(self, path):
+        print(f"Профиль записан: {path}" if path else "Профилирование включено.")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
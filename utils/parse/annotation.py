@@ -1,82 +1,207 @@
 from collections import UserDict
+from xml.sax.saxutils import quoteattr
 import xml.etree.ElementTree as ET
+import gzip
 import os.path
 
 from data import labels
 from data import files
+from utils.parse.geometry import FileGeometry
 
 
 class MarkupLabels(UserDict):
 
-    def __init__(self, element: ET.Element):
+    def __init__(self, element: ET.Element = None, registry=None):
         super().__init__()
+        if element is None:
+            return
+        registry = labels if registry is None else registry
         for xml_label in element:
             id = xml_label.get('id')
             name = xml_label.get('name')
             color = xml_label.get('color')
-            label = labels.append(name, color)
-            self.data[id] = label        
+            label = registry.append(name, color, id)
+            self.data[id] = label
+
+
+def append_file(xml_file: ET.Element, path: str, dims: str = '2D', markup_labels=None, registry=None,
+                keep_geometry=True):
+    """Регистрирует файл и возвращает (file, FileGeometry).
+
+    keep_geometry=False — геометрия и карта меток в реестр не записываются (потоковое чтение).
+    """
+    filename = xml_file.get('path')
+    width = xml_file.get('width')
+    height = xml_file.get('height')
+    colored = xml_file.get('colored')
+    sequence = xml_file.get('sequence')
+
+    objects = list()
+    for xml_object in xml_file.iterfind('object'):
+        label = xml_object.get('label')
+        points = xml_object.get('points')
+        objects.append((label, points))
+    geometry = FileGeometry(objects, dims)
+
+    filepath = os.path.join(path, filename)
+    file = (files if registry is None else registry).append(
+        filepath, 
+        sequence=sequence, 
+        width=width, 
+        height=height, 
+        colored=colored,
+        geometry=geometry if keep_geometry else None,
+        labels=None if markup_labels is None or not keep_geometry else markup_labels.data
+    )
+    return file, geometry
 
 
 class MarkupFiles(UserDict):
 
-    def __init__(self, element: ET.Element, path: str):
+    def __init__(self, element: ET.Element = None, path: str = '', markup_labels=None):
         super().__init__()
+        if element is None:
+            return
+        dims = '3D' if element.tag == 'pointClouds' else '2D'
         for xml_file in element:
-            filename = xml_file.get('path')
-            width = xml_file.get('width')
-            height = xml_file.get('height')
-            colored = xml_file.get('colored')
-            sequence = xml_file.get('sequence')
-
-            filepath = os.path.join(path, filename)
-            file = files.append(
-                filepath, 
-                sequence=sequence, 
-                width=width, 
-                height=height, 
-                colored=colored
-            )
-
-            self.data[file] = list()
-            xml_objects = xml_file.findall('object')
-
-            for xml_object in xml_objects:
-                label = xml_object.get('label')
-                points = xml_object.get('points')
-                self.data[file].append((label, points))
+            file, objects = append_file(xml_file, path, dims, markup_labels)
+            self.data[file] = objects
         
 
+FILE_TAGS = ('image', 'pointCloud')
+
+
+class AnnotationReader:
+    """Потоковое чтение файла разметки через iterparse.
+
+    Итерация выдаёт пары (file, FileGeometry) по одной на изображение
+    или облако точек; обработанные элементы сразу удаляются из дерева,
+    поэтому в памяти держится разметка только одного файла.
+    Метки регистрируются, как только прочитан блок <labels>, и доступны в self.labels.
+    label_registry/file_registry — реестры вместо data.labels/data.files (например, в рабочем процессе).
+    В реестр файлов попадают только атрибуты файлов; геометрия остаётся в нём (для экспорта
+    через Annotation.toXML/writeXML) только при keep_geometry=True.
+    """
+
+    def __init__(self, path, label_registry=None, file_registry=None, keep_geometry=False):
+        self.path = path
+        self.keep_geometry = keep_geometry
+        self.dirname = os.path.dirname(path)
+        self.dims = None
+        self.labels = MarkupLabels()
+        self.label_registry = labels if label_registry is None else label_registry
+        self.file_registry = files if file_registry is None else file_registry
+
+    def __iter__(self):
+        container = None
+        for event, elem in ET.iterparse(self.path, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'annotations':
+                    self.dims = elem.get('dims')
+                    self.file_registry.dim = self.dims
+                elif elem.tag in ('images', 'pointClouds'):
+                    container = elem
+                continue
+            if elem.tag == 'labels':
+                self.labels = MarkupLabels(elem, self.label_registry)
+                elem.clear()
+            elif elem.tag in FILE_TAGS and container is not None:
+                yield append_file(
+                    elem, self.dirname, self.dims, self.labels, self.file_registry, self.keep_geometry
+                )
+                container.remove(elem)
+
+def label_ids():
+    """{Label: id при записи}: исходный id метки, а если он уже занят другой меткой — свободное число."""
+    ids = dict()
+    used = set()
+    taken = []
+    for label in labels:
+        id = label.xml_id
+        if id in used:
+            taken.append(label)
+        else:
+            ids[label] = id
+            used.add(id)
+    n = 0
+    for label in taken:
+        while str(n) in used:
+            n += 1
+        ids[label] = str(n)
+        used.add(str(n))
+    return ids
+
+
 class Annotation:
 
     @staticmethod
     def toXML(path):
+        ids = label_ids()
         root = ET.Element("annotations", {"dims": files.dim})
         xml_labels = ET.Element("labels")
         for label in labels:
-            xml_labels.append(label.toXML())
+            xml_labels.append(label.toXML(ids[label]))
         if files.dim == '2D':
             xml_files = ET.Element("images")
             for img in files:
-                xml_files.append(img.toXML(path))
+                xml_files.append(img.toXML(path, ids))
         elif files.dim == '3D':
             xml_files = ET.Element("pointClouds" )
             for pcl in files:
-                xml_files.append(pcl.toXML(path))
+                xml_files.append(pcl.toXML(path, ids))
         root.append(xml_labels)
         root.append(xml_files)
         return root
     
+    @staticmethod
+    def writeXML(path, out, compress=None):
+        """Записывает разметку в out (путь или текстовый поток) по мере обхода labels и files.
+
+        В отличие от toXML дерево целиком не строится: каждый элемент сериализуется
+        и пишется сразу. compress=None включает gzip для путей с расширением .gz.
+        """
+        if isinstance(out, (str, os.PathLike)):
+            if compress is None:
+                compress = str(out).endswith('.gz')
+            opener = gzip.open if compress else open
+            with opener(out, 'wt', encoding='utf-8') as f:
+                Annotation.writeXML(path, f)
+            return
+
+        if files.dim == '2D':
+            tag = 'images'
+        elif files.dim == '3D':
+            tag = 'pointClouds'
+        else:
+            raise ValueError(f"Неизвестная размерность разметки: {files.dim}")
+
+        ids = label_ids()
+        out.write(f"<annotations dims={quoteattr(files.dim)}>")
+        out.write("<labels>")
+        for label in labels:
+            out.write(ET.tostring(label.toXML(ids[label]), encoding='unicode'))
+        out.write("</labels>")
+        out.write(f"<{tag}>")
+        for file in files:
+            out.write(ET.tostring(file.toXML(path, ids), encoding='unicode'))
+        out.write(f"</{tag}>")
+        out.write("</annotations>")
+
+    @staticmethod
+    def fromXMLMany(source, workers=None):
+        """Загрузка многих файлов (каталог или список путей) в пуле процессов, см. utils/parse/bulk.py."""
+        from utils.parse.bulk import load_many
+        return load_many(source, workers)
+
+    @staticmethod
+    def iterXML(path):
+        """Потоковый режим: возвращает AnnotationReader."""
+        return AnnotationReader(path)
+
     @staticmethod
     def fromXML(path):
-        tree = ET.parse(path)
-        root = tree.getroot()
-        dims = root.get('dims')
-        xml_labels = root.find("labels")
-        if dims == '2D':
-            xml_files = root.find("images")
-        elif dims == '3D':
-            xml_files = root.find("pointClouds")
-
-        return MarkupLabels(xml_labels), \
-               MarkupFiles(xml_files, os.path.dirname(path))
\ No newline at end of file
+        reader = AnnotationReader(path, keep_geometry=True)
+        markup_files = MarkupFiles()
+        for file, objects in reader:
+            markup_files.data[file] = objects
+        return reader.labels, markup_files
@@ -0,0 +1,77 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os.path
+
+# Параллельная загрузка многих файлов разметки. Рабочие процессы разбирают XML тем же
+# AnnotationReader, но в собственные пустые реестры, и возвращают простые записи;
+# регистрация меток и файлов в data выполняется в основном процессе в порядке входного списка.
+
+# labels: [(id, name, color)]
+# files: [(path, width, height, colored, sequence, FileGeometry)]
+AnnotationRecord = namedtuple('AnnotationRecord', 'path dims labels files')
+
+
+def read_record(path):
+    from data.registry import LabelRegistry, FileRegistry
+    from utils.parse.annotation import AnnotationReader
+
+    reader = AnnotationReader(path, LabelRegistry(), FileRegistry())
+    files = [
+        (file.path, file.width, file.height, file.colored, file.sequence, geometry)
+        for file, geometry in reader
+    ]
+    labels = [(id, label.name, label.color) for id, label in reader.labels.items()]
+    return AnnotationRecord(path, reader.dims, labels, files)
+
+
+def annotation_paths(source):
+    """Каталог (все *.xml) или список путей -> отсортированный список путей."""
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.xml')))
+    return list(source)
+
+
+def read_records(paths, workers=None):
+    if workers == 1 or len(paths) < 2:
+        return [read_record(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_record, paths))
+
+
+def merge(records):
+    """Регистрирует метки и файлы в data.labels/data.files (метки с одинаковыми (name, color)
+    объединяет LabelRegistry.append).
+
+    Возвращает [(MarkupLabels, MarkupFiles)] в порядке записей, как Annotation.fromXML для каждого файла.
+    """
+    from data import labels, files
+    from utils.parse.annotation import MarkupLabels, MarkupFiles
+
+    result = []
+    for record in records:
+        if record.dims:
+            files.dim = record.dims
+        markup_labels = MarkupLabels()
+        for id, name, color in record.labels:
+            markup_labels.data[id] = labels.append(name, color, id)
+
+        markup_files = MarkupFiles()
+        for path, width, height, colored, sequence, geometry in record.files:
+            file = files.append(
+                path,
+                sequence=sequence,
+                width=width,
+                height=height,
+                colored=colored,
+                geometry=geometry,
+                labels=markup_labels.data
+            )
+            markup_files.data[file] = geometry
+        result.append((markup_labels, markup_files))
+    return result
+
+
+def load_many(source, workers=None):
+    """Разбирает файлы разметки из каталога или списка в пуле процессов и регистрирует их."""
+    return merge(read_records(annotation_paths(source), workers))
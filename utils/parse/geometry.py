@@ -0,0 +1,163 @@
+import re
+
+import numpy as np
+
+_SEPARATORS = re.compile(r'[,;\s]+')
+
+
+class FileGeometry:
+    """Геометрия объектов одного файла разметки.
+
+    Строки points разбираются при первом обращении в один непрерывный массив
+    координат coords (N x 2 для '2D', N x 3 для '3D') и массив смещений offsets:
+    точки объекта i — coords[offsets[i]:offsets[i + 1]].
+    Для совместимости ведёт себя как список пар (label, points),
+    где points — представление (view) части coords без копирования.
+    Объект с нечисловыми координатами или с числом значений, не кратным ndim,
+    остаётся без точек; причина и исходная строка — в errors[i].
+    """
+
+    __slots__ = ('dims', 'labels', 'errors', '_raw', '_coords', '_offsets', '_index')
+
+    def __init__(self, objects, dims='2D'):
+        self.dims = dims
+        self.labels = [label for label, _ in objects]
+        self._raw = [points for _, points in objects]
+        self.errors = dict()  # индекс объекта -> (сообщение, исходная строка points)
+        self._coords = None
+        self._offsets = None
+        self._index = None
+
+    @property
+    def ndim(self):
+        return 3 if self.dims == '3D' else 2
+
+    def _parse(self):
+        chunks = []
+        counts = np.zeros(len(self._raw), dtype=np.int64)
+        for i, points in enumerate(self._raw):
+            text = (points or '').strip()
+            if not text:
+                continue
+            try:
+                values = np.array(_SEPARATORS.split(text), dtype=np.float64)
+            except ValueError:
+                self.errors[i] = (f"объект {i}: нечисловые координаты", points)
+                continue
+            if len(values) % self.ndim:
+                self.errors[i] = (
+                    f"объект {i}: {len(values)} значений не делится на размерность {self.ndim}", points
+                )
+                continue
+            chunks.append(values)
+            counts[i] = len(values) // self.ndim
+        coords = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+        self._coords = coords.reshape(-1, self.ndim)
+        self._offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._offsets[1:])
+        self._raw = None
+
+    @property
+    def coords(self):
+        if self._coords is None:
+            self._parse()
+        return self._coords
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._parse()
+        return self._offsets
+
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def points(self, i):
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    def text(self, i):
+        """Строка points объекта i: исходная, если ещё не разобрана, иначе координаты через пробел."""
+        if self._raw is not None:
+            return self._raw[i] or ''
+        if i in self.errors:
+            return self.errors[i][1] or ''
+        return ' '.join(np.format_float_positional(v, trim='-') for v in self.points(i).ravel())
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, i):
+        return self.labels[i], self.points(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _starts(self):
+        """Начала непустых объектов и маска непустых (reduceat не работает с пустыми отрезками)."""
+        counts = self.counts()
+        nonempty = counts > 0
+        return self.offsets[:-1][nonempty], nonempty
+
+    def bboxes(self):
+        """(n, 2 * ndim): минимумы, затем максимумы координат каждого объекта; NaN для пустых."""
+        out = np.full((len(self), 2 * self.ndim), np.nan, dtype=np.float64)
+        starts, nonempty = self._starts()
+        if len(starts):
+            out[nonempty, :self.ndim] = np.minimum.reduceat(self.coords, starts, axis=0)
+            out[nonempty, self.ndim:] = np.maximum.reduceat(self.coords, starts, axis=0)
+        return out
+
+    def areas(self):
+        """Площади многоугольников по формуле шнурков (только '2D')."""
+        if self.ndim != 2:
+            raise ValueError("Площадь определена только для 2D-разметки.")
+        out = np.zeros(len(self), dtype=np.float64)
+        starts, nonempty = self._starts()
+        if not len(starts):
+            return out
+        x = self.coords[:, 0].astype(np.float64)
+        y = self.coords[:, 1].astype(np.float64)
+        nxt = np.arange(1, len(x) + 1)
+        ends = self.offsets[1:][nonempty]
+        nxt[ends - 1] = starts  # последняя точка замыкается на первую
+        cross = x * y[nxt] - x[nxt] * y
+        out[nonempty] = 0.5 * np.abs(np.add.reduceat(cross, starts))
+        return out
+
+    def volumes(self):
+        """Объёмы ограничивающих параллелепипедов (для '3D') или площади рамок (для '2D')."""
+        b = self.bboxes()
+        return np.prod(b[:, self.ndim:] - b[:, :self.ndim], axis=1)
+
+    def scaled(self, *factors):
+        """Новая геометрия с координатами, умноженными на factors по осям."""
+        if len(factors) not in (1, self.ndim):
+            raise ValueError(f"Нужен один множитель или {self.ndim} (по осям), получено {len(factors)}.")
+        geometry = FileGeometry((), self.dims)
+        geometry.labels = list(self.labels)
+        geometry.errors = dict(self.errors)
+        geometry._raw = None
+        geometry._coords = self.coords * np.asarray(factors, dtype=np.float64)
+        geometry._offsets = self.offsets.copy()
+        return geometry
+
+    def spatial_index(self, cell=None):
+        """Сетка по рамкам объектов для запросов по области (см. utils/parse/spatial.py); строится один раз."""
+        if self._index is None or cell is not None:
+            from utils.parse.spatial import GridIndex
+            self._index = GridIndex(self, cell)
+        return self._index
+
+    def _size(self, size):
+        if len(size) != self.ndim:
+            raise ValueError(f"Нужен размер по каждой из {self.ndim} осей, получено {len(size)}.")
+        return [float(x) for x in size]
+
+    def normalized(self, *size):
+        """Координаты в долях размера по осям: (ширина, высота) для '2D', (x, y, z) для '3D'."""
+        return self.scaled(*(1 / x for x in self._size(size)))
+
+    def denormalized(self, *size):
+        """Обратное к normalized: доли -> пиксели (единицы облака)."""
+        return self.scaled(*self._size(size))
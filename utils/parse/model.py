@@ -1,4 +1,7 @@
+from collections import OrderedDict, namedtuple
 import xml.etree.ElementTree as ET
+import json
+import os
 import pathlib
 
 class MarkupLabel:
@@ -28,10 +31,10 @@ class ModelInit:
 
         
 class ModelTrain:
-    epochs: list[MarkupEpoch] = list()
-    defaultEpoch: MarkupEpoch = None
 
     def __init__(self, element: ET.Element):
+        self.epochs: list[MarkupEpoch] = list()
+        self.defaultEpoch: MarkupEpoch = None
         savedEpochs = element.find('savedEpochs')
         for epoch in savedEpochs:
             epoch = MarkupEpoch(epoch)
@@ -54,3 +57,104 @@ class MarkupModel:
         self.init:ModelInit = ModelInit(element.find('init'))
         self.train:ModelTrain = ModelTrain(element.find('train'))
 
+
+ModelEntry = namedtuple('ModelEntry', 'path name dims architecture default_epoch')
+
+
+def read_entry(path) -> ModelEntry:
+    """Читает только атрибуты для списка моделей, не строя полное дерево."""
+    root = architecture = default_epoch = None
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == 'architecture':
+            architecture = elem.get('value')
+        elif elem.get('epochPath') is not None:
+            if elem.get('default') == 'True':
+                default_epoch = str(elem.get('number'))
+        elif elem.tag == 'labels':
+            elem.clear()
+    return ModelEntry(str(path), root.get('modelName'), root.get('dims'), architecture, default_epoch)
+
+
+class ModelRegistry:
+    """Каталог моделей: список по лёгкому индексу и LRU-кэш разобранных MarkupModel.
+
+    Кэш хранит для пути модель вместе с (mtime, размер) файла: если файл изменился,
+    модель разбирается заново и заменяет старую. Индекс сохраняется в INDEX_FILE
+    в каталоге и при следующем запуске переиспользуется для неизменённых файлов.
+    Файлы, которые не удалось прочитать при сканировании (удалены, нет доступа,
+    битый XML), пропускаются.
+    """
+
+    INDEX_FILE = '.models_index.json'
+
+    def __init__(self, directory, maxsize=32, pattern='*.xml'):
+        self.directory = pathlib.Path(directory)
+        self.maxsize = maxsize
+        self.pattern = pattern
+        self._models = OrderedDict()  # путь -> ((mtime, размер), MarkupModel)
+        self._entries = dict()  # путь -> (mtime, размер, ModelEntry)
+        self._load_index()
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load_index(self):
+        try:
+            with open(self.directory / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                for path, mtime, size, entry in json.load(f):
+                    self._entries[path] = (mtime, size, ModelEntry(*entry))
+        except (OSError, ValueError, TypeError):
+            self._entries = dict()
+
+    def _save_index(self):
+        rows = [[path, mtime, size, list(entry)] for path, (mtime, size, entry) in self._entries.items()]
+        try:
+            with open(self.directory / self.INDEX_FILE, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False)
+        except OSError:
+            pass  # индекс — только ускорение
+
+    def scan(self) -> list[ModelEntry]:
+        """Список моделей каталога; разбираются только новые и изменённые файлы."""
+        entries = dict()
+        changed = False
+        for path in sorted(self.directory.glob(self.pattern)):
+            key = str(path)
+            try:
+                mtime, size = self._stamp(path)
+                cached = self._entries.get(key)
+                if cached is not None and cached[:2] == (mtime, size):
+                    entries[key] = cached
+                    continue
+                entries[key] = (mtime, size, read_entry(path))
+            except (OSError, ET.ParseError):
+                continue
+            changed = True
+        if changed or entries.keys() != self._entries.keys():
+            self._entries = entries
+            self._save_index()
+        return [entry for _, _, entry in self._entries.values()]
+
+    def get(self, path) -> MarkupModel:
+        """Разобранная модель из кэша или с диска; вытесняет давно не использованные модели."""
+        path = str(path)
+        stamp = self._stamp(path)
+        cached = self._models.get(path)
+        if cached is not None and cached[0] == stamp:
+            self._models.move_to_end(path)
+            return cached[1]
+        model = MarkupModel(path)
+        self._models[path] = (stamp, model)
+        self._models.move_to_end(path)
+        if len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        self._models.clear()
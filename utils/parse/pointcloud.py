@@ -0,0 +1,133 @@
+from collections import OrderedDict
+import os.path
+
+import numpy as np
+
+# Доступ к облакам точек 3D-разметки через отображение файлов в память:
+# точки не читаются целиком, массивы — представления поверх np.memmap.
+# Поддерживаются сырые .bin (float32, FIELDS значений на точку, как в KITTI),
+# .npy и бинарные .pcd с полями одного типа.
+FIELDS = 4
+CHUNK = 1 << 20  # точек за один проход
+
+_PCD_TYPES = {('F', 4): np.float32, ('F', 8): np.float64,
+              ('I', 1): np.int8, ('I', 2): np.int16, ('I', 4): np.int32, ('I', 8): np.int64,
+              ('U', 1): np.uint8, ('U', 2): np.uint16, ('U', 4): np.uint32, ('U', 8): np.uint64}
+
+
+def _open_pcd(path):
+    header = {}
+    with open(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{path}: нет строки DATA в заголовке PCD")
+            parts = line.decode('ascii', 'replace').split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            header[parts[0].upper()] = parts[1:]
+            if parts[0].upper() == 'DATA':
+                offset = f.tell()
+                break
+    if header['DATA'][0] != 'binary':
+        raise ValueError(f"{path}: поддерживается только DATA binary")
+    types = {(t, int(s)) for t, s in zip(header['TYPE'], header['SIZE'])}
+    if len(types) != 1:
+        raise ValueError(f"{path}: поля разных типов не поддерживаются")
+    dtype = _PCD_TYPES[types.pop()]
+    width = sum(int(c) for c in header.get('COUNT', ['1'] * len(header['FIELDS'])))
+    points = int(header['POINTS'][0])
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(points, width))
+
+
+class PointCloud:
+
+    def __init__(self, path, fields=FIELDS, dtype=np.float32):
+        self.path = path
+        self.fields = fields
+        self.dtype = dtype
+        self._points = None
+        self._bounds = None
+
+    @property
+    def points(self):
+        """Все точки (N x поля) без чтения файла: страницы подгружаются ОС по обращению."""
+        if self._points is None:
+            ext = os.path.splitext(self.path)[1].lower()
+            if ext == '.npy':
+                self._points = np.load(self.path, mmap_mode='r')
+            elif ext == '.pcd':
+                self._points = _open_pcd(self.path)
+            else:
+                self._points = np.memmap(self.path, dtype=self.dtype, mode='r').reshape(-1, self.fields)
+        return self._points
+
+    @property
+    def xyz(self):
+        return self.points[:, :3]
+
+    def __len__(self):
+        return len(self.points)
+
+    def chunks(self, size=CHUNK):
+        """Итерация по кускам из size точек — для облаков больше оперативной памяти."""
+        points = self.points
+        for start in range(0, len(points), size):
+            yield points[start:start + size]
+
+    def bounds(self):
+        """(минимум xyz, максимум xyz); считается один раз проходом по кускам."""
+        if self._bounds is None:
+            lo = np.full(3, np.inf)
+            hi = np.full(3, -np.inf)
+            for chunk in self.chunks():
+                xyz = chunk[:, :3]
+                lo = np.minimum(lo, xyz.min(axis=0))
+                hi = np.maximum(hi, xyz.max(axis=0))
+            self._bounds = (lo, hi)
+        return self._bounds
+
+    def crop(self, lo, hi, size=CHUNK):
+        """Точки внутри рамки [lo, hi]; в памяти одновременно только один кусок файла."""
+        parts = []
+        for chunk in self.chunks(size):
+            xyz = chunk[:, :3]
+            mask = (xyz >= lo).all(axis=1) & (xyz <= hi).all(axis=1)
+            parts.append(np.asarray(chunk[mask]))
+        return np.concatenate(parts) if parts else np.empty((0, self.points.shape[1]), self.points.dtype)
+
+    def close(self):
+        self._points = None
+
+
+class PointCloudStore:
+    """Открытые облака точек по файлам реестра; держит не больше maxsize отображений."""
+
+    def __init__(self, maxsize=16, fields=FIELDS, dtype=np.float32):
+        self.maxsize = maxsize
+        self.fields = fields
+        self.dtype = dtype
+        self._clouds = OrderedDict()
+        self._bounds = dict()
+
+    def get(self, file):
+        path = getattr(file, 'path', file)
+        cloud = self._clouds.get(path)
+        if cloud is not None:
+            self._clouds.move_to_end(path)
+            return cloud
+        cloud = PointCloud(path, self.fields, self.dtype)
+        if path in self._bounds:
+            cloud._bounds = self._bounds[path]
+        self._clouds[path] = cloud
+        if len(self._clouds) > self.maxsize:
+            _, old = self._clouds.popitem(last=False)
+            old.close()
+        return cloud
+
+    def bounds(self, file):
+        """Границы облака; запоминаются и после закрытия отображения."""
+        path = getattr(file, 'path', file)
+        if path not in self._bounds:
+            self._bounds[path] = self.get(path).bounds()
+        return self._bounds[path]
@@ -0,0 +1,147 @@
+import itertools
+import math
+
+import numpy as np
+
+# Объект, рамка которого накрывает больше ячеек, в сетку не заносится, а проверяется
+# при каждом запросе (как большой фоновый многоугольник).
+MAX_CELLS_PER_OBJECT = 64
+# При таком числе объектов и меньше запросы — простой перебор.
+BRUTE_FORCE = 32
+
+
+class GridIndex:
+    """Равномерная сетка по ограничивающим рамкам объектов одного файла (2D или 3D).
+
+    Объект попадает во все ячейки, которые пересекает его рамка; запросы
+    просматривают только ячейки вокруг области запроса.
+    """
+
+    def __init__(self, geometry, cell=None):
+        self.ndim = geometry.ndim
+        boxes = geometry.bboxes().astype(np.float64)
+        self.valid = ~np.isnan(boxes).any(axis=1)
+        self.lo = boxes[:, :self.ndim]
+        self.hi = boxes[:, self.ndim:]
+
+        if cell is None:
+            cell = self._default_cell()
+        self.cell = np.broadcast_to(np.asarray(cell, dtype=np.float64), (self.ndim,)).copy()
+
+        self.cells = dict()
+        self.ids = np.flatnonzero(self.valid)
+        large = []
+        if len(self.ids):
+            first = np.floor(self.lo[self.ids] / self.cell).astype(np.int64)
+            last = np.floor(self.hi[self.ids] / self.cell).astype(np.int64)
+            covered = np.prod(last - first + 1, axis=1)
+            small = covered <= MAX_CELLS_PER_OBJECT
+            large = self.ids[~small]
+            if small.any():
+                self.min_cell = first[small].min(axis=0)
+                self.max_cell = last[small].max(axis=0)
+            else:
+                self.min_cell = self.max_cell = np.zeros(self.ndim, dtype=np.int64)
+            for i, a, b in zip(self.ids[small], first[small], last[small]):
+                for key in itertools.product(*(range(x, y + 1) for x, y in zip(a, b))):
+                    self.cells.setdefault(key, []).append(i)
+        else:
+            self.min_cell = self.max_cell = np.zeros(self.ndim, dtype=np.int64)
+        self.large = np.asarray(large, dtype=np.int64)
+
+    def _default_cell(self):
+        """Медианный размер рамки: в среднем объект занимает несколько ячеек."""
+        if not self.valid.any():
+            return 1.0
+        extent = np.median(self.hi[self.valid] - self.lo[self.valid], axis=0)
+        return np.where(extent > 0, extent, 1.0)
+
+    def _candidates(self, keys):
+        found = set()
+        for key in keys:
+            found.update(self.cells.get(key, ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def intersecting(self, lo, hi):
+        """Индексы объектов, рамки которых пересекают рамку [lo, hi]."""
+        lo = np.asarray(lo, dtype=np.float64)
+        hi = np.asarray(hi, dtype=np.float64)
+        if len(self.ids) <= BRUTE_FORCE:
+            ids = self.ids
+        else:
+            a = np.maximum(np.floor(lo / self.cell).astype(np.int64), self.min_cell)
+            b = np.minimum(np.floor(hi / self.cell).astype(np.int64), self.max_cell)
+            ids = self.large
+            if self.cells and not (a > b).any():
+                ids = np.concatenate([
+                    self._candidates(itertools.product(*(range(x, y + 1) for x, y in zip(a, b)))), ids
+                ])
+        hit = (self.lo[ids] <= hi).all(axis=1) & (self.hi[ids] >= lo).all(axis=1)
+        return np.sort(ids[hit])
+
+    def _distance(self, ids, point):
+        d = np.maximum(self.lo[ids] - point, 0) + np.maximum(point - self.hi[ids], 0)
+        return np.sqrt((d ** 2).sum(axis=1))
+
+    def _shell(self, center, r):
+        """Занятые ячейки сетки на расстоянии ровно r (по Чебышёву) от center.
+
+        Перебирается только оболочка куба, обрезанная по [min_cell, max_cell]: для оси k
+        координата равна c ± r, по предыдущим осям строго внутри, по следующим — весь отрезок.
+        """
+        lo = [int(x) for x in self.min_cell]
+        hi = [int(x) for x in self.max_cell]
+        if r == 0:
+            if all(l <= c <= h for c, l, h in zip(center, lo, hi)):
+                yield tuple(center)
+            return
+        for k in range(self.ndim):
+            ranges = []
+            for axis, c in enumerate(center):
+                if axis < k:
+                    a, b = c - r + 1, c + r - 1
+                elif axis > k:
+                    a, b = c - r, c + r
+                else:
+                    ranges.append([x for x in (c - r, c + r) if lo[axis] <= x <= hi[axis]])
+                    continue
+                ranges.append(range(max(a, lo[axis]), min(b, hi[axis]) + 1))
+            yield from itertools.product(*ranges)
+
+    def _brute(self, ids, point):
+        if not len(ids):
+            return None, math.inf
+        dist = self._distance(ids, point)
+        i = dist.argmin()  # при равенстве — меньший индекс (ids отсортированы)
+        return int(ids[i]), float(dist[i])
+
+    def nearest(self, point):
+        """(индекс, расстояние) ближайшего по рамке объекта или (None, inf), если объектов нет."""
+        point = np.asarray(point, dtype=np.float64)
+        if len(self.ids) <= BRUTE_FORCE or not self.cells:
+            return self._brute(self.ids, point)
+
+        best, best_dist = self._brute(self.large, point)
+        center = tuple(int(x) for x in np.floor(point / self.cell))
+        # Ближе этого кольца занятых ячеек нет, дальше limit — тоже.
+        gap = np.maximum(self.min_cell - center, 0) + np.maximum(np.asarray(center) - self.max_cell, 0)
+        start = int(gap.max())
+        limit = int(max(
+            np.abs(np.asarray(center) - self.min_cell).max(),
+            np.abs(np.asarray(center) - self.max_cell).max()
+        ))
+        step = self.cell.min()
+        # Любой объект из кольца r не ближе (r - 1) * step.
+        if best is not None and best_dist <= (start - 1) * step:
+            return best, best_dist
+        for r in range(start, limit + 1):
+            ids = self._candidates(self._shell(center, r))
+            if len(ids):
+                dist = self._distance(ids, point)
+                d = dist.min()
+                i = int(ids[dist == d].min())
+                if d < best_dist or (d == best_dist and i < best):
+                    best, best_dist = i, float(d)
+            if best is not None and best_dist <= r * step:
+                break
+        return best, best_dist
@@ -0,0 +1,229 @@
+import json
+import hashlib
+import os
+import sys
+import zlib
+
+# Матрица доступа, разбитая на шарды. Каталог вида
+#
+#     access_matrix.d/
+#         manifest.json   — объекты, число субъектов и шардов, версии и контрольные суммы шардов
+#         shard-007.json  — {"subjects": {субъект: [порядковый номер, [объекты]]}}
+#
+# Субъект попадает в шард crc32(имя) % shards. Сохранение пишет только шарды
+# с изменившимися субъектами и затем манифест (оба — через временный файл и os.replace),
+# а клиент пользователя перечитывает только шард своего субъекта, если изменилась его версия.
+# Если известны изменённые строки (changes), остальные шарды не читаются и не сравниваются.
+MANIFEST = "manifest.json"
+SHARDS = 16
+RETRIES = 3
+
+
+def shard_of(subject, shards):
+    return zlib.crc32(subject.encode("utf-8")) % shards
+
+
+def _write(path, payload):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _dump(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ShardedMatrix:
+    """Хранилище одного каталога; помнит прочитанные шарды и их версии."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = None
+        self._shards = dict()  # номер -> (версия, {субъект: [seq, объекты]})
+
+    def shard_path(self, i):
+        return os.path.join(self.directory, f"shard-{i:03d}.json")
+
+    # --- Чтение ---
+    def read_manifest(self):
+        with open(os.path.join(self.directory, MANIFEST), "rb") as f:
+            self.manifest = json.loads(f.read())
+        return self.manifest
+
+    def _read_shard(self, i):
+        version = self.manifest["versions"][i]
+        cached = self._shards.get(i)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            with open(self.shard_path(i), "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = None
+        checksum = self.manifest["checksums"][i]
+        if raw is None and checksum is None:
+            subjects = dict()
+        elif raw is not None and hashlib.sha1(raw).hexdigest() == checksum:
+            subjects = json.loads(raw)["subjects"]
+        else:
+            # Шард уже заменён, а манифест ещё нет (или наоборот): перечитаем манифест.
+            raise _Stale(i)
+        self._shards[i] = (version, subjects)
+        return subjects
+
+    def _consistent(self, read):
+        for attempt in range(RETRIES):
+            self.read_manifest()
+            try:
+                return read()
+            except _Stale as e:
+                stale = e
+        raise ValueError(f"Шард {stale.args[0]} не совпадает с манифестом {self.directory}.")
+
+    def load(self):
+        """Вся матрица в формате access_matrix.json, субъекты в исходном порядке."""
+        def read():
+            rows = []
+            for i in range(self.manifest["shards"]):
+                rows.extend(self._read_shard(i).items())
+            rows.sort(key=lambda row: row[1][0])
+            return {
+                "objects": list(self.manifest["objects"]),
+                "subjects": {s: list(objs) for s, (_, objs) in rows},
+            }
+        return self._consistent(read)
+
+    def load_subject(self, subject):
+        """Объекты и только строка subject (если есть); читается манифест и один шард."""
+        def read():
+            rows = self._read_shard(shard_of(subject, self.manifest["shards"]))
+            subjects = {subject: list(rows[subject][1])} if subject in rows else {}
+            return {"objects": list(self.manifest["objects"]), "subjects": subjects}
+        return self._consistent(read)
+
+    # --- Запись ---
+    def save(self, data, shards=SHARDS, changes=None):
+        """Пишет шарды, в которых изменились субъекты, и манифест; возвращает номера записанных шардов.
+
+        changes — {субъект: (права до или None, права после или None)} с прошлого сохранения
+        (MatrixDiff.subjects): тогда читаются и пишутся только шарды этих субъектов, а вся
+        матрица не перебирается. Без changes (или если каталога ещё нет) data сравнивается
+        с шардами целиком.
+        """
+        if changes is not None and os.path.exists(os.path.join(self.directory, MANIFEST)):
+            try:
+                return self._consistent(lambda: self._save_changes(data, changes))
+            except ValueError:
+                pass  # шарды не сходятся с манифестом: сохраняем целиком
+        return self._save_all(data, shards)
+
+    def _save_changes(self, data, changes):
+        manifest = self.manifest
+        count = manifest["shards"]
+        dirty = dict()
+        for s in changes:
+            i = shard_of(s, count)
+            if i not in dirty:
+                dirty[i] = {row: [seq, list(objs)] for row, (seq, objs) in self._read_shard(i).items()}
+
+        # Новые субъекты получают номера в порядке data, как при полном сохранении.
+        next_seq = manifest["next_seq"]
+        added = [s for s, (old, new) in changes.items() if new is not None and s not in dirty[shard_of(s, count)]]
+        if len(added) > 1:
+            position = {s: i for i, s in enumerate(data["subjects"]) if s in changes}
+            added.sort(key=lambda s: position.get(s, len(position)))
+        for s in added:
+            dirty[shard_of(s, count)][s] = [next_seq, []]
+            next_seq += 1
+        for s, (_, new) in changes.items():
+            rows = dirty[shard_of(s, count)]
+            if new is None:
+                rows.pop(s, None)
+            else:
+                rows[s][1] = list(new)
+
+        written = [i for i, rows in sorted(dirty.items()) if self._write_shard(i, rows)]
+        self._write_manifest(data, written, next_seq)
+        return written
+
+    def _save_all(self, data, shards):
+        if os.path.exists(os.path.join(self.directory, MANIFEST)):
+            self.load()  # перечитываются только шарды с новыми версиями
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            self.manifest = {
+                "version": 0, "shards": shards, "objects": [], "next_seq": 0,
+                "versions": [0] * shards, "checksums": [None] * shards,
+            }
+        manifest = self.manifest
+        count = manifest["shards"]
+
+        # Порядковые номера: у существующих субъектов сохраняются, новые — в конец.
+        seqs = dict()
+        for _, rows in self._shards.values():
+            for s, (seq, _) in rows.items():
+                seqs[s] = seq
+        next_seq = manifest["next_seq"]
+        parts = [dict() for _ in range(count)]
+        for s, objs in data["subjects"].items():
+            seq = seqs.get(s)
+            if seq is None:
+                seq = next_seq
+                next_seq += 1
+            parts[shard_of(s, count)][s] = [seq, list(objs)]
+
+        written = [i for i, rows in enumerate(parts) if self._write_shard(i, rows)]
+        self._write_manifest(data, written, next_seq)
+        return written
+
+    def _write_shard(self, i, rows):
+        """Пишет шард, если его строки изменились; возвращает True, если записан."""
+        manifest = self.manifest
+        cached = self._shards.get(i)
+        if cached is not None and cached[1] == rows:
+            return False
+        if cached is None and not rows and manifest["checksums"][i] is None:
+            return False
+        raw = _dump({"subjects": rows})
+        _write(self.shard_path(i), raw)
+        manifest["versions"][i] += 1
+        manifest["checksums"][i] = hashlib.sha1(raw).hexdigest()
+        self._shards[i] = (manifest["versions"][i], rows)
+        return True
+
+    def _write_manifest(self, data, written, next_seq):
+        manifest = self.manifest
+        objects = list(data["objects"])
+        subjects = len(data["subjects"])
+        if (written or objects != manifest["objects"] or next_seq != manifest["next_seq"]
+                or subjects != manifest.get("subjects")):
+            manifest["objects"] = objects
+            manifest["subjects"] = subjects
+            manifest["next_seq"] = next_seq
+            manifest["version"] += 1
+            _write(os.path.join(self.directory, MANIFEST), _dump(manifest))
+
+
+class _Stale(Exception):
+    pass
+
+
+def main(argv=None):
+    """python -m utils.shards access_matrix.json access_matrix.d [шардов] — перевод JSON в шарды."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (2, 3):
+        print(main.__doc__)
+        return 2
+    source, target = argv[:2]
+    with open(source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data.setdefault("objects", [])
+    data.setdefault("subjects", {})
+    written = ShardedMatrix(target).save(data, int(argv[2]) if len(argv) == 3 else SHARDS)
+    print(f"{target}: записано шардов {len(written)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
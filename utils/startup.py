@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Профилирование запуска: время импорта каждого модуля (как -X importtime)
+# и фаз инициализации, отчёт в JSON. Включается переменной окружения:
+#
+#     MBKS_PROFILE_STARTUP=startup.json python _user.py
+ENV_VAR = "MBKS_PROFILE_STARTUP"
+
+
+class StartupProfiler:
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.t0 = time.perf_counter()
+        self.imports = []  # (порядок завершения) name, depth, self, cumulative
+        self.phases = []
+        self._local = threading.local()  # стек вложенных импортов у каждого потока свой
+
+    # --- Импорт ---
+    def find_spec(self, name, path=None, target=None):
+        # sys.meta_path не меняется (его читают импорты в других потоках): себя просто пропускаем.
+        for finder in list(sys.meta_path):
+            if finder is self:
+                continue
+            find = getattr(finder, "find_spec", None)
+            spec = find(name, path, target) if find else None
+            if spec is not None:
+                self._wrap(spec.loader)
+                return spec
+        return None
+
+    def _wrap(self, loader):
+        """Замеряет ближайший exec_module загрузчика; сам загрузчик (module.__loader__) остаётся прежним.
+
+        Обёртка ставится атрибутом экземпляра и снимается при вызове. Загрузчики-классы
+        (BuiltinImporter, FrozenImporter) общие для всех модулей и не оборачиваются.
+        """
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "__dict__") \
+                or not hasattr(loader, "exec_module"):
+            return
+        # Обёртка, оставшаяся от find_spec без последующей загрузки, снимается.
+        previous = loader.__dict__.get("exec_module")
+        while hasattr(previous, "_previous"):
+            previous = previous._previous
+        self._restore(loader, previous)
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            self._restore(loader, previous)
+            with self.importing(module.__name__):
+                exec_module(module)
+
+        timed_exec_module._previous = previous
+        loader.exec_module = timed_exec_module
+
+    @staticmethod
+    def _restore(loader, previous):
+        if previous is None:
+            loader.__dict__.pop("exec_module", None)
+        else:
+            loader.exec_module = previous
+
+    @contextmanager
+    def importing(self, name):
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = [name, 0.0]  # имя, время вложенных импортов
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += total
+            self.imports.append({
+                "module": name,
+                "depth": len(stack),
+                "self_us": round((total - frame[1]) * 1e6),
+                "cumulative_us": round(total * 1e6),
+            })
+
+    # --- Фазы ---
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, start)
+
+    def mark(self, name, start=None):
+        now = time.perf_counter()
+        self.phases.append({
+            "phase": name,
+            "start_ms": round(((start or now) - self.t0) * 1e3, 3),
+            "duration_ms": round((now - (start or now)) * 1e3, 3),
+        })
+
+    def start(self, path):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.path = path
+        sys.meta_path.insert(0, self)
+
+    def start_from_env(self):
+        path = os.environ.get(ENV_VAR)
+        if path:
+            self.start(path)
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def first_window(self, app):
+        """Отмечает момент, когда окно впервые отрисовано, и записывает отчёт."""
+        if not self.enabled:
+            return
+
+        def shown():
+            self.mark("first_window")
+            self.stop()
+            self.write()
+
+        app.after_idle(lambda: app.after(0, shown))
+
+    def report(self):
+        top = sorted(self.imports, key=lambda r: r["cumulative_us"], reverse=True)
+        return {
+            "time_to_first_window_ms": next(
+                (p["start_ms"] for p in self.phases if p["phase"] == "first_window"), None
+            ),
+            "import_total_us": sum(r["self_us"] for r in self.imports),
+            "phases": self.phases,
+            "top_imports": [r for r in top if r["depth"] == 0][:20],
+            "imports": self.imports,
+        }
+
+    def write(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,325 @@
+import json
+import os
+import sqlite3
+
+from utils import shards
+
+# Хранилища матрицы доступа под load_matrix/save_matrix. Вид задаётся явно (kind)
+# или выбирается по пути:
+#   существующий каталог или *.d — шарды (utils/shards.py);
+#   *.db, *.sqlite, *.sqlite3     — SQLite;
+#   иначе                         — один файл JSON (access_matrix.json).
+# Все хранилища отдают и принимают матрицу в формате {"objects": [...], "subjects": {...}}.
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SHARDED_SUFFIX = ".d"
+KINDS = ("json", "sharded", "sqlite")
+
+
+class Storage:
+
+    kind = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, data, changes=None):
+        """changes — {субъект: (права до или None, права после или None)} с прошлого сохранения
+        (MatrixDiff.subjects); хранилище может записать только их. None — сохранить всё."""
+        raise NotImplementedError
+
+    def load_subject(self, subject):
+        """Матрица, в которой достаточно строки subject; по умолчанию — вся матрица."""
+        return self.load()
+
+    def stamp(self):
+        """Значение, которое меняется при каждом сохранении (для опроса изменений)."""
+        raise NotImplementedError
+
+    def counts(self):
+        """(число субъектов, число объектов) во всём хранилище."""
+        data = self.load()
+        return len(data.get("subjects", {})), len(data.get("objects", []))
+
+    def close(self):
+        pass
+
+
+class JsonStorage(Storage):
+
+    kind = "json"
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, data, changes=None):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def stamp(self):
+        return os.path.getmtime(self.path)
+
+
+class ShardedStorage(Storage):
+
+    kind = "sharded"
+
+    def __init__(self, path):
+        self.matrix = shards.ShardedMatrix(path)
+
+    def load(self):
+        return self.matrix.load()
+
+    def save(self, data, changes=None):
+        self.matrix.save(data, changes=changes)  # только шарды изменённых субъектов
+
+    def load_subject(self, subject):
+        return self.matrix.load_subject(subject)
+
+    def stamp(self):
+        return os.path.getmtime(os.path.join(self.matrix.directory, shards.MANIFEST))
+
+    def counts(self):
+        manifest = self.matrix.read_manifest()
+        if "subjects" not in manifest:  # манифест старой версии
+            return super().counts()
+        return manifest["subjects"], len(manifest["objects"])
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    seq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    seq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grants (
+    subject INTEGER NOT NULL REFERENCES subjects(id) ON DELETE CASCADE,
+    object INTEGER NOT NULL REFERENCES objects(id) ON DELETE CASCADE,
+    PRIMARY KEY (subject, object)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grants_object ON grants(object, subject);
+CREATE INDEX IF NOT EXISTS subjects_seq ON subjects(seq);
+CREATE INDEX IF NOT EXISTS objects_seq ON objects(seq);
+"""
+
+# Параметризованные запросы: sqlite3 кэширует их подготовленными, executemany выполняет пакетом.
+GRANT = """INSERT OR IGNORE INTO grants (subject, object)
+    SELECT s.id, o.id FROM subjects s, objects o WHERE s.name = ? AND o.name = ?"""
+REVOKE = """DELETE FROM grants
+    WHERE subject = (SELECT id FROM subjects WHERE name = ?)
+      AND object = (SELECT id FROM objects WHERE name = ?)"""
+GRANT_ALL = """INSERT OR IGNORE INTO grants (subject, object)
+    SELECT s.id, o.id FROM subjects s, objects o WHERE s.name = ?"""
+REVOKE_ALL = "DELETE FROM grants WHERE subject = (SELECT id FROM subjects WHERE name = ?)"
+RIGHTS = """SELECT o.name FROM subjects s
+    JOIN grants g ON g.subject = s.id
+    JOIN objects o ON o.id = g.object
+    WHERE s.name = ? ORDER BY o.seq"""
+
+
+class SqliteStorage(Storage):
+    """Нормализованная матрица в SQLite (WAL: пользователи читают, пока администратор пишет).
+
+    save() с changes пишет только изменённые строки, без чтения таблицы прав; без changes
+    сравнивает всю матрицу с базой. grant/remove/grant_all/remove_all меняют права напрямую,
+    без загрузки всей матрицы.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.executescript(SCHEMA)
+
+    def _transaction(self, write=False):
+        return _Transaction(self.db, write)
+
+    def load(self):
+        with self._transaction():
+            objects = [name for name, in self.db.execute("SELECT name FROM objects ORDER BY seq")]
+            subjects = {name: [] for name, in self.db.execute("SELECT name FROM subjects ORDER BY seq")}
+            rows = self.db.execute("""SELECT s.name, o.name FROM grants g
+                JOIN subjects s ON s.id = g.subject JOIN objects o ON o.id = g.object ORDER BY o.seq""")
+            for s, o in rows:
+                subjects[s].append(o)
+        return {"objects": objects, "subjects": subjects}
+
+    def rights(self, subject):
+        """Права одного субъекта (по индексу) или None, если субъекта нет."""
+        rights = [o for o, in self.db.execute(RIGHTS, (subject,))]
+        if not rights and self.db.execute("SELECT 1 FROM subjects WHERE name = ?", (subject,)).fetchone() is None:
+            return None
+        return rights
+
+    def load_subject(self, subject):
+        with self._transaction():
+            objects = [name for name, in self.db.execute("SELECT name FROM objects ORDER BY seq")]
+            rights = self.rights(subject)
+        return {"objects": objects, "subjects": {} if rights is None else {subject: rights}}
+
+    def _order(self, table, names):
+        """Добавляет новые имена и выставляет seq по порядку names; удаляет отсутствующие."""
+        current = dict(self.db.execute(f"SELECT name, seq FROM {table}"))
+        wanted = {name: i for i, name in enumerate(names)}
+        self.db.executemany(f"DELETE FROM {table} WHERE name = ?", [(n,) for n in current if n not in wanted])
+        self.db.executemany(
+            f"INSERT INTO {table} (name, seq) VALUES (?, ?)",
+            [(n, i) for n, i in wanted.items() if n not in current]
+        )
+        self.db.executemany(
+            f"UPDATE {table} SET seq = ? WHERE name = ?",
+            [(i, n) for n, i in wanted.items() if n in current and current[n] != i]
+        )
+
+    def save(self, data, changes=None):
+        objects = list(dict.fromkeys(data["objects"]))
+        rows = data["subjects"].items() if changes is None else (
+            (s, new) for s, (_, new) in changes.items() if new is not None
+        )
+        known = set(objects)
+        missing = sorted({o for _, objs in rows for o in objs if o not in known})
+        if missing:
+            raise ValueError(f"Права на объекты, которых нет в списке объектов: {', '.join(missing)}.")
+
+        with self._transaction(write=True):
+            self._order("objects", objects)
+            if changes is None:
+                self._order("subjects", list(data["subjects"]))
+                current = set(self.db.execute("""SELECT s.name, o.name FROM grants g
+                    JOIN subjects s ON s.id = g.subject JOIN objects o ON o.id = g.object"""))
+                wanted = {(s, o) for s, objs in data["subjects"].items() for o in objs}
+                self.db.executemany(REVOKE, current - wanted)
+                self.db.executemany(GRANT, wanted - current)
+                return
+            if any(old is None or new is None for old, new in changes.values()):
+                self._order("subjects", list(data["subjects"]))
+            revoke, grant = [], []
+            for s, (old, new) in changes.items():
+                old, new = set(old or ()), set(new or ())
+                revoke.extend((s, o) for o in old - new)
+                grant.extend((s, o) for o in new - old)
+            self.db.executemany(REVOKE, revoke)
+            self.db.executemany(GRANT, grant)
+
+    # --- Команды без загрузки всей матрицы ---
+    def _check(self, subjects_list):
+        if not subjects_list:
+            raise ValueError("Не указаны субъекты.")
+        for s in subjects_list:
+            if self.db.execute("SELECT 1 FROM subjects WHERE name = ?", (s,)).fetchone() is None:
+                raise ValueError(f"Субъект '{s}' не существует.")
+
+    def create(self, subject, objects_list):
+        with self._transaction(write=True):
+            (seq,), = self.db.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM subjects")
+            self.db.execute("INSERT OR IGNORE INTO subjects (name, seq) VALUES (?, ?)", (subject, seq))
+            self._add_objects(objects_list)
+            self.db.executemany(GRANT, [(subject, o) for o in objects_list])
+
+    def _add_objects(self, objects_list):
+        (seq,), = self.db.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM objects")
+        self.db.executemany(
+            "INSERT OR IGNORE INTO objects (name, seq) VALUES (?, ?)",
+            [(o, seq + i) for i, o in enumerate(objects_list)]
+        )
+
+    def grant(self, subjects_list, objects_list):
+        with self._transaction(write=True):
+            self._check(subjects_list)
+            self._add_objects(objects_list)
+            self.db.executemany(GRANT, [(s, o) for s in subjects_list for o in objects_list])
+
+    def remove(self, subjects_list, objects_list):
+        with self._transaction(write=True):
+            self._check(subjects_list)
+            self.db.executemany(REVOKE, [(s, o) for s in subjects_list for o in objects_list])
+
+    def grant_all(self, subjects_list):
+        with self._transaction(write=True):
+            self._check(subjects_list)
+            self.db.executemany(GRANT_ALL, [(s,) for s in subjects_list])
+
+    def remove_all(self, subjects_list):
+        with self._transaction(write=True):
+            self._check(subjects_list)
+            self.db.executemany(REVOKE_ALL, [(s,) for s in subjects_list])
+
+    def counts(self):
+        with self._transaction():
+            (subjects,), = self.db.execute("SELECT COUNT(*) FROM subjects")
+            (objects,), = self.db.execute("SELECT COUNT(*) FROM objects")
+        return subjects, objects
+
+    def stamp(self):
+        # data_version меняется, когда базу изменило другое соединение (в том числе в WAL,
+        # где mtime основного файла не меняется до checkpoint).
+        (version,), = self.db.execute("PRAGMA data_version")
+        return (os.path.getmtime(self.path), version)
+
+    def close(self):
+        self.db.close()
+
+
+class _Transaction:
+    """BEGIN (IMMEDIATE для записи) ... COMMIT / ROLLBACK при исключении."""
+
+    def __init__(self, db, write=False):
+        self.db = db
+        self.write = write
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE" if self.write else "BEGIN")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+_storages = dict()
+
+
+def kind_of(path):
+    """Вид хранилища по пути (см. начало модуля)."""
+    if os.path.isdir(path) or path.rstrip("/\\").endswith(SHARDED_SUFFIX):
+        return "sharded"
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return "sqlite"
+    return "json"
+
+
+def storage_for(path, kind=None):
+    """Хранилище для пути; создаётся один раз (кэш шардов и соединение SQLite переиспользуются).
+
+    kind — "json", "sharded" или "sqlite"; по умолчанию выбирается по пути (kind_of).
+    """
+    kind = kind or kind_of(path)
+    if kind not in KINDS:
+        raise ValueError(f"Неизвестный вид хранилища: {kind}")
+    key = os.path.abspath(path)
+    storage = _storages.get(key)
+    if storage is None or storage.kind != kind:
+        if storage is not None:
+            storage.close()
+        storage = {"json": JsonStorage, "sharded": ShardedStorage, "sqlite": SqliteStorage}[kind](path)
+        _storages[key] = storage
+    return storage
+
+
+def stamp(path):
+    """Отметка изменения данных по пути или None, если данных нет."""
+    if not os.path.exists(path):
+        return None
+    return storage_for(path).stamp()
@@ -0,0 +1,231 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import io
+import os
+import threading
+
+# Миниатюры изображений разметки: два уровня кэша.
+# В памяти — PNG-байты в LRU, ограниченном суммарным размером; на диске — PNG,
+# ключ — путь, mtime и размер исходного файла и размер миниатюры.
+# Раскодирование идёт в пуле потоков; PhotoImage создаётся только в потоке Tk.
+THUMB_DIR = os.environ.get(
+    "MBKS_THUMB_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "mbks", "thumbnails")
+)
+SIZE = (256, 256)
+
+
+def _stat_key(path, size):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, tuple(size))
+
+
+def disk_path(key):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return os.path.join(THUMB_DIR, digest[:2], f"{digest}.png")
+
+
+def render(path, size):
+    """PNG-байты миниатюры, вписанной в size. JPEG раскодируется сразу в уменьшенном масштабе."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.draft('RGB', size)  # для JPEG: декодирование с делением на 2/4/8
+        if img.mode not in ('RGB', 'RGBA', 'L'):
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        img.thumbnail(size)
+        buf = io.BytesIO()
+        img.save(buf, format='PNG', compress_level=1)
+    return buf.getvalue()
+
+
+def _store(path, png):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # без дискового кэша миниатюра просто будет построена заново
+
+
+class ThumbnailCache:
+    """Миниатюры файлов реестра data.files (или путей).
+
+    get() не блокирует: возвращает готовую миниатюру или None и ставит её в очередь;
+    callback(file, png) вызывается из рабочего потока, поэтому в Tk результат
+    нужно передавать через after(). Если миниатюру построить нельзя (файла нет,
+    изображение не раскодируется), callback получает png=None (можно показать заглушку),
+    а error(file, исключение), если задан, — причину; для отсутствующего файла оба
+    вызываются сразу из get(). prefetch() заранее строит соседей по sequence.
+    """
+
+    def __init__(self, max_bytes=64 << 20, size=SIZE, workers=4, prefetch=8):
+        self.max_bytes = max_bytes
+        self.size = tuple(size)
+        self.window = prefetch
+        self.nbytes = 0
+        self._memory = OrderedDict()  # ключ -> PNG
+        self._pending = dict()  # ключ -> Future
+        self._prefetched = set()
+        self._order = None  # файлы в порядке sequence
+        self._position = dict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnails')
+
+    def _remember(self, key, png):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = png
+            self.nbytes += len(png)
+            while self.nbytes > self.max_bytes and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self.nbytes -= len(old)
+
+    def _build(self, key):
+        path = disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                png = f.read()
+        except OSError:
+            png = render(key[0], key[3])
+            _store(path, png)
+        self._remember(key, png)
+        return png
+
+    def _done(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._prefetched.discard(key)
+
+    def _submit(self, key, prefetch=False):
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                if not prefetch:
+                    self._prefetched.discard(key)
+                return future
+            future = self._pool.submit(self._build, key)
+            self._pending[key] = future
+            if prefetch:
+                self._prefetched.add(key)
+        future.add_done_callback(lambda f: self._done(key, f))
+        return future
+
+    def key(self, file, size=None):
+        return _stat_key(getattr(file, 'path', file), size or self.size)
+
+    def cached(self, file, size=None):
+        """Миниатюра из памяти или None; не обращается к диску."""
+        try:
+            key = self.key(file, size)
+        except OSError:
+            return None
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+            return png
+
+    def get(self, file, size=None, callback=None, error=None):
+        """PNG из памяти или None; в последнем случае миниатюра строится в фоне."""
+        try:
+            key = self.key(file, size)
+        except OSError as e:
+            _report(file, e, callback, error)
+            return None
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+        if png is None:
+            future = self._submit(key)
+            if callback is not None or error is not None:
+                future.add_done_callback(lambda f: _deliver(file, f, callback, error))
+        if self.window:
+            self.prefetch(file)
+        return png
+
+    def result(self, file, size=None, timeout=None):
+        """Миниатюра с ожиданием построения."""
+        return self.get(file, size) or self._submit(self.key(file, size)).result(timeout)
+
+    def photo(self, png, **kw):
+        """tk.PhotoImage из PNG миниатюры; вызывать в потоке Tk."""
+        import tkinter as tk
+        return tk.PhotoImage(data=base64.b64encode(png).decode('ascii'), format='png', **kw)
+
+    def _neighbours(self, file):
+        if self._order is None:
+            from data import files
+            self._order = sorted(files, key=_sequence_key)
+            self._position = {f: i for i, f in enumerate(self._order)}
+        i = self._position.get(file)
+        if i is None:
+            return []
+        near = []
+        for step in range(1, self.window + 1):
+            near.extend(self._order[j] for j in (i + step, i - step) if 0 <= j < len(self._order))
+        return near
+
+    def prefetch(self, file):
+        """Строит миниатюры соседей file по sequence; устаревший префетч отменяется."""
+        keys = set()
+        for other in self._neighbours(file):
+            try:
+                keys.add(self.key(other))
+            except OSError:
+                continue
+        with self._lock:
+            stale = [self._pending[k] for k in self._prefetched - keys if k in self._pending]
+            missing = [k for k in keys if k not in self._memory]
+        for future in stale:
+            future.cancel()
+        for key in missing:
+            self._submit(key, prefetch=True)
+
+    def invalidate_order(self):
+        """Сбрасывает порядок соседей после изменения data.files."""
+        self._order = None
+
+    def clear(self):
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._memory.clear()
+            self.nbytes = 0
+
+    def close(self):
+        self.clear()
+        self._pool.shutdown(wait=False)
+
+
+def _report(file, exc, callback, error):
+    if error is not None:
+        error(file, exc)
+    if callback is not None:
+        callback(file, None)
+
+
+def _deliver(file, future, callback, error):
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        _report(file, exc, callback, error)
+    elif callback is not None:
+        callback(file, future.result())
+
+
+def _sequence_key(file):
+    """Порядок по sequence (текст; числовые — по значению), файлы без неё — в конце."""
+    seq = file.sequence
+    if seq is None:
+        return (2, 0, '', file.id)
+    if seq.isdigit():
+        return (0, int(seq), '', file.id)
+    return (1, 0, seq, file.id)
@@ -1,3 +1,9 @@
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+
 class CallbackVar:
 
     def __init__(self, init_value=None):
@@ -7,10 +13,160 @@ class CallbackVar:
     @property
     def value(self):
         return self._value
-    
+
     @value.setter
     def value(self, new_value):
         self._value = new_value
         self.callback()
 
-    
\ No newline at end of file
+
+MISSING = object()
+
+# Изменение ObservableVar: значение до первого присваивания в пакете и после последнего.
+VarDelta = namedtuple('VarDelta', 'old new')
+# Изменение ObservableDict: {ключ: новое значение} для добавленных и изменённых, {ключ: старое} для удалённых.
+DictDelta = namedtuple('DictDelta', 'added changed removed')
+
+
+def tk_idle(widget):
+    """Планировщик уведомлений на цикл простоя Tk: все изменения до него — одно уведомление."""
+    return widget.after_idle
+
+
+class Observable(ABC):
+    """Основа наблюдаемых значений: несколько подписчиков и пакетные уведомления.
+
+    Подписчик вызывается как fn(delta). Внутри batch() изменения накапливаются
+    и по выходу из внешнего batch() приходят одним уведомлением. Если задан
+    scheduler (например, tk_idle(root)), уведомление откладывается до его вызова,
+    так что изменения вне batch() тоже объединяются.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler
+        self._subscribers = []
+        self._depth = 0
+        self._scheduled = False
+
+    def subscribe(self, fn):
+        self._subscribers.append(fn)
+        return fn
+
+    def unsubscribe(self, fn):
+        try:
+            self._subscribers.remove(fn)
+        except ValueError:
+            pass
+
+    @contextmanager
+    def batch(self):
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._changed()
+
+    def _changed(self):
+        if self._depth or self._scheduled:
+            return
+        if self.scheduler is None:
+            self.flush()
+        else:
+            self._scheduled = True
+            self.scheduler(self.flush)
+
+    def flush(self):
+        """Отправляет накопленное изменение подписчикам, если оно не пустое."""
+        self._scheduled = False
+        delta = self._take()
+        if delta is None:
+            return
+        for fn in list(self._subscribers):
+            fn(delta)
+
+    @abstractmethod
+    def _take(self):
+        """Забирает накопленное изменение (дельту) и сбрасывает его; None, если изменений нет."""
+
+
+class ObservableVar(Observable):
+
+    def __init__(self, init_value=None, scheduler=None):
+        super().__init__(scheduler)
+        self._value = init_value
+        self._old = MISSING
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, new_value):
+        if self._old is MISSING:
+            self._old = self._value
+        self._value = new_value
+        self._changed()
+
+    def _take(self):
+        old, self._old = self._old, MISSING
+        if old is MISSING or old == self._value:
+            return None
+        return VarDelta(old, self._value)
+
+
+class ObservableDict(Observable, MutableMapping):
+    """Наблюдаемый словарь; уведомление содержит только итоговую разницу за пакет."""
+
+    def __init__(self, data=(), scheduler=None):
+        super().__init__(scheduler)
+        self._data = dict(data)
+        self._old = dict()  # ключ -> значение до первого изменения в пакете (MISSING — ключа не было)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._old.setdefault(key, self._data.get(key, MISSING))
+        self._data[key] = value
+        self._changed()
+
+    def __delitem__(self, key):
+        value = self._data.pop(key)
+        self._old.setdefault(key, value)
+        self._changed()
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"ObservableDict({self._data!r})"
+
+    def update(self, *args, **kw):
+        with self.batch():
+            super().update(*args, **kw)
+
+    def clear(self):
+        with self.batch():
+            for key in list(self._data):
+                del self[key]
+
+    def _take(self):
+        old, self._old = self._old, dict()
+        added, changed, removed = dict(), dict(), dict()
+        for key, before in old.items():
+            after = self._data.get(key, MISSING)
+            if before is MISSING:
+                if after is not MISSING:
+                    added[key] = after
+            elif after is MISSING:
+                removed[key] = before
+            elif after != before:
+                changed[key] = after
+        if not (added or changed or removed):
+            return None
+        return DictDelta(added, changed, removed)
@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+
+# Сторож цикла событий Tk. Главный поток каждые INTERVAL_MS ставит отметку через after();
+# вспомогательный поток следит, как давно была отметка. Если дольше THRESHOLD_MS, он
+# снимает стек главного потока (sys._current_frames) и запоминает обработчик Tk,
+# который сейчас выполняется. По окончании зависания запись печатается в stderr;
+# при выходе худшие зависания выводятся сводкой, а с переменной окружения
+#
+#     MBKS_WATCHDOG=stalls.json python admin.py
+#
+# ещё и записываются в JSON.
+ENV_VAR = "MBKS_WATCHDOG"
+INTERVAL_MS = 50
+THRESHOLD_MS = 250
+KEEP = 10
+
+_TKINTER = os.path.dirname(os.path.abspath(__import__("tkinter").__file__))
+
+
+def handler_name(frames):
+    """Имя обработчика Tk по стеку (от внешнего кадра к внутреннему) или None.
+
+    Обработчик — первый кадр внутри самой глубокой обёртки tkinter (CallWrapper, after);
+    лямбды-посредники вида lambda e: self.on_filter() пропускаются.
+    """
+    start = None
+    for i, frame in enumerate(frames):
+        code = frame.f_code
+        if code.co_name in ("__call__", "callit") and os.path.dirname(os.path.abspath(code.co_filename)) == _TKINTER:
+            start = i + 1
+    if start is None or start >= len(frames):
+        return None
+    for frame in frames[start:]:
+        code = frame.f_code
+        if code.co_name != "<lambda>":
+            return getattr(code, "co_qualname", code.co_name)
+    code = frames[start].f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+class Watchdog:
+
+    def __init__(self, interval_ms=INTERVAL_MS, threshold_ms=THRESHOLD_MS, keep=KEEP, on_stall=None):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.keep = keep
+        self.on_stall = on_stall or self.print_stall
+        self.stalls = []  # худшие keep зависаний, по убыванию длительности
+        self.count = 0
+        self.total = 0.0
+        self.app = None
+        self._beat = time.perf_counter()
+        self._captured = None  # (отметка, handler, стек) текущего зависания
+        self._main = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, app):
+        if self._thread is not None:
+            return
+        self.app = app
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="tk-watchdog", daemon=True)
+        self._thread.start()
+        app.after(int(self.interval * 1000), self._heartbeat)
+
+    def install(self, app):
+        """Запускает сторожа; при закрытии окна выводит сводку, а при заданном MBKS_WATCHDOG пишет отчёт."""
+        self.start(app)
+        path = os.environ.get(ENV_VAR)
+        app.bind("<Destroy>", lambda e: e.widget is app and self.close(path), add="+")
+
+    def close(self, path=None):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread = None
+        if self.stalls:
+            print(self.summary(), file=sys.stderr)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def _heartbeat(self):
+        now = time.perf_counter()
+        beat, self._beat = self._beat, now
+        lag = now - beat - self.interval
+        if lag >= self.threshold:
+            self._record(lag, beat)
+        else:
+            self._captured = None
+        if self._thread is not None:
+            self.app.after(int(self.interval * 1000), self._heartbeat)
+
+    def _watch(self):
+        step = min(self.interval, self.threshold / 4)
+        while not self._stop.wait(step):
+            beat = self._beat
+            if self._captured is None and time.perf_counter() - beat - self.interval >= self.threshold:
+                frame = sys._current_frames().get(self._main)
+                if frame is None or self._beat != beat:
+                    continue
+                frames = [f for f, _ in traceback.walk_stack(frame)][::-1]
+                self._captured = (beat, handler_name(frames), traceback.format_stack(frame))
+
+    def _record(self, lag, beat):
+        captured, self._captured = self._captured, None
+        # Стек, снятый после предыдущей отметки, относится к этому зависанию.
+        handler, stack = captured[1:] if captured and captured[0] == beat else (None, [])
+        stall = {"ts": time.time(), "lag_ms": round(lag * 1000, 1), "handler": handler, "stack": stack}
+        self.count += 1
+        self.total += lag
+        self.stalls.append(stall)
+        self.stalls.sort(key=lambda s: s["lag_ms"], reverse=True)
+        del self.stalls[self.keep:]
+        self.on_stall(stall)
+
+    @staticmethod
+    def print_stall(stall):
+        print(f"Интерфейс не отвечал {stall['lag_ms']:.0f} мс, обработчик: {stall['handler'] or '?'}",
+              file=sys.stderr)
+        if stall["stack"]:
+            print("".join(stall["stack"]), end="", file=sys.stderr)
+
+    def report(self):
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.count,
+            "stalled_ms": round(self.total * 1000, 1),
+            "worst": self.stalls,
+        }
+
+    def summary(self):
+        lines = [f"Зависаний интерфейса: {self.count}, всего {self.total * 1000:.0f} мс. Худшие:"]
+        for stall in self.stalls:
+            lines.append(f"  {stall['lag_ms']:>8.0f} мс  {stall['handler'] or '?'}")
+        return "\n".join(lines)
+
+
+watchdog = Watchdog()
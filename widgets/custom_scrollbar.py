@@ -1,8 +1,14 @@
 from tkinter import *
 from tkinter import ttk
 
+from style import ensure_widget
+
 class CustomScrollbar(ttk.Scrollbar):
 
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        ensure_widget(self)
+
     def set(self, *args):
         super().set(*args)
 
@@ -0,0 +1,10 @@
+# Диалоги CTk импортируются при первом показе, а не при запуске приложения.
+
+def CTkMessagebox(*args, **kwargs):
+    from CTkMessagebox import CTkMessagebox
+    return CTkMessagebox(*args, **kwargs)
+
+
+def CTkInputDialog(*args, **kwargs):
+    from customtkinter import CTkInputDialog
+    return CTkInputDialog(*args, **kwargs)
@@ -0,0 +1,122 @@
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+
+
+class LogView(ttk.Frame):
+    """Журнал с ограниченным числом строк.
+
+    Строки копятся и вставляются в виджет одним вызовом за цикл простоя,
+    лишние строки удаляются сверху пачками по trim_chunk.
+    load_older(до_времени, количество) -> [(время, строка)] подгружает старые записи по запросу;
+    вызывается в отдельном потоке, результат вставляется в потоке Tk. Подгруженные строки
+    не обрезаются, пока пользователь не прокрутит журнал обратно вниз: на это время лимит
+    увеличивается на их число, а обрезаются строки сразу под ними. Новые строки прокручивают
+    журнал вниз, только если он и так был прокручен до конца.
+    """
+
+    def __init__(self, master, capacity=1000, trim_chunk=200, load_older=None, **kwargs):
+        super().__init__(master)
+        self.capacity = capacity
+        self.trim_chunk = trim_chunk
+        self.load_older = load_older
+        self._pending = []
+        self._scheduled = None
+        self._stamps = deque()  # время строк, показанных в виджете
+        self._held = 0  # первые строки виджета, подгруженные load_older и пока не обрезаемые
+        self._loading = None  # (поток, результат) идущей подгрузки
+        self._scheduled_load = None
+
+        if load_older is not None:
+            ttk.Button(self, text="Загрузить старые записи", command=self.on_load_older).pack(fill=tk.X)
+        self._yscroll = kwargs.pop("yscrollcommand", None)
+        self.text = tk.Text(self, state=tk.DISABLED, yscrollcommand=self._on_yview, **kwargs)
+        self.text.pack(fill=tk.BOTH, expand=True)
+
+    def append(self, line, ts=None):
+        ts = time.time() if ts is None else ts
+        self._pending.append((ts, line))
+        if self._scheduled is None:
+            self._scheduled = self.after_idle(self._flush)
+
+    def _flush(self):
+        self._scheduled = None
+        if not self._pending:
+            return
+        pending = self._pending[-self.capacity:]
+        self._pending = []
+        follow = self.text.yview()[1] >= 1.0
+        self.text.config(state=tk.NORMAL)
+        self.text.insert("end", "\n".join(line for _, line in pending) + "\n")
+        self._stamps.extend(ts for ts, _ in pending)
+        excess = len(self._stamps) - self.capacity - self._held
+        if excess >= self.trim_chunk:
+            start = self._held + 1
+            self.text.delete(f"{start}.0", f"{start + excess}.0")
+            self._stamps.rotate(-self._held)
+            for _ in range(excess):
+                self._stamps.popleft()
+            self._stamps.rotate(self._held)
+        self.text.config(state=tk.DISABLED)
+        if follow:
+            self.text.see("end")
+
+    def _on_yview(self, first, last):
+        if self._held and float(last) >= 1.0:
+            # Журнал снова прокручен вниз: подгруженные строки обрежутся при следующем сбросе.
+            self._held = 0
+        if self._yscroll is not None:
+            self._yscroll(first, last)
+
+    @property
+    def oldest(self):
+        return self._stamps[0] if self._stamps else None
+
+    def on_load_older(self):
+        if self._loading is not None:
+            return
+        self._flush()
+        before = self.oldest if self.oldest is not None else time.time()
+        result = []
+
+        def load():
+            try:
+                result.append((self.load_older(before, self.trim_chunk), None))
+            except Exception as e:
+                result.append((None, e))
+
+        thread = threading.Thread(target=load, name="log-load-older", daemon=True)
+        self._loading = (thread, result)
+        thread.start()
+        self._scheduled_load = self.after(50, self._poll_older)
+
+    def _poll_older(self):
+        thread, result = self._loading
+        if thread.is_alive():
+            self._scheduled_load = self.after(50, self._poll_older)
+            return
+        self._loading = None
+        self._scheduled_load = None
+        older, error = result[0] if result else (None, None)
+        if error is not None:
+            self._root().report_callback_exception(type(error), error, error.__traceback__)
+            return
+        if not older:
+            return
+        self.text.config(state=tk.NORMAL)
+        self.text.insert("1.0", "\n".join(line for _, line in older) + "\n")
+        self.text.config(state=tk.DISABLED)
+        self.text.see("1.0")
+        self._stamps.extendleft(ts for ts, _ in reversed(older))
+        self._held += len(older)
+
+    def destroy(self):
+        if self._scheduled is not None:
+            self.after_cancel(self._scheduled)
+            self._scheduled = None
+        if self._scheduled_load is not None:
+            self.after_cancel(self._scheduled_load)
+            self._scheduled_load = None
+        super().destroy()
@@ -1,9 +1,10 @@
 from tkinter import *
 from tkinter import ttk
-from CTkMessagebox import CTkMessagebox
-import customtkinter as ctk
+from style import ensure, ensure_widget
+from widgets.dialogs import CTkMessagebox, CTkInputDialog
 from widgets.toolbutton import ToolButton
 from widgets.custom_scrollbar import CustomScrollbar
+from utils.metrics import metrics
 from string import ascii_letters
 
 STEP = 30
@@ -77,6 +78,9 @@ class Matrix(ttk.Frame):
         separator_3.pack(side=LEFT, fill=Y, pady=5, padx=5)
         self.btn_save.pack(side=LEFT)
 
+        ensure_widget(self)
+        ensure_widget(separator_1)
+
         self.bind('<Configure>', lambda event: self.redraw())
         self.canvas.bind('<Button-1>', lambda event: self.focus_set())
 
@@ -127,6 +131,7 @@ class Matrix(ttk.Frame):
             self.canvas.tag_bind(f'col_{i}', '<Button-1>', lambda event, idx=i: self.select(f'col_{idx}'))
             self.canvas.tag_bind(f'col_{i}', '<Control-Button-1>', lambda event, idx=i: self.multiselect(f'col_{idx}'))
 
+        ensure('design1.TCheckbutton')  # один раз на перерисовку, а не на каждый флажок
         for i, subj in enumerate(subs):
             self.canvas.create_rectangle(
                 0, STEP * (i + 1),
@@ -295,7 +300,7 @@ class Matrix(ttk.Frame):
         self.redraw()
 
     def add_subject(self):
-        dialog = ctk.CTkInputDialog(text="Введите имя субъекта:", title="Новый субъект")
+        dialog = CTkInputDialog(text="Введите имя субъекта:", title="Новый субъект")
         subject = dialog.get_input()
         
         if subject and subject.strip():
@@ -311,7 +316,7 @@ class Matrix(ttk.Frame):
                 self.redraw()
 
     def add_object(self):
-        dialog = ctk.CTkInputDialog(text="Введите объект (одна латинская буква):", title="Новый объект")
+        dialog = CTkInputDialog(text="Введите объект (одна латинская буква):", title="Новый объект")
         obj = dialog.get_input()
         
         if obj and validate_object_token(obj):
@@ -387,14 +392,16 @@ class Matrix(ttk.Frame):
             self.redraw()
 
     def apply_matrix_changes(self):
-        for (s, o), var in self.check_vars.items():
-            if s in self.data["subjects"]:
-                allowed = set(self.data["subjects"][s])
-                if var.get():
-                    allowed.add(o)
-                else:
-                    allowed.discard(o)
-                self.data["subjects"][s] = list(allowed)
+        with metrics.timer("apply_matrix_changes"):
+            for (s, o), var in self.check_vars.items():
+                if s in self.data["subjects"]:
+                    allowed = set(self.data["subjects"][s])
+                    if var.get():
+                        allowed.add(o)
+                    else:
+                        allowed.discard(o)
+                    self.data["subjects"][s] = list(allowed)
+        # Сохранение (<<MatrixChanged>>) учитывается в save_matrix.
         self.event_generate('<<MatrixChanged>>')
         
         CTkMessagebox(
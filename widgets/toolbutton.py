@@ -1,8 +1,8 @@
 from tkinter import *
 from tkinter import ttk
 
-from utils.load import load
-from _style._toolbutton.images import images
+from style import ensure_widget
+from utils.load import load_icon
 
 class ToolButton(ttk.Button):
 
@@ -11,12 +11,14 @@ class ToolButton(ttk.Button):
     def __init__(self, master, alias, **kwargs):
         super().__init__(
             master, 
-            image=load(
-                images[alias],
+            image=load_icon(
+                '_style._toolbutton',
+                alias,
                 self.ICON_SIZE
             ),
             **kwargs
         )
+        ensure_widget(self)
 
 class ToolRadiobutton(ttk.Radiobutton):
 
@@ -25,9 +27,11 @@ class ToolRadiobutton(ttk.Radiobutton):
     def __init__(self, master, alias, **kwargs):
         super().__init__(
             master, 
-            image=load(
-                images[alias],
+            image=load_icon(
+                '_style._toolbutton',
+                alias,
                 self.ICON_SIZE    
             ),
             **kwargs
-        )
\ No newline at end of file
+        )
+        ensure_widget(self)
\ No newline at end of file